@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# benchmarks/bench_storage.py
+#
+# Storage benchmarks: how restoring and saving scale with the number of
+# notes. Each corpus size runs in its own child process against a throwaway
+# config/data directory, so sizes don't share caches or peak RSS, and the
+# user's real notes are never touched. Runs headless (offscreen platform).
+#
+#   python benchmarks/bench_storage.py                        # 10 … 10,000
+#   python benchmarks/bench_storage.py --sizes 10,500 -o out.json
+#
+# Per size it reports:
+#   restore          wall time until every note is built and shown (notes
+#                    stream in across event-loop turns), time until the first
+#                    batch is up, and the metadata query on its own
+#   autosave         one save cycle after editing AUTOSAVE_EDIT_FRACTION of
+#                    the notes: GUI-thread time, time until the writer is
+#                    idle, and bytes written (write syscalls, /proc/self/io)
+#   save_latency_ms  single-note edit → flush(wait=True), p50/p95/max
+#   peak_rss_kb      the child's peak resident set size
+#
+# Results are JSON (stdout, or --output) and carry the git commit, so runs
+# from different commits can be diffed side by side.
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_SIZES = (10, 100, 1000, 10_000)
+# Share of notes restored collapsed — they never build a document.
+COLLAPSED_FRACTION = 0.5
+AUTOSAVE_EDIT_FRACTION = 0.1
+LATENCY_SAMPLES = 50
+
+_WORDS = (
+    "milk eggs call dentist review draft budget fix ship plan renew lease "
+    "book flights water plants backup laptop read chapter pay invoice"
+).split()
+
+
+# ---------------------------------------------------------------------------
+# Child: one corpus size
+# ---------------------------------------------------------------------------
+
+def _synthetic_body(rng: random.Random) -> str:
+    """A note in the compact format: a paragraph with some formatting, a
+    nested bullet list and a checklist, sized like real sticky notes."""
+    def words(n):
+        return " ".join(rng.choice(_WORDS) for _ in range(n))
+    lines = ["SN1", "\t" + words(rng.randint(3, 12)) + " \x1bA" + words(2)]
+    for i in range(rng.randint(0, 6)):
+        lines.append(f"l1:-1:1\t{words(rng.randint(2, 8))}")
+        if i % 3 == 2:
+            lines.append(f"l2:-2:2\t\x1bB{words(3)}")
+    for _ in range(rng.randint(0, 4)):
+        lines.append(f"l3:-1:1 {rng.choice('xo')}\t{words(rng.randint(2, 6))}")
+    return "\n".join(lines)
+
+
+def _seed_corpus(size: int, seed: int):
+    from stickynotes import config, migrations, storage
+
+    rng = random.Random(seed)
+    store = storage.open_store()
+    themes = list(config.THEMES)
+    changes = {}
+    for i in range(size):
+        changes[f"bench-{i:05d}"] = {
+            "content": _synthetic_body(rng),
+            "geometry": None,
+            "theme": themes[i % len(themes)],
+            "collapsed": rng.random() < COLLAPSED_FRACTION,
+            "title": f"Note {i}",
+            "last_edited": "2024-01-01T00:00:00+00:00",
+            "pinned": False,
+        }
+    # Seeded at the current schema, so restore times the steady-state path
+    # rather than a one-time migration.
+    store.write_migration(changes, migrations.SCHEMA_VERSION)
+    store.close()
+
+
+def _io_bytes_written():
+    """Bytes this process has passed to write() so far (all threads), or
+    None where /proc/self/io isn't available."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+    return {"p50": pick(0.50), "p95": pick(0.95), "max": round(ordered[-1], 3)}
+
+
+def run_child(size: int, seed: int) -> dict:
+    from PyQt6.QtCore import QSettings
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([sys.argv[0]])
+    from stickynotes import config
+    app.setOrganizationName(config.ORG_NAME)
+    app.setApplicationName(config.APP_NAME)
+    # Skip the first-launch welcome note; the corpus is the only content.
+    QSettings(config.ORG_NAME, config.APP_NAME).setValue(
+        "first_launch_completed", True
+    )
+    _seed_corpus(size, seed)
+
+    from stickynotes.tray_manager import TrayManager
+
+    start = time.perf_counter()
+    tray = TrayManager(app)
+    first_batch_s = time.perf_counter() - start
+    while tray.restoring:
+        app.processEvents()
+    app.processEvents()
+    restore_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tray.store.load_notes(with_content=False)
+    load_metadata_s = time.perf_counter() - start
+
+    notes = list(tray.open_notes.values())
+    tray.saver.flush(wait=True)
+
+    # One autosave cycle over a batch of edited notes. Collapsed notes get
+    # their body built first, as expanding them to type would.
+    rng = random.Random(seed + 1)
+    edited = rng.sample(notes, max(1, int(len(notes) * AUTOSAVE_EDIT_FRACTION)))
+    for note in edited:
+        note._ensure_hydrated()
+        note.text_edit.append("edited")
+    written = _io_bytes_written()
+    start = time.perf_counter()
+    tray.saver.flush()
+    autosave_gui_s = time.perf_counter() - start
+    tray.saver.writer.drain()
+    autosave_total_s = time.perf_counter() - start
+    written_after = _io_bytes_written()
+
+    # Per-note latency: one edited note, flushed and waited for.
+    latencies = []
+    for note in rng.sample(notes, min(LATENCY_SAMPLES, len(notes))):
+        note._ensure_hydrated()
+        note.text_edit.append("x")
+        start = time.perf_counter()
+        tray.saver.flush(wait=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "notes": size,
+        "restore_s": round(restore_s, 4),
+        "first_batch_s": round(first_batch_s, 4),
+        "load_metadata_s": round(load_metadata_s, 4),
+        "autosave": {
+            "notes_edited": len(edited),
+            "gui_thread_s": round(autosave_gui_s, 4),
+            "total_s": round(autosave_total_s, 4),
+            "bytes_written": (
+                written_after - written if written is not None else None
+            ),
+        },
+        "save_latency_ms": _percentiles(latencies),
+        # ru_maxrss is KiB on Linux (bytes on macOS).
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Parent: one child per size, aggregate
+# ---------------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_size(size: int, seed: int) -> dict:
+    scratch = tempfile.mkdtemp(prefix="stickynotes-bench-")
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM="offscreen",
+        HOME=scratch,
+        XDG_CONFIG_HOME=os.path.join(scratch, "config"),
+        XDG_DATA_HOME=os.path.join(scratch, "data"),
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+    )
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__),
+             "--child", str(size), "--seed", str(seed)],
+            env=env, capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"benchmark for {size} notes failed")
+    # The result is the last stdout line; the app may print above it.
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure note restore/save cost at several corpus sizes."
+    )
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+        help="comma-separated corpus sizes (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_child(args.child, args.seed)))
+        return
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = _run_size(size, args.seed)
+        print(
+            f"{size:>6} notes: restore {result['restore_s']:.3f}s "
+            f"(first batch {result['first_batch_s']:.3f}s), "
+            f"autosave {result['autosave']['total_s']:.3f}s, "
+            f"save p95 {result['save_latency_ms']['p95']:.1f}ms, "
+            f"peak RSS {result['peak_rss_kb'] // 1024} MiB",
+            file=sys.stderr,
+        )
+        results.append(result)
+
+    from stickynotes import config
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage_backend": config.STORAGE_BACKEND,
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# benchmarks/bench_theming.py
+#
+# Theme-switch benchmark: the stylesheet and palette rendering paths
+# (config.THEME_RENDERING, see stickynotes/styles.py) side by side. Each
+# path runs in its own child process against a throwaway config/data
+# directory, headless (offscreen platform).
+#
+#   python benchmarks/bench_theming.py
+#   python benchmarks/bench_theming.py --notes 50 --rounds 20 -o out.json
+#
+# Per path it reports:
+#   build_s        wall time to build and show every note
+#   switch_ms      one note's theme switch (StickyNote._change_theme), on the
+#                  GUI thread, p50/p95/max
+#   round_ms       one round — every note switched, then repainted — p50/max
+#   events         per note switch: StyleChange (re-polish), LayoutRequest
+#                  (relayout), FontChange and PaletteChange events delivered
+#                  to the note's widgets
+#
+# Results are JSON (stdout, or --output) and carry the git commit.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = ("stylesheet", "palette")
+DEFAULT_NOTES = 30
+DEFAULT_ROUNDS = 10
+
+
+# ---------------------------------------------------------------------------
+# Child: one rendering path
+# ---------------------------------------------------------------------------
+
+def _percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    def pick(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+    return {"p50": pick(0.50), "p95": pick(0.95), "max": round(ordered[-1], 3)}
+
+
+def run_child(mode: str, note_count: int, rounds: int) -> dict:
+    from PyQt6.QtCore import QEvent, QObject
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([sys.argv[0]])
+    from stickynotes import config
+    config.THEME_RENDERING = mode
+    app.setOrganizationName(config.ORG_NAME)
+    app.setApplicationName(config.APP_NAME)
+
+    from stickynotes import persistence
+    from stickynotes.note_window import StickyNote
+
+    counted = {
+        QEvent.Type.StyleChange: "style_change",
+        QEvent.Type.LayoutRequest: "layout_request",
+        QEvent.Type.FontChange: "font_change",
+        QEvent.Type.PaletteChange: "palette_change",
+    }
+
+    class _Counter(QObject):
+        def __init__(self):
+            super().__init__()
+            self.counts = dict.fromkeys(counted.values(), 0)
+
+        def eventFilter(self, obj, event):
+            name = counted.get(event.type())
+            if name is not None:
+                self.counts[name] += 1
+            return False
+
+    saver = persistence.app_saver()
+    themes = list(config.THEMES)
+    start = time.perf_counter()
+    notes = []
+    for i in range(note_count):
+        note = StickyNote(
+            note_id=f"bench-{i:04d}", content=f"Note {i}\nmilk eggs bread",
+            theme=themes[i % len(themes)], saver=saver,
+        )
+        note.resize(300, 260)
+        note.show()
+        notes.append(note)
+    app.processEvents()
+    build_s = time.perf_counter() - start
+
+    counter = _Counter()
+    app.installEventFilter(counter)
+    switches = []
+    round_times = []
+    for r in range(rounds):
+        start = time.perf_counter()
+        for i, note in enumerate(notes):
+            theme = themes[(i + r + 1) % len(themes)]
+            t = time.perf_counter()
+            note._change_theme(theme)
+            switches.append((time.perf_counter() - t) * 1000)
+        app.processEvents()   # layout and repaint
+        round_times.append((time.perf_counter() - start) * 1000)
+    app.removeEventFilter(counter)
+    saver.close()
+
+    switch_count = rounds * note_count
+    return {
+        "mode": mode,
+        "notes": note_count,
+        "rounds": rounds,
+        "build_s": round(build_s, 4),
+        "switch_ms": _percentiles(switches),
+        "round_ms": {
+            "p50": _percentiles(round_times)["p50"],
+            "max": _percentiles(round_times)["max"],
+        },
+        "events": {
+            name: round(count / switch_count, 2)
+            for name, count in counter.counts.items()
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Parent: one child per path, compare
+# ---------------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+            text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_mode(mode: str, note_count: int, rounds: int) -> dict:
+    scratch = tempfile.mkdtemp(prefix="stickynotes-bench-")
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM="offscreen",
+        HOME=scratch,
+        XDG_CONFIG_HOME=os.path.join(scratch, "config"),
+        XDG_DATA_HOME=os.path.join(scratch, "data"),
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+    )
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode,
+             "--notes", str(note_count), "--rounds", str(rounds)],
+            env=env, capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"benchmark for {mode} rendering failed")
+    # The result is the last stdout line; the app may print above it.
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare theme switching under stylesheet and palette "
+                    "rendering."
+    )
+    parser.add_argument("--notes", type=int, default=DEFAULT_NOTES)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_child(args.child, args.notes, args.rounds)))
+        return
+
+    results = []
+    for mode in MODES:
+        result = _run_mode(mode, args.notes, args.rounds)
+        events = result["events"]
+        print(
+            f"{mode:>10}: build {result['build_s']:.3f}s, "
+            f"switch p50 {result['switch_ms']['p50']:.2f}ms "
+            f"p95 {result['switch_ms']['p95']:.2f}ms, "
+            f"round p50 {result['round_ms']['p50']:.1f}ms; per switch "
+            f"{events['style_change']:g} re-polish, "
+            f"{events['layout_request']:g} relayout, "
+            f"{events['font_change']:g} font change",
+            file=sys.stderr,
+        )
+        results.append(result)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# benchmarks/check_import_time.py
+#
+# Import-time budget for the startup path: everything `run_stickynotes.py`
+# imports before the first note can paint. Parses `python -X importtime`
+# output for `import stickynotes.tray_manager` and fails (exit status 1) if
+#
+#   * a module that's meant to load on first use shows up at startup
+#     (DEFERRED — the tray dialogs, autostart and python-xlib), or
+#   * the app's own modules take more than --budget-ms to import, counting
+#     each stickynotes.* module's self time (PyQt6 and the stdlib aren't
+#     ours to trim, so they're reported but not budgeted).
+#
+#   python benchmarks/check_import_time.py
+#   python benchmarks/check_import_time.py --budget-ms 60 --runs 9
+#
+# Each run is a fresh interpreter; the per-module minimum across runs is
+# used, which filters out most scheduler noise. tests/test_import_time.py
+# runs the same check as part of the test suite.
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGET = "stickynotes.tray_manager"
+DEFAULT_BUDGET_MS = 80
+DEFAULT_RUNS = 5
+
+# Imported where they're first used, never on the way to the first note.
+DEFERRED = (
+    "stickynotes.dialogs",     # tray menu → Settings / About / Shortcuts
+    "stickynotes.autostart",   # first launch, Settings, post-startup refresh
+    "Xlib",                    # xwm imports it inside each call
+)
+
+
+def _import_times() -> dict:
+    """{module: (self_us, cumulative_us)} for one fresh import of TARGET."""
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"importing {TARGET} failed")
+    times = {}
+    for line in proc.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue   # the header line
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def measure(runs: int = DEFAULT_RUNS) -> dict:
+    """{module: (self_us, cumulative_us)}, the per-module minimum (by self
+    time) over `runs` fresh imports."""
+    best = {}
+    for _ in range(runs):
+        for module, (self_us, cum_us) in _import_times().items():
+            prev = best.get(module)
+            if prev is None or self_us < prev[0]:
+                best[module] = (self_us, cum_us)
+    return best
+
+
+def ours(best: dict) -> list:
+    """[(module, self_us)] for the stickynotes.* modules, slowest first."""
+    return sorted(
+        ((m, t[0]) for m, t in best.items() if m.split(".")[0] == "stickynotes"),
+        key=lambda item: item[1], reverse=True,
+    )
+
+
+def check(best: dict, budget_ms: float = DEFAULT_BUDGET_MS) -> list:
+    """Failure messages for `best` (as returned by measure()); empty when
+    the startup imports are within budget. Also run by tests/."""
+    failures = []
+    for name in DEFERRED:
+        loaded = [m for m in best if m == name or m.startswith(name + ".")]
+        if loaded:
+            failures.append(f"{name} is imported at startup")
+    ours_ms = sum(us for _, us in ours(best)) / 1000
+    if ours_ms > budget_ms:
+        failures.append(
+            f"stickynotes modules took {ours_ms:.1f} ms "
+            f"(budget {budget_ms:g} ms)"
+        )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the startup import graph against its budget."
+    )
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+        help="max self time of stickynotes.* modules (default: %(default)s)",
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    best = measure(args.runs)
+    modules = ours(best)
+    ours_ms = sum(us for _, us in modules) / 1000
+    total_ms = best[TARGET][1] / 1000
+
+    print(f"import {TARGET}: {total_ms:.1f} ms in total, "
+          f"{ours_ms:.1f} ms in stickynotes modules "
+          f"(budget {args.budget_ms:g} ms)")
+    for module, us in modules[:8]:
+        print(f"  {module:<32}{us / 1000:>8.1f} ms")
+
+    failures = check(best, args.budget_ms)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
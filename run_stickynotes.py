@@ -2,9 +2,16 @@
 # run_stickynotes.py
 
 import os
+import select
+import socket
 import sys
 import time
 
+# Stdlib-only, so it can time everything that follows, PyQt6 import included.
+from stickynotes import profiling
+
+profiling.enable_from_argv(sys.argv)
+
 # Force xcb (X11) everywhere — natively on X11, via XWayland on Wayland.
 # Must be set before QApplication is constructed; Qt reads it during init.
 # Unconditional assignment (NOT setdefault): the snap GNOME extension's
@@ -14,6 +21,99 @@ import time
 # decorated dialogs wouldn't be movable).
 os.environ["QT_QPA_PLATFORM"] = "xcb;wayland"
 
+# A second launch hands its command to the running instance and exits here,
+# before paying for PyQt6 — or for the XWayland wait below.
+from stickynotes import single_instance
+
+with profiling.phase("single instance"):
+    _claim = single_instance.claim_or_forward(sys.argv)
+
+
+def _x_socket_path():
+    """The Unix socket of the X display in $DISPLAY (":0" if unset, as
+    XWayland on GNOME normally is), or None for a display that isn't a
+    local socket — a TCP display, say — which there's nothing to wait for."""
+    display = os.environ.get("DISPLAY") or ":0"
+    host, _, rest = display.rpartition(":")
+    number = rest.partition(".")[0]
+    if host not in ("", "unix") or not number.isdigit():
+        return None
+    return f"/tmp/.X11-unix/X{number}"
+
+
+def _x_accepting(path) -> bool:
+    """True once the X server behind `path` accepts connections. On GNOME,
+    Mutter owns the socket and launches XWayland on the first connection,
+    so this also kicks off a lazy XWayland start."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class _CreateWatcher:
+    """Sleeps until a directory entry is created, via inotify — so the wait
+    ends the moment the X socket appears instead of on the next poll.
+    Degrades to plain timed sleeps where inotify isn't available."""
+
+    _IN_CREATE = 0x100
+    _IN_MOVED_TO = 0x80
+    _FALLBACK_POLL_SEC = 0.1
+
+    def __init__(self):
+        self._fd = None
+        self._wd = None
+        self._watched = None
+        try:
+            import ctypes
+            self._libc = ctypes.CDLL(None, use_errno=True)
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd >= 0:
+            self._fd = fd
+
+    def wait(self, path, timeout):
+        """Return once `path` (or its missing parent directory) may have
+        been created, or after `timeout` seconds."""
+        directory = os.path.dirname(path)
+        # /tmp/.X11-unix itself may not exist yet this early in the session.
+        target = directory if os.path.isdir(directory) else os.path.dirname(directory)
+        if self._fd is None or not self._watch(target):
+            time.sleep(min(timeout, self._FALLBACK_POLL_SEC))
+            return
+        # Created between the caller's check and the watch being added.
+        if os.path.exists(path if target == directory else directory):
+            return
+        select.select([self._fd], [], [], timeout)
+        try:
+            os.read(self._fd, 4096)
+        except BlockingIOError:
+            pass
+
+    def _watch(self, target) -> bool:
+        if target == self._watched:
+            return True
+        if self._wd is not None:
+            self._libc.inotify_rm_watch(self._fd, self._wd)
+            self._wd = self._watched = None
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(target), self._IN_CREATE | self._IN_MOVED_TO
+        )
+        if wd < 0:
+            return False
+        self._wd, self._watched = wd, target
+        return True
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
 
 def _wait_for_xwayland_on_autostart():
     """Smooth a known Qt + GNOME-Wayland race on first login.
@@ -29,38 +129,58 @@ def _wait_for_xwayland_on_autostart():
     argv AND (b) Wayland sessions. Manual launches and X11 sessions skip
     this entirely (they have no race to smooth).
 
-    Polls until XWayland is actually ready — slow laptops can take many
-    seconds to bring it up. Hard ceiling of 5 minutes is a pure safety
-    net for genuinely broken sessions; in practice XWayland appears in
-    seconds. Heartbeat log to stderr every 5 s so journalctl can show
-    exactly how long the wait took (or that we're stuck)."""
+    Waits until the socket of the actual $DISPLAY accepts a connection —
+    not merely exists — and no longer: while the socket is missing, an
+    inotify watch wakes us as soon as it's created; once it exists but
+    still refuses, connects are retried with a short backoff. Slow laptops
+    can take many seconds to bring XWayland up. Hard ceiling of 5 minutes
+    is a pure safety net for genuinely broken sessions. The time waited is
+    logged to stderr (and heartbeats every 5 s while waiting) so journalctl
+    shows exactly how long the wait took, or that we're stuck."""
     if "--autostart" not in sys.argv:
         return
     if os.environ.get("XDG_SESSION_TYPE") != "wayland":
         return
+    path = _x_socket_path()
+    if path is None:
+        return
 
     HARD_CAP_SEC = 300.0
     HEARTBEAT_SEC = 5.0
-    POLL_SEC = 0.1
-
-    waited = 0.0
-    last_log = 0.0
-    while waited < HARD_CAP_SEC:
-        if os.path.exists("/tmp/.X11-unix/X0"):
-            time.sleep(0.5)  # let XWayland finish accepting connections
-            print(
-                f"[stickynotes] XWayland ready after {waited:.1f}s",
-                file=sys.stderr, flush=True,
-            )
-            return
-        time.sleep(POLL_SEC)
-        waited += POLL_SEC
-        if waited - last_log >= HEARTBEAT_SEC:
-            print(
-                f"[stickynotes] waiting for XWayland… ({waited:.0f}s)",
-                file=sys.stderr, flush=True,
-            )
-            last_log = waited
+    RETRY_MIN_SEC = 0.005
+    RETRY_MAX_SEC = 0.05
+
+    start = time.monotonic()
+    next_log = HEARTBEAT_SEC
+    retry = RETRY_MIN_SEC
+    watcher = _CreateWatcher()
+    try:
+        while True:
+            if _x_accepting(path):
+                print(
+                    f"[stickynotes] XWayland ready on {path} after "
+                    f"{time.monotonic() - start:.3f}s",
+                    file=sys.stderr, flush=True,
+                )
+                return
+            waited = time.monotonic() - start
+            if waited >= HARD_CAP_SEC:
+                break
+            if waited >= next_log:
+                print(
+                    f"[stickynotes] waiting for XWayland on {path}… "
+                    f"({waited:.0f}s)",
+                    file=sys.stderr, flush=True,
+                )
+                next_log += HEARTBEAT_SEC
+            if os.path.exists(path):
+                # Bound but not listening yet: the server is mid-startup.
+                time.sleep(retry)
+                retry = min(retry * 2, RETRY_MAX_SEC)
+            else:
+                watcher.wait(path, min(next_log, HARD_CAP_SEC) - waited)
+    finally:
+        watcher.close()
 
     print(
         "[stickynotes] XWayland did not appear within 5 min; continuing "
@@ -69,17 +189,21 @@ def _wait_for_xwayland_on_autostart():
     )
 
 
-_wait_for_xwayland_on_autostart()
+with profiling.phase("wait for XWayland"):
+    _wait_for_xwayland_on_autostart()
 
-from PyQt6.QtWidgets import QApplication
-from stickynotes.tray_manager import TrayManager
-from stickynotes import config
-from stickynotes import utils
+with profiling.phase("import PyQt6"):
+    from PyQt6.QtWidgets import QApplication
+with profiling.phase("import stickynotes"):
+    from stickynotes.tray_manager import TrayManager
+    from stickynotes import config
+    from stickynotes import utils
 
 
 def main():
     """Main function to initialize and run the application."""
-    app = QApplication(sys.argv)
+    with profiling.phase("QApplication"):
+        app = QApplication(sys.argv)
 
     # Diagnostic: log the actual platform Qt loaded. Useful for spotting
     # autostart-on-Wayland regressions — if this prints "wayland" instead
@@ -104,7 +228,22 @@ def main():
     # more are ever added, concatenate rather than overwriting this one.
     app.setStyleSheet(utils.tooltip_stylesheet())
 
-    _ = TrayManager(app)
+    with profiling.phase("TrayManager"):
+        tray = TrayManager(app)
+
+    # Serve later launches, and run this launch's own command (if it's
+    # one beyond just starting up).
+    if _claim is not None:
+        server = single_instance.Server(_claim, tray.handle_command)
+        app.aboutToQuit.connect(server.close)
+    command, *args = single_instance.command_from_argv(sys.argv)
+    if command in (single_instance.COMMAND_NEW_NOTE, single_instance.COMMAND_FOCUS):
+        tray.handle_command(command, args)
+
+    if profiling.enabled():
+        profiling.watch_startup(
+            app, tray.open_notes, lambda: tray.restoring
+        )
     sys.exit(app.exec())
 
 
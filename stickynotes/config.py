@@ -18,7 +18,6 @@ SHADOW_GUTTER = 12          # transparent margin for the drop shadow
 RESIZE_ZONE = 16            # >= SHADOW_GUTTER so resize grip reaches the visible note edge
 MIN_NOTE_WIDTH = 160
 MIN_NOTE_HEIGHT = 160
-AUTOSAVE_INTERVAL_MS = 5000
 FONT_FAMILY = "Segoe UI, Ubuntu, Sans Serif"
 FONT_SIZE = 13
 COLLAPSE_ANIMATION_MS = 150
@@ -33,12 +32,54 @@ TITLE_DRAG_SPACER_WIDTH = 40  # reserved drag/collapse grab area on the right of
 # Tray menu
 TRAY_MENU_NOTE_LIMIT = 10   # max number of notes listed in the tray menu
 
-# Persistence timing
-SAVE_DEBOUNCE_MS = 500       # delay after the last move/resize before flushing to QSettings
+# Note storage backend: "sqlite" (one row per note, in the app data dir) or
+# "qsettings" (the original INI layout). sqlite falls back to qsettings on
+# Python builds without the sqlite3 module.
+STORAGE_BACKEND = "sqlite"
+NOTES_DB_FILENAME = "notes.db"
+
+# Write-ahead journal (journal.py). Edits are appended and fdatasync'd every
+# JOURNAL_FLUSH_MS; the store snapshot is only rewritten every
+# SNAPSHOT_INTERVAL_MS, or sooner once the journal segment passes
+# JOURNAL_MAX_BYTES so startup replay stays short.
+JOURNAL_DIRNAME = "journal"
+JOURNAL_FLUSH_MS = 100
+SNAPSHOT_INTERVAL_MS = 60_000
+JOURNAL_MAX_BYTES = 256 * 1024
+
+# Version history (history.py). Each note keeps at most HISTORY_MAX_VERSIONS
+# versions; on top of that, versions older than `age` seconds are thinned to
+# one per `gap` seconds, for each (age, gap) pair. A deleted note's versions
+# are kept for HISTORY_DELETED_GRACE_S, so it can be brought back from the
+# tray's Recently Deleted menu, then dropped.
+HISTORY_DB_FILENAME = "history.db"
+HISTORY_MAX_VERSIONS = 50
+HISTORY_THINNING = (
+    (60 * 60,          10 * 60),        # older than an hour: one per 10 min
+    (24 * 60 * 60,     60 * 60),        # older than a day: one per hour
+    (7 * 24 * 60 * 60, 24 * 60 * 60),   # older than a week: one per day
+)
+HISTORY_DELETED_GRACE_S = 30 * 24 * 60 * 60
+
+# Startup restore (TrayManager._load_notes). Notes are built in priority
+# order, a batch per event-loop turn; a batch ends once it has used
+# RESTORE_BATCH_MS, so the tray and the notes already shown stay responsive.
+RESTORE_BATCH_MS = 12
+
+# Painted icons (bullet, checklist, pin, tray) kept by utils' LRU cache.
+# A few kinds x two icon colors x the format bar's size steps x pinned
+# states; past this, the least recently used are repainted on demand.
+ICON_CACHE_SIZE = 128
 
 # Delete confirmation
 DELETE_CONFIRM_WINDOW_MS = 4000   # how long the "armed" state stays armed before reverting
 
+# How note chrome takes its theme colors (styles.py): "stylesheet" — one
+# cached Qt stylesheet per note — or "palette" — QPalette roles read by the
+# widgets' own paintEvents, so a theme switch is a palette change and a
+# repaint, with no stylesheet re-polish.
+THEME_RENDERING = "stylesheet"
+
 # Shape tokens
 CORNER_RADIUS_PX = 8         # rounded-corner radius used by the note body, title bar, panels
 
@@ -57,6 +98,8 @@ SHADOW_PANEL          = (16, 4, 80)
 # App-level, deliberately not per-note: the dock shows an app as running if ANY
 # of its windows is listed, so hiding only some notes would achieve nothing.
 SETTING_HIDE_FROM_DOCK = "hide_from_dock"
+# Schema version of the notes stored in QSettings (see migrations.py).
+SETTING_NOTES_SCHEMA_VERSION = "notes_schema_version"
 
 # Bound shortcuts — single source of truth for every QShortcut the app installs.
 #
@@ -0,0 +1,329 @@
+# stickynotes/dialogs.py
+#
+# The tray menu's dialogs: About, Keyboard Shortcuts and Settings.
+#
+# Kept out of note_window.py so they're imported the first time one is
+# opened (see TrayManager._show_settings and friends), not on the startup
+# path every launch takes before the first note paints.
+
+from PyQt6.QtWidgets import (
+    QApplication, QCheckBox, QDialog, QGridLayout, QHBoxLayout, QLabel,
+    QPushButton, QSizePolicy, QSystemTrayIcon, QVBoxLayout,
+)
+from PyQt6.QtCore import QSettings, QSize, Qt, QUrl, pyqtSignal
+from PyQt6.QtGui import QDesktopServices, QPalette
+
+from . import __version__
+from . import autostart
+from . import config
+from . import utils
+
+
+# ---------------------------------------------------------------------------
+# AboutDialog — app metadata + useful links (opened from the tray menu).
+#
+# Deliberately brief. Version is pulled from stickynotes.__version__ so it
+# never drifts from the actual package. Links open in the user's default
+# browser / mail client via QDesktopServices.
+# ---------------------------------------------------------------------------
+class AboutDialog(QDialog):
+    _SOURCE_URL = "https://github.com/dstushar7/sticky-notes"
+    _ISSUES_URL = "https://github.com/dstushar7/sticky-notes/issues"
+    _DONATE_URL = "https://www.patreon.com/dstushar7/posts/sticky-note-164511062"
+    _CONTACT_EMAIL = "contact@dabobrotosarkar.com"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("About Sticky Notes")
+        self.setModal(False)
+        self.setFixedWidth(440)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 22, 24, 18)
+        layout.setSpacing(10)
+
+        # Header: icon + name + version side by side
+        header = QHBoxLayout()
+        header.setSpacing(14)
+
+        icon_label = QLabel()
+        icon_label.setPixmap(utils.create_tray_icon().pixmap(QSize(48, 48)))
+        header.addWidget(icon_label, alignment=Qt.AlignmentFlag.AlignTop)
+
+        name_block = QVBoxLayout()
+        name_block.setSpacing(2)
+        name = QLabel("Sticky Notes")
+        name.setStyleSheet("font-size: 16pt; font-weight: 600;")
+        version = QLabel(f"Version {__version__}")
+        version.setStyleSheet("color: #888; font-size: 10pt;")
+        name_block.addWidget(name)
+        name_block.addWidget(version)
+        name_block.addStretch()
+        header.addLayout(name_block)
+        header.addStretch()
+        layout.addLayout(header)
+
+        # Tagline — pulled from the Snap Store summary
+        tagline = QLabel(
+            "The lightest, prettiest sticky notes app on Linux."
+        )
+        tagline.setWordWrap(True)
+        tagline.setStyleSheet("font-size: 10pt;")
+        layout.addWidget(tagline)
+
+        # Author + license one-liner
+        meta = QLabel("© 2026 Dabobroto Sarkar  ·  MIT licensed")
+        meta.setStyleSheet("color: #888; font-size: 9pt;")
+        layout.addWidget(meta)
+
+        layout.addSpacing(4)
+
+        # Link buttons — each opens the URL in the user's default browser.
+        # PointingHandCursor signals they're clickable like normal hyperlinks.
+        # Donate sits last and carries the only bit of colour in the row, so
+        # it reads as the one call to action among otherwise neutral links.
+        link_row = QHBoxLayout()
+        link_row.setSpacing(8)
+        for label, url, accent in (
+            ("Source", self._SOURCE_URL, False),
+            ("Report a bug", self._ISSUES_URL, False),
+            ("Donate", self._DONATE_URL, True),
+        ):
+            btn = QPushButton(label)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            if accent:
+                btn.setStyleSheet("color: #d1495b; font-weight: 600;")
+                btn.setToolTip("Support development on Patreon")
+            btn.clicked.connect(
+                lambda _checked=False, u=url: QDesktopServices.openUrl(QUrl(u))
+            )
+            link_row.addWidget(btn)
+        link_row.addStretch()
+        layout.addLayout(link_row)
+
+        layout.addSpacing(4)
+
+        # Footer: tech credit + clickable mailto. Rich-text QLabel handles
+        # the mailto: link via setOpenExternalLinks.
+        footer = QLabel(
+            "Built with Python and PyQt6  ·  "
+            f'<a href="mailto:{self._CONTACT_EMAIL}" '
+            f'style="color:#888;">{self._CONTACT_EMAIL}</a>'
+        )
+        footer.setTextFormat(Qt.TextFormat.RichText)
+        footer.setOpenExternalLinks(True)
+        footer.setStyleSheet("color: #888; font-size: 9pt;")
+        layout.addWidget(footer)
+
+        # Close button — bottom-right, conventional dialog placement
+        btn_row = QHBoxLayout()
+        btn_row.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.setDefault(True)
+        close_btn.clicked.connect(self.accept)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+
+
+# ---------------------------------------------------------------------------
+# ShortcutsDialog — the app's only permanent record of how to drive it.
+#
+# Exists because nothing else in the running app documents this. The welcome
+# note covers some of it but only appears on first launch and invites its own
+# deletion, so every existing install has no reference at all. Pull-based on
+# purpose: opened from the tray, never shown unprompted.
+#
+# Content comes from config.SHORTCUT_REFERENCE so the bound keys listed here are
+# literally the same strings passed to QShortcut.
+# ---------------------------------------------------------------------------
+class ShortcutsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Keyboard Shortcuts")
+        self.setModal(False)
+        self.setFixedWidth(430)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(24, 20, 24, 18)
+        layout.setSpacing(4)
+
+        # Dialogs follow the system palette, not a note theme, so the keycap
+        # chips have to be chosen against whatever the desktop is running.
+        window_bg = self.palette().color(QPalette.ColorRole.Window)
+        keycap = (
+            config.KEYCAP_DARK if window_bg.lightness() < 128
+            else config.KEYCAP_LIGHT
+        )
+        keycap_css = f"""
+            font-family: monospace;
+            font-size: 9pt;
+            background-color: {keycap['bg']};
+            color: {keycap['text']};
+            border: 1px solid {keycap['border']};
+            border-radius: 4px;
+            padding: 2px 6px;
+        """
+
+        for index, (section, rows) in enumerate(config.SHORTCUT_REFERENCE):
+            if index:
+                layout.addSpacing(14)
+            heading = QLabel(section)
+            heading.setStyleSheet(
+                "font-size: 11pt; font-weight: 600; color: #888;"
+            )
+            layout.addWidget(heading)
+            layout.addSpacing(2)
+
+            # One grid per section keeps each section's key column sized to its
+            # own content — a single shared grid would stretch every key cell to
+            # fit "Drag any edge or corner".
+            grid = QGridLayout()
+            grid.setHorizontalSpacing(14)
+            grid.setVerticalSpacing(6)
+            grid.setColumnStretch(1, 1)
+            for row, (keys, what) in enumerate(rows):
+                key_label = QLabel(keys)
+                key_label.setStyleSheet(keycap_css)
+                # Keep the keycap tight to its text instead of filling the cell.
+                key_label.setSizePolicy(
+                    QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed
+                )
+                desc = QLabel(what)
+                desc.setWordWrap(True)
+                desc.setStyleSheet("font-size: 10pt;")
+                grid.addWidget(key_label, row, 0, Qt.AlignmentFlag.AlignLeft)
+                grid.addWidget(desc, row, 1)
+            layout.addLayout(grid)
+
+            if section == "Lists":
+                note = QLabel(config.SHORTCUT_REFERENCE_FOOTNOTE)
+                note.setWordWrap(True)
+                note.setStyleSheet("color: #888; font-size: 9pt;")
+                layout.addSpacing(6)
+                layout.addWidget(note)
+
+        layout.addSpacing(16)
+        btn_row = QHBoxLayout()
+        btn_row.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.setDefault(True)
+        close_btn.clicked.connect(self.accept)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+
+
+# ---------------------------------------------------------------------------
+# SettingsDialog — global app preferences (opened from the tray menu)
+# ---------------------------------------------------------------------------
+class SettingsDialog(QDialog):
+    # Emitted when the dock preference changes. TrayManager listens and pushes
+    # the new value to every open note; the dialog itself owns no notes.
+    hideFromDockChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Plain "Settings" — desktop shells prepend the app name themselves,
+        # so a longer title gets duplicated and truncated by the WM.
+        self.setWindowTitle("Settings")
+        self.setModal(False)
+        # Width fixed, height derived from content (see adjustSize at the end of
+        # __init__). The old hard-coded 380x180 predates the second setting and
+        # clipped its wrapped explanation text.
+        self.setMinimumWidth(400)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 18, 20, 18)
+        layout.setSpacing(10)
+
+        title = QLabel("Settings")
+        title.setStyleSheet("font-size: 14pt; font-weight: 600;")
+        layout.addWidget(title)
+
+        self.autostart_cb = QCheckBox("Launch on system startup")
+        self.autostart_cb.setChecked(autostart.is_enabled())
+        self.autostart_cb.toggled.connect(self._on_autostart_toggled)
+        layout.addWidget(self.autostart_cb)
+
+        self.hide_dock_cb = QCheckBox("Hide notes from the dock and taskbar")
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        self.hide_dock_cb.setChecked(
+            settings.value(config.SETTING_HIDE_FROM_DOCK, False, type=bool)
+        )
+        self.hide_dock_cb.toggled.connect(self._on_hide_dock_toggled)
+        layout.addWidget(self.hide_dock_cb)
+
+        self.hide_dock_note = QLabel(
+            "Notes stay open and reachable from the tray. This also removes "
+            "them from Alt-Tab."
+        )
+        self.hide_dock_note.setWordWrap(True)
+        self.hide_dock_note.setStyleSheet("color: #888; font-size: 9pt;")
+        layout.addWidget(self.hide_dock_note)
+
+        # Two hard requirements, each a way to strand the user with no route
+        # back to their notes:
+        #   * no system tray -> hiding from the dock removes the LAST way to
+        #     reach the app, including this dialog, which is opened from the
+        #     tray. Unrecoverable without hand-editing the config file.
+        #   * not on xcb -> always-on-top and skip-taskbar are EWMH states;
+        #     native Wayland has no protocol for either, so the toggle would
+        #     silently do nothing.
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            self._disable_hide_dock(
+                "Unavailable: no system tray on this desktop, so hiding the "
+                "dock icon would leave no way to reach your notes."
+            )
+        elif QApplication.platformName() != "xcb":
+            self._disable_hide_dock(
+                "Unavailable: hiding from the dock needs X11 or XWayland."
+            )
+
+        self.status = QLabel("")
+        self.status.setStyleSheet("color: #cc0000; font-size: 9pt;")
+        self.status.setWordWrap(True)
+        layout.addWidget(self.status)
+
+        layout.addStretch()
+
+        btn_row = QHBoxLayout()
+        btn_row.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.setDefault(True)
+        close_btn.clicked.connect(self.accept)
+        btn_row.addWidget(close_btn)
+        layout.addLayout(btn_row)
+
+        # Size to whichever explanation text is actually showing — the guarded
+        # messages are longer than the normal one and wrap to more lines.
+        self.adjustSize()
+
+    def _disable_hide_dock(self, reason: str):
+        # Show it unchecked, because it genuinely isn't in effect — but block
+        # signals while doing so. Without this, setChecked(False) fires
+        # _on_hide_dock_toggled and ERASES the user's stored preference just
+        # for opening Settings on a machine with no tray. The value has to
+        # survive so it takes effect again once a tray is back.
+        self.hide_dock_cb.blockSignals(True)
+        self.hide_dock_cb.setChecked(False)
+        self.hide_dock_cb.blockSignals(False)
+        self.hide_dock_cb.setEnabled(False)
+        self.hide_dock_cb.setToolTip(reason)
+        self.hide_dock_note.setText(reason)
+        self.adjustSize()
+
+    def _on_hide_dock_toggled(self, checked: bool):
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        settings.setValue(config.SETTING_HIDE_FROM_DOCK, checked)
+        settings.sync()
+        self.hideFromDockChanged.emit(checked)
+
+    def _on_autostart_toggled(self, checked: bool):
+        try:
+            autostart.set_enabled(checked)
+            self.status.clear()
+        except OSError as e:
+            # Revert the checkbox so the UI matches reality, then explain.
+            self.autostart_cb.blockSignals(True)
+            self.autostart_cb.setChecked(autostart.is_enabled())
+            self.autostart_cb.blockSignals(False)
+            self.status.setText(f"Could not update autostart: {e}")
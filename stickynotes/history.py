@@ -0,0 +1,257 @@
+# stickynotes/history.py
+#
+# Per-note version history, so a note's content from an hour (or a week)
+# ago can be brought back after the store has long since overwritten it.
+#
+# Capture piggybacks on the save path: the StoreWriter hands every content
+# value it writes to the store to capture(). A content that matches the
+# note's latest version costs one hash and nothing else; a new one is added
+# as a version row pointing at a zlib-compressed blob keyed by that hash, so
+# content that recurs (undo back to an earlier state, a restore) is stored
+# once however many versions reference it.
+#
+# Retention is bounded twice over (config.HISTORY_*): at most
+# HISTORY_MAX_VERSIONS per note, and older versions thinned so they sit at
+# least a minimum gap apart that grows with age — minutes apart for today's
+# edits, a day apart for last month's.
+#
+# Deleting a note doesn't delete its history straight away: the versions
+# are what an accidental delete is undone from (the tray's Recently Deleted
+# menu). They're kept for HISTORY_DELETED_GRACE_S, then purged — on the
+# next delete or the next launch, whichever comes first.
+#
+# Lives in its own database next to the notes store, so history never
+# bloats the snapshot the app reads at startup.
+
+import hashlib
+import os
+import threading
+import time
+import zlib
+
+from . import config
+from . import storage
+
+try:
+    import sqlite3
+except ImportError:   # same fallback as storage.py: no history without it
+    sqlite3 = None
+
+
+def content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class HistoryStore:
+    """Version history for every note. Versions are written from the
+    StoreWriter thread and read from the GUI thread; each thread gets its
+    own connection (see storage.SQLiteStore)."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL          -- zlib-compressed UTF-8 content
+        );
+        CREATE TABLE IF NOT EXISTS versions (
+            id       INTEGER PRIMARY KEY,
+            note_id  TEXT NOT NULL,
+            saved_at REAL NOT NULL,     -- Unix time
+            hash     TEXT NOT NULL REFERENCES blobs (hash)
+        );
+        CREATE INDEX IF NOT EXISTS versions_by_note
+            ON versions (note_id, saved_at);
+        CREATE TABLE IF NOT EXISTS deleted (
+            note_id    TEXT PRIMARY KEY,
+            deleted_at REAL NOT NULL    -- Unix time
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        # note_id -> hash of its latest version. Writer thread only.
+        self._latest = {}
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+        with self._conn:
+            self._purge_deleted(time.time())
+
+    @property
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._connections.append(conn)
+        return conn
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._local = threading.local()
+
+    # ---- Capture (writer thread) --------------------------------------------
+
+    def capture(self, changes: dict, now: float = None):
+        """Record a version for each note in {note_id: {field: value}} whose
+        content differs from its latest version."""
+        now = time.time() if now is None else now
+        captured = []
+        for note_id, fields in changes.items():
+            content = fields.get("content")
+            if content is None:
+                continue
+            digest = content_hash(content)
+            if digest == self._latest_hash(note_id):
+                continue
+            captured.append((note_id, digest, content))
+        # A note saved again after its delete (restored from Recently
+        # Deleted) is live again, whether or not its content is new.
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM deleted WHERE note_id = ?",
+                [(note_id,) for note_id, fields in changes.items()
+                 if "content" in fields],
+            )
+        if not captured:
+            return
+        with self._conn:
+            for note_id, digest, content in captured:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO blobs (hash, data) VALUES (?, ?)",
+                    (digest, zlib.compress(content.encode("utf-8"))),
+                )
+                self._conn.execute(
+                    "INSERT INTO versions (note_id, saved_at, hash) "
+                    "VALUES (?, ?, ?)",
+                    (note_id, now, digest),
+                )
+                self._latest[note_id] = digest
+                self._prune(note_id, now)
+
+    def _latest_hash(self, note_id: str):
+        if note_id not in self._latest:
+            row = self._conn.execute(
+                "SELECT hash FROM versions WHERE note_id = ? "
+                "ORDER BY saved_at DESC, id DESC LIMIT 1",
+                (note_id,),
+            ).fetchone()
+            self._latest[note_id] = row[0] if row is not None else None
+        return self._latest[note_id]
+
+    def _prune(self, note_id: str, now: float):
+        """Apply the retention policy to one note's versions. The newest is
+        always kept; walking back from it, a version survives only if the
+        cap isn't reached and it's at least its age's gap older than the
+        last survivor."""
+        rows = self._conn.execute(
+            "SELECT id, saved_at, hash FROM versions WHERE note_id = ? "
+            "ORDER BY saved_at DESC, id DESC",
+            (note_id,),
+        ).fetchall()
+        kept, last_kept = 0, None
+        dropped = []
+        for version_id, saved_at, digest in rows:
+            gap = 0
+            for age, min_gap in config.HISTORY_THINNING:
+                if now - saved_at >= age:
+                    gap = min_gap
+            if kept >= config.HISTORY_MAX_VERSIONS or (
+                last_kept is not None and last_kept - saved_at < gap
+            ):
+                dropped.append((version_id, digest))
+            else:
+                kept += 1
+                last_kept = saved_at
+        if not dropped:
+            return
+        self._conn.executemany(
+            "DELETE FROM versions WHERE id = ?", [(v,) for v, _ in dropped]
+        )
+        self._drop_orphans({digest for _, digest in dropped})
+
+    def _drop_orphans(self, digests):
+        self._conn.executemany(
+            "DELETE FROM blobs WHERE hash = ? AND NOT EXISTS "
+            "(SELECT 1 FROM versions WHERE versions.hash = blobs.hash)",
+            [(d,) for d in digests],
+        )
+
+    def delete_note(self, note_id: str, now: float = None):
+        """Mark a note deleted. Its versions stay until the grace period
+        runs out; those of notes whose grace already has are purged now."""
+        now = time.time() if now is None else now
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO deleted (note_id, deleted_at) "
+                "VALUES (?, ?)",
+                (note_id, now),
+            )
+            self._purge_deleted(now)
+
+    def _purge_deleted(self, now: float):
+        """Drop every version of notes deleted more than
+        HISTORY_DELETED_GRACE_S ago."""
+        expired = [row[0] for row in self._conn.execute(
+            "SELECT note_id FROM deleted WHERE deleted_at < ?",
+            (now - config.HISTORY_DELETED_GRACE_S,),
+        )]
+        for note_id in expired:
+            digests = {row[0] for row in self._conn.execute(
+                "SELECT hash FROM versions WHERE note_id = ?", (note_id,)
+            )}
+            self._conn.execute(
+                "DELETE FROM versions WHERE note_id = ?", (note_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM deleted WHERE note_id = ?", (note_id,)
+            )
+            self._drop_orphans(digests)
+            self._latest.pop(note_id, None)
+
+    # ---- Browsing (GUI thread) ----------------------------------------------
+
+    def versions(self, note_id: str) -> list:
+        """[(version_id, saved_at, hash)] for a note, newest first."""
+        return self._conn.execute(
+            "SELECT id, saved_at, hash FROM versions WHERE note_id = ? "
+            "ORDER BY saved_at DESC, id DESC",
+            (note_id,),
+        ).fetchall()
+
+    def deleted_notes(self) -> list:
+        """[(note_id, deleted_at, latest content)] for deleted notes still
+        in their grace period, most recently deleted first."""
+        rows = self._conn.execute(
+            "SELECT note_id, deleted_at FROM deleted "
+            "WHERE deleted_at >= ? ORDER BY deleted_at DESC",
+            (time.time() - config.HISTORY_DELETED_GRACE_S,),
+        ).fetchall()
+        notes = []
+        for note_id, deleted_at in rows:
+            latest = self.versions(note_id)
+            content = self.content(latest[0][0]) if latest else None
+            if content is not None:
+                notes.append((note_id, deleted_at, content))
+        return notes
+
+    def content(self, version_id: int):
+        """The content saved as `version_id`, or None if it's been pruned."""
+        row = self._conn.execute(
+            "SELECT data FROM blobs JOIN versions USING (hash) "
+            "WHERE versions.id = ?",
+            (version_id,),
+        ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+
+def open_history():
+    """The history store, or None when this Python has no sqlite3."""
+    if sqlite3 is None:
+        return None
+    return HistoryStore(
+        os.path.join(storage.data_dir(), config.HISTORY_DB_FILENAME)
+    )
@@ -0,0 +1,250 @@
+# stickynotes/journal.py
+#
+# Append-only write-ahead journal of note mutations.
+#
+# The store (storage.py) holds the snapshot; this holds everything that has
+# happened since. Each SaveCoordinator tick appends one batch of entries and
+# fdatasyncs once, which is cheap — a few hundred bytes appended to a file —
+# so edits become durable within a tick of being typed, while the snapshot
+# write that rewrites store rows only has to happen occasionally. At startup
+# the journal is replayed over the snapshot and then compacted into it.
+#
+# Layout: numbered segment files (000001.log, 000002.log, …) in one
+# directory, one JSON object per line:
+#
+#   {"i": id, "s": {field: value, …}}               set fields outright
+#   {"i": id, "d": [start, end, text], "b": crc}    content delta
+#   {"i": id, "x": 1}                               note deleted
+#
+# Content is journaled as a delta against the last content journaled for
+# that note (its "base"): the common prefix and suffix are dropped, so a
+# keystroke in a long note appends a one-character entry, not the note.
+# `b` is the CRC32 of the base. Replay only applies a delta whose base
+# matches what it has, so a delta can never be applied to the wrong text —
+# e.g. one already folded into the snapshot by a compaction that finished
+# just before a crash.
+#
+# Segments make compaction safe without stopping writes: compacting seals
+# the current segment and opens a fresh one, the snapshot is written, and
+# only then are the sealed segments deleted. A crash at any point leaves
+# either the segments or the snapshot holding every entry.
+
+import base64
+import json
+import os
+import zlib
+
+
+_SUFFIX = ".log"
+# Rather than trust the OS to flush metadata too, fdatasync — enough for
+# appended data to survive power loss, and cheaper than a full fsync.
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """Length of the common prefix, by binary search over slice compares —
+    each compare runs in C, so this is O(n log n) work done at C speed
+    instead of a Python loop over every character."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, never reaching into the first `limit`
+    characters of the shorter string (already claimed by the prefix)."""
+    lo, hi = 0, min(len(a), len(b)) - limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def content_delta(old: str, new: str):
+    """(start, end, text) such that old[:start] + text + old[end:] == new."""
+    start = _common_prefix_len(old, new)
+    tail = _common_suffix_len(old, new, start)
+    return start, len(old) - tail, new[start:len(new) - tail]
+
+
+def _crc(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _encode_fields(fields: dict) -> dict:
+    out = dict(fields)
+    if out.get("geometry") is not None:
+        out["geometry"] = base64.b64encode(out["geometry"]).decode("ascii")
+    return out
+
+
+def _decode_fields(fields: dict) -> dict:
+    if fields.get("geometry") is not None:
+        fields["geometry"] = base64.b64decode(fields["geometry"])
+    return fields
+
+
+class Journal:
+    """Segmented append-only mutation log. Not thread-safe: once startup
+    replay is done, only the StoreWriter thread (persistence.py) uses it."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # note_id -> last journaled content, the base for the next delta.
+        # Deliberately survives compaction: the snapshot written by a
+        # compaction holds exactly these contents, so deltas keep chaining.
+        self._bases = {}
+        existing = self._segment_numbers()
+        self._number = (existing[-1] if existing else 0) + 1
+        self._file = None
+        self._size = 0
+        self._open_segment()
+
+    # ---- Segments ---------------------------------------------------------
+
+    def _segment_numbers(self) -> list:
+        numbers = []
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            if ext == _SUFFIX and stem.isdigit():
+                numbers.append(int(stem))
+        return sorted(numbers)
+
+    def _path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{number:06d}{_SUFFIX}")
+
+    def _open_segment(self):
+        self._file = open(self._path(self._number), "ab", buffering=0)
+        self._size = 0
+        # Make the new file's directory entry durable too, once per segment,
+        # or a power cut could lose the whole segment rather than its tail.
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def sealed_segments(self) -> list:
+        """Paths of every segment except the one being appended to — i.e.
+        what a previous run left behind, or what seal() just closed."""
+        return [
+            self._path(n) for n in self._segment_numbers() if n != self._number
+        ]
+
+    def seal(self) -> list:
+        """Close the current segment and start a new one. Returns the sealed
+        paths; delete them with discard() once the snapshot holds them."""
+        self._file.close()
+        self._number += 1
+        self._open_segment()
+        return self.sealed_segments()
+
+    @staticmethod
+    def discard(paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def size(self) -> int:
+        """Bytes appended to the current segment."""
+        return self._size
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ---- Writing ------------------------------------------------------------
+
+    def append(self, changes: dict):
+        """Journal {note_id: {field: value}} as one write and one fdatasync."""
+        lines = []
+        for note_id, fields in changes.items():
+            fields = dict(fields)
+            content = fields.pop("content", None)
+            if content is not None:
+                base = self._bases.get(note_id)
+                if base is None:
+                    fields["content"] = content
+                else:
+                    lines.append({
+                        "i": note_id,
+                        "d": list(content_delta(base, content)),
+                        "b": _crc(base),
+                    })
+                self._bases[note_id] = content
+            if fields:
+                lines.append({"i": note_id, "s": _encode_fields(fields)})
+        self._write(lines)
+
+    def append_delete(self, note_id: str):
+        self._bases.pop(note_id, None)
+        self._write([{"i": note_id, "x": 1}])
+
+    def _write(self, lines):
+        if not lines:
+            return
+        data = "".join(
+            json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for line in lines
+        ).encode("utf-8")
+        self._file.write(data)
+        _datasync(self._file.fileno())
+        self._size += len(data)
+
+    # ---- Replay -------------------------------------------------------------
+
+    def replay(self, load_content):
+        """Fold every sealed segment into change sets.
+
+        `load_content(note_id)` returns a note's snapshot content, the base
+        for its first delta. It's only called for notes whose first entry is
+        a delta, so replay never reads bodies the journal doesn't touch.
+        Returns (changes, deleted): {note_id: {field: value}} with content
+        fully resolved, and the set of note ids deleted since the snapshot.
+        A torn final line (crash mid-append) ends that segment's replay;
+        everything before it is kept.
+        """
+        changes, deleted = {}, set()
+        current = {}
+        for path in self.sealed_segments():
+            with open(path, "rb") as f:
+                for raw in f:
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        break
+                    note_id = entry.get("i")
+                    if "x" in entry:
+                        changes.pop(note_id, None)
+                        current[note_id] = None
+                        deleted.add(note_id)
+                        continue
+                    deleted.discard(note_id)
+                    fields = changes.setdefault(note_id, {})
+                    if "s" in entry:
+                        update = _decode_fields(entry["s"])
+                        fields.update(update)
+                        if "content" in update:
+                            current[note_id] = update["content"]
+                    elif "d" in entry:
+                        if note_id not in current:
+                            current[note_id] = load_content(note_id)
+                        base = current[note_id]
+                        if base is None or _crc(base) != entry.get("b"):
+                            continue   # not our base; see module comment
+                        start, end, text = entry["d"]
+                        current[note_id] = base[:start] + text + base[end:]
+                        fields["content"] = current[note_id]
+        return {k: v for k, v in changes.items() if v}, deleted
@@ -0,0 +1,84 @@
+# stickynotes/migrations.py
+#
+# One-time upgrades of stored notes.
+#
+# The store records which schema its notes are in. Whenever that's behind
+# SCHEMA_VERSION, migrate() reads every note in the legacy shape, runs each
+# pending step over them, and writes the result and the new version in one
+# batch. Every launch after that finds the version current and goes
+# straight to the steady-state load path, which assumes the current schema
+# and does no probing or per-note fallback of its own.
+#
+# Adding a step: bump SCHEMA_VERSION, append (new_version, function) to
+# _STEPS. A step gets the list of records (as left by earlier steps) and
+# returns {note_id: {field: value}} for the notes it changes.
+#
+# Schema versions:
+#   0  anything written before versioning: raw x/y/w/h geometry from the
+#      broken intermediate build, notes without title / last_edited
+#   1  every note has a geometry blob (or none), a title and last_edited
+
+from datetime import datetime, timezone
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextDocument
+from PyQt6.QtWidgets import QWidget
+
+from . import noteformat
+from .note_window import derive_title_from_text
+
+
+SCHEMA_VERSION = 1
+
+
+def _to_v1(records: list) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    # A never-shown window of the same kind as a note: resize + move +
+    # saveGeometry turns raw coordinates into the blob StickyNote restores.
+    scratch = QWidget(
+        None, Qt.WindowType.FramelessWindowHint | Qt.WindowType.Window
+    )
+    doc = QTextDocument()
+    changes = {}
+    for record in records:
+        fields = {}
+        geometry = record["geometry"]
+        if isinstance(geometry, tuple):
+            x, y, w, h = geometry
+            scratch.resize(w, h)
+            scratch.move(x, y)
+            fields["geometry"] = bytes(scratch.saveGeometry().data())
+        if record["title"] is None:
+            # What StickyNote used to derive on every load of such a note.
+            noteformat.load(doc, record["content"] or "")
+            fields["title"] = derive_title_from_text(doc.toPlainText())
+        if record["last_edited"] is None:
+            fields["last_edited"] = now
+        if fields:
+            changes[record["note_id"]] = fields
+    scratch.deleteLater()
+    return changes
+
+
+_STEPS = (
+    (1, _to_v1),
+)
+
+
+def migrate(store):
+    """Bring every note in `store` up to SCHEMA_VERSION. A no-op costing one
+    read of the stored version once it's current. Needs a QApplication."""
+    version = store.schema_version()
+    if version >= SCHEMA_VERSION:
+        return
+    records = store.load_legacy_notes()
+    changes = {}
+    for target, step in _STEPS:
+        if version >= target:
+            continue
+        step_changes = step(records)
+        for record in records:
+            record.update(step_changes.get(record["note_id"], {}))
+        for note_id, fields in step_changes.items():
+            changes.setdefault(note_id, {}).update(fields)
+    store.write_migration(changes, SCHEMA_VERSION)
@@ -3,25 +3,32 @@
 import uuid
 from datetime import datetime, timezone
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QTextEdit, QPushButton,
-    QLabel, QLineEdit, QStackedLayout, QSizePolicy, QGraphicsDropShadowEffect,
-    QApplication, QDialog, QCheckBox, QFrame, QSystemTrayIcon,
+    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton,
+    QLabel, QLineEdit, QStackedLayout, QSizePolicy,
+    QApplication, QFrame, QMenu,
 )
 from PyQt6.QtCore import (
-    QSettings, pyqtSignal, Qt, QPoint, QRect, QSize, QByteArray, QUrl,
+    pyqtSignal, Qt, QPoint, QRect, QRectF, QSize, QByteArray,
     QPropertyAnimation, QParallelAnimationGroup, QEasingCurve,
     QEvent, QTimer,
 )
 from PyQt6.QtGui import (
     QColor, QTextListFormat, QTextBlockFormat, QTextCursor, QKeySequence,
-    QShortcut, QFont, QFontMetrics, QDesktopServices, QPalette,
+    QShortcut, QFont, QFontMetrics, QAction, QTextDocument, QPainter,
+    QPalette,
 )
 
-from . import __version__
+# The tray's dialogs live in dialogs.py, imported the first time one opens,
+# so startup doesn't pay for them.
 from . import config
 from . import utils
-from . import autostart
 from . import xwm
+from . import noteformat
+from . import profiling
+from . import shadows
+from . import persistence
+from . import styles
+from .history import content_hash
 from .widgets import FloatingButton
 
 
@@ -44,6 +51,29 @@ def derive_title_from_text(plain_text: str) -> str:
     return config.DEFAULT_NOTE_TITLE
 
 
+# ---------------------------------------------------------------------------
+# Dirty tracking
+#
+# One flag per persisted field; each names the stored field it owns (see
+# storage.NOTE_FIELDS). StickyNote.take_dirty snapshots only the flagged
+# fields and returns nothing when none are set, so an idle note costs nothing
+# when the SaveCoordinator flushes — no toHtml(), no saveGeometry(), no write.
+#
+# last_edited has no flag of its own: it only ever changes together with the
+# content or the title, so it is written whenever either of those is.
+# ---------------------------------------------------------------------------
+FIELD_CONTENT = "content"
+FIELD_GEOMETRY = "geometry"
+FIELD_THEME = "theme"
+FIELD_COLLAPSED = "collapsed"
+FIELD_TITLE = "title"
+FIELD_PINNED = "pinned"
+ALL_FIELDS = frozenset((
+    FIELD_CONTENT, FIELD_GEOMETRY, FIELD_THEME,
+    FIELD_COLLAPSED, FIELD_TITLE, FIELD_PINNED,
+))
+
+
 # Bullet styles cycled by sublist depth so nested levels are visually distinct.
 _LIST_STYLES = (
     QTextListFormat.Style.ListDisc,
@@ -65,9 +95,9 @@ def _style_for_indent(indent: int) -> QTextListFormat.Style:
 #
 #   * The marker REPLACES the list bullet when rendered, so the underlying
 #     style (ListDisc) never shows through — no doubled glyph.
-#   * Markers survive toHtml()/setHtml() as <li class="checked|unchecked">,
-#     which is exactly the persistence format StickyNote._save already uses.
-#     Checkbox state therefore round-trips with zero changes to save/load.
+#   * Markers are a plain block property, so they persist as the x / o
+#     header tokens of noteformat's compact format (and as
+#     <li class="checked|unchecked"> in legacy HTML notes).
 #
 # So "is this a checklist item?" is simply "is it a list item with a marker?"
 # ---------------------------------------------------------------------------
@@ -368,6 +398,7 @@ class _DeleteButton(QPushButton):
 # ---------------------------------------------------------------------------
 class OptionsPanel(QWidget):
     themeSelected = pyqtSignal(str)
+    historyRequested = pyqtSignal()
     deleteRequested = pyqtSignal()
     # Emitted on every dismissal (outside click, explicit close, theme pick).
     # Carries self so the owner can verify identity before clearing its ref.
@@ -383,7 +414,7 @@ class OptionsPanel(QWidget):
         ("charcoal", "#4A4A4A"),
     ]
 
-    def __init__(self, current_theme: str, parent=None):
+    def __init__(self, current_theme: str, has_history: bool = False, parent=None):
         super().__init__(
             parent,
             Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint,
@@ -396,6 +427,7 @@ class OptionsPanel(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self._dismissed = False
         self._current_theme = current_theme
+        self._has_history = has_history
         self._setup_ui()
         self._apply_panel_style()
 
@@ -443,6 +475,36 @@ class OptionsPanel(QWidget):
             swatch_row.addWidget(btn)
         layout.addLayout(swatch_row)
 
+        # Version history — opens the list of saved versions to restore from
+        # (StickyNote._show_history_menu). Absent when there's no history
+        # store (Python without sqlite3). Opaque colors for the same reason
+        # as the delete button's.
+        if self._has_history:
+            history_btn = QPushButton("🕘  Version History", self)
+            history_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            history_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            history_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #f4f4f4;
+                    color: #333333;
+                    border: 1px solid #e6e6e6;
+                    border-radius: 8px;
+                    padding: 8px 12px;
+                    font-size: 10pt;
+                    font-weight: 500;
+                    text-align: center;
+                }
+                QPushButton:hover {
+                    background-color: #ebebeb;
+                    border: 1px solid #dcdcdc;
+                }
+                QPushButton:pressed {
+                    background-color: #e0e0e0;
+                }
+            """)
+            history_btn.clicked.connect(self.historyRequested.emit)
+            layout.addWidget(history_btn)
+
         # Separator — reads as the boundary between picker and destructive
         # action. Opaque hex equivalent of rgba(0, 0, 0, 0.10) composited on
         # the panel's #ffffff (see _DeleteButton._apply_idle_style for why
@@ -460,19 +522,21 @@ class OptionsPanel(QWidget):
         self.setFixedWidth(220)
 
     def _apply_panel_style(self):
-        # Selector-scoped so we don't accidentally restyle every QWidget child
-        # (which would clobber the swatches and delete button stylesheets).
         self.setObjectName("optionsPanel")
-        self.setStyleSheet(
-            f"QWidget#optionsPanel {{ background-color: #ffffff; "
-            f"border-radius: {config.CORNER_RADIUS_PX}px; }}"
-        )
-        shadow = QGraphicsDropShadowEffect(self)
-        blur, offset_y, alpha = config.SHADOW_PANEL
-        shadow.setBlurRadius(blur)
-        shadow.setOffset(0, offset_y)
-        shadow.setColor(QColor(0, 0, 0, alpha))
-        self.setGraphicsEffect(shadow)
+
+    def paintEvent(self, event):
+        # The panel surface is painted here rather than by a stylesheet, so
+        # its shadow can go underneath it: a stylesheet background is drawn
+        # before paintEvent runs. (Painting keeps the swatch and delete
+        # button stylesheets out of reach, too.)
+        r = config.CORNER_RADIUS_PX
+        rect = QRectF(self.rect())
+        painter = QPainter(self)
+        shadows.paint(painter, rect, config.SHADOW_PANEL, r)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#ffffff"))
+        painter.drawRoundedRect(rect, r, r)
 
 
 # ---------------------------------------------------------------------------
@@ -502,8 +566,6 @@ class EditableTitleLabel(QWidget):
 
         self._editable = True
         self._current_text = ""
-        self._text_color = "#555555"
-        self._hover_overlay = "rgba(0, 0, 0, 0.12)"
 
         self._stack = QStackedLayout(self)
         self._stack.setContentsMargins(8, 2, 8, 2)
@@ -521,9 +583,20 @@ class EditableTitleLabel(QWidget):
         self._edit.installEventFilter(self)
         self._edit.editingFinished.connect(self._on_editing_finished)
 
+        # Set on each, not inherited from the pill: a label showing rich
+        # text only honors a font that was set on it.
+        font = self.font()
+        font.setPointSize(10)
+        font.setWeight(QFont.Weight.DemiBold)
+        self._label.setFont(font)
+        self._edit.setFont(font)
+
         self._stack.addWidget(self._label)
         self._stack.addWidget(self._edit)
         self._stack.setCurrentIndex(0)
+        if styles.uses_palette():
+            self.setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+        self._apply_pill_style()
 
     # ---- Public API ---------------------------------------------------
 
@@ -552,47 +625,43 @@ class EditableTitleLabel(QWidget):
     def is_editing(self) -> bool:
         return self._stack.currentIndex() == 1
 
-    def apply_text_style(self, text_color: str, hover_overlay: str):
-        """Style the pill and its text content. Hover/edit states show the
-        overlay color; idle state is fully transparent so the title text
-        sits flush on the title bar background."""
-        self._text_color = text_color
-        self._hover_overlay = hover_overlay
-        text_qss = (
-            f"color: {text_color}; background-color: transparent;"
-            f"font-size: 10pt; font-weight: 600;"
-        )
-        self._label.setStyleSheet(f"QLabel {{ {text_qss} }}")
-        self._edit.setStyleSheet(
-            f"QLineEdit {{ {text_qss} border: none; padding: 0px; "
-            f"selection-background-color: {text_color}; "
-            f"selection-color: white; }}"
-        )
-        self._apply_pill_style()
-
     def _apply_pill_style(self):
-        """(Re)compute the pill background. Hidden when collapsed; hover-only
-        when display mode; always-on when editing."""
+        """Pick the pill's look in the note's sheet (see styles.py): hidden
+        when collapsed, hover-only in display mode, always-on when
+        editing."""
         if not self._editable:
-            # Collapsed → no pill, no hover. Just plain text on title bar.
-            self.setStyleSheet(
-                "QWidget#titlePill { background-color: transparent; "
-                "border-radius: 10px; }"
-            )
+            state = "locked"
+        elif self.is_editing():
+            state = "editing"
+        else:
+            state = "idle"
+        styles.set_state(self, "pill", state)
+
+    def paintEvent(self, event):
+        # Palette rendering: the pill the sheet's #titlePill rules draw.
+        if not styles.uses_palette():
             return
-        if self.is_editing():
-            # Active edit → keep the pill visible the whole time
-            self.setStyleSheet(
-                f"QWidget#titlePill {{ background-color: {self._hover_overlay}; "
-                f"border-radius: 10px; }}"
+        state = self.property("pill")
+        if state == "editing" or (state == "idle" and self.underMouse()):
+            painter = QPainter(self)
+            styles.paint_surface(
+                painter, QRectF(self.rect()),
+                self.palette().color(styles.ROLE_OVERLAY), 10, 10,
             )
-            return
-        # Display mode, clickable → reveal pill only on hover
-        self.setStyleSheet(
-            "QWidget#titlePill {"
-            " background-color: transparent; border-radius: 10px; }"
-            f" QWidget#titlePill:hover {{ background-color: {self._hover_overlay}; }}"
-        )
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if (event.type() == QEvent.Type.PaletteChange
+                and styles.uses_palette()):
+            # The line edit draws its text in Text, which is the note's
+            # body text; the title is in the chrome color, as the label.
+            chrome = self.palette().color(QPalette.ColorRole.WindowText)
+            pal = self._edit.palette()
+            pal.setColor(QPalette.ColorRole.Text, chrome)
+            pal.setColor(QPalette.ColorRole.Highlight, chrome)
+            pal.setColor(QPalette.ColorRole.HighlightedText,
+                         QColor(Qt.GlobalColor.white))
+            self._edit.setPalette(pal)
 
     # ---- Event handling ----------------------------------------------
 
@@ -738,18 +807,6 @@ class DragHandle(QWidget):
         )
         layout.addWidget(self._drag_area)
 
-    def apply_bg(self, color: str):
-        """Paint both surfaces of the drag handle in the title-bar color.
-        Each widget is styled directly (not via a parent-cascade rule),
-        because cascading background-color from a parent stylesheet to a
-        plain QWidget child is unreliable across Qt themes."""
-        self.setStyleSheet(
-            f"QWidget#dragHandle {{ background-color: {color}; }}"
-        )
-        self._drag_area.setStyleSheet(
-            f"QWidget#dragArea {{ background-color: {color}; }}"
-        )
-
     def mouseDoubleClickEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             note = self.window()
@@ -776,13 +833,10 @@ class TitleBar(QWidget):
         # Otherwise the parent (bg_widget) paints the body color through us.
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.setFixedHeight(config.TITLE_BAR_HEIGHT)
-        # Style state — kept so set_collapsed_style and apply_colors can
-        # re-emit the stylesheet without re-passing every parameter.
-        self._title_bg = "#F9E44A"
         # Remembered so _refresh_pin_icon can repaint the thumbtack on toggle
         # without waiting for the next apply_colors call.
         self._btn_color = "#1a1a1a"
-        self._is_collapsed_style = False
+        styles.set_state(self, "collapsed", False)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -793,9 +847,12 @@ class TitleBar(QWidget):
         self.add_btn = FloatingButton(
             "+",
             tone=FloatingButton.Tone.TITLE_BAR,
-            font_css="font-size: 16pt;",
             tooltip="New note",
         )
+        self.add_btn.setObjectName("addBtn")
+        font = self.add_btn.font()
+        font.setPointSize(16)
+        self.add_btn.setFont(font)
         self.add_btn.clicked.connect(self.newNoteRequested.emit)
         layout.addWidget(self.add_btn)
 
@@ -818,6 +875,7 @@ class TitleBar(QWidget):
             checkable=True,
             tooltip="Always on top",
         )
+        self.pin_btn.setObjectName("pinBtn")
         if QApplication.platformName() != "xcb":
             self.pin_btn.setEnabled(False)
             self.pin_btn.setToolTip(
@@ -830,12 +888,30 @@ class TitleBar(QWidget):
         self.opts_btn = FloatingButton(
             "•••",
             tone=FloatingButton.Tone.TITLE_BAR,
-            font_css="font-size: 10pt;",
             tooltip="Options",
         )
+        self.opts_btn.setObjectName("optsBtn")
+        font = self.opts_btn.font()
+        font.setPointSize(10)
+        self.opts_btn.setFont(font)
         self.opts_btn.clicked.connect(self.optionsRequested.emit)
         layout.addWidget(self.opts_btn)
 
+    def paintEvent(self, event):
+        # The chips' drop shadows, over the bar's stylesheet background
+        # (already drawn) and under the chips themselves.
+        painter = QPainter(self)
+        if styles.uses_palette():
+            # No stylesheet background to draw over: paint the bar.
+            r = config.CORNER_RADIUS_PX
+            styles.paint_surface(
+                painter, QRectF(self.rect()),
+                self.palette().color(styles.ROLE_BAR),
+                r, r if self.property("collapsed") else 0,
+            )
+        for btn in (self.add_btn, self.pin_btn, self.opts_btn):
+            btn.paint_shadow(painter)
+
     def set_pinned(self, pinned: bool):
         """Reflect state in the button WITHOUT re-emitting pinToggled — used
         when restoring a saved note, where the toggle isn't a user action.
@@ -852,53 +928,27 @@ class TitleBar(QWidget):
             self._btn_color, icon_px, filled=self.pin_btn.isChecked()
         ))
         self.pin_btn.setIconSize(QSize(icon_px, icon_px))
-
-    def apply_colors(self, title_bg: str, btn_color: str, hover_overlay: str,
-                     is_dark_theme: bool):
-        """Restyle the title bar surface, its buttons, and the title pill.
-
-        - title_bg: bar background color (theme["title"])
-        - btn_color: text/icon color for buttons and the title pill
-        - hover_overlay: overlay used by the title pill on hover/edit
-        - is_dark_theme: forwarded to FloatingButton so it picks the
-          dark-glass token set on charcoal
-        """
-        self._title_bg = title_bg
-        self._btn_color = btn_color
-        self._rebuild_bar_style()
-        FloatingButton.apply_theme_to_all(
-            (self.add_btn, self.pin_btn, self.opts_btn), btn_color, is_dark_theme
-        )
+        # Checked glass is denser, and so is its shadow (see paintEvent).
+        self.update()
+
+    def apply_colors(self, btn_color: str, is_dark_theme: bool):
+        """Recolor what the note's sheet can't reach: the painted thumbtack
+        (btn_color, theme-derived) and the chips' glass, which their drop
+        shadows are scaled by."""
+        for btn in (self.add_btn, self.pin_btn, self.opts_btn):
+            btn.apply_theme(is_dark_theme)
         # Painted thumbtack, recolored to match the current btn_color — same
-        # approach FormatBar uses for the bullet icon.
-        self._refresh_pin_icon()
-        # DragHandle owns the styling for both its own surface and the inner
-        # drag-area widget (parent-cascade isn't reliable, so each widget
-        # is given its own stylesheet directly).
-        self.drag_handle.apply_bg(title_bg)
-        self.drag_handle.title_widget.apply_text_style(btn_color, hover_overlay)
+        # approach FormatBar uses for the bullet icon. Most themes share a
+        # color, and a new icon means a relayout.
+        if btn_color != self._btn_color:
+            self._btn_color = btn_color
+            self._refresh_pin_icon()
 
     def set_collapsed_style(self, collapsed: bool):
         """Switch the bar between 'top of a note' shape (rounded top only) and
         'self-contained pill' shape (rounded all corners) used while the
         note is collapsed."""
-        if self._is_collapsed_style == collapsed:
-            return
-        self._is_collapsed_style = collapsed
-        self._rebuild_bar_style()
-
-    def _rebuild_bar_style(self):
-        r = config.CORNER_RADIUS_PX
-        bottom_radius = r if self._is_collapsed_style else 0
-        self.setStyleSheet(f"""
-            QWidget#titleBar {{
-                background-color: {self._title_bg};
-                border-top-left-radius: {r}px;
-                border-top-right-radius: {r}px;
-                border-bottom-left-radius: {bottom_radius}px;
-                border-bottom-right-radius: {bottom_radius}px;
-            }}
-        """)
+        styles.set_state(self, "collapsed", collapsed)
 
     def set_title_text(self, text: str):
         """Render the title text in the drag handle (eliding handled inside)."""
@@ -929,19 +979,28 @@ class FormatBar(QWidget):
         # QWidget subclasses need this to honor a stylesheet background-color.
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self._btn_size = self.BTN_DEFAULT
-        self._last_colors = None    # remembered for re-apply after resize
+        self._btn_color = None      # list icons' color, kept for resizes
         self._setup_ui()
         self.apply_size(self.BTN_DEFAULT)
+        self._scale_fonts()
 
     def _setup_ui(self):
         layout = QHBoxLayout(self)
         layout.setContentsMargins(6, 3, 6, 3)
         layout.setSpacing(3)
 
-        self.bold_btn      = self._make_btn("B", "boldBtn",      "font-weight: bold;",            "Bold",      "bold")
-        self.italic_btn    = self._make_btn("I", "italicBtn",    "font-style: italic;",           "Italic",    "italic")
-        self.underline_btn = self._make_btn("U", "underlineBtn", "text-decoration: underline;",   "Underline", "underline")
-        self.strike_btn    = self._make_btn("S", "strikeBtn",    "text-decoration: line-through;", "Strikethrough", "strike")
+        # Each letter is styled as what it does: bold B, italic I, …
+        self.bold_btn      = self._make_btn("B", "boldBtn",      "Bold",      "bold")
+        self.italic_btn    = self._make_btn("I", "italicBtn",    "Italic",    "italic")
+        self.underline_btn = self._make_btn("U", "underlineBtn", "Underline", "underline")
+        self.strike_btn    = self._make_btn("S", "strikeBtn",    "Strikethrough", "strike")
+        for btn, setter in ((self.bold_btn, QFont.setBold),
+                            (self.italic_btn, QFont.setItalic),
+                            (self.underline_btn, QFont.setUnderline),
+                            (self.strike_btn, QFont.setStrikeOut)):
+            font = btn.font()
+            setter(font, True)
+            btn.setFont(font)
         # Bullet button uses a painted icon (set in apply_colors); empty text.
         # With no label at all, the tooltip/accessible name is the ONLY thing
         # identifying this button to either a sighted or a screen-reader user.
@@ -949,10 +1008,10 @@ class FormatBar(QWidget):
         # It also carries the Tab hint. Tab is only bound INSIDE a list
         # (NoteTextEdit.keyPressEvent), so nested sublists can't be discovered
         # by experiment — this button is the one place the hint is relevant.
-        self.bullet_btn    = self._make_btn("", "bulletBtn",     "",                              "Bullet list", "bullet",
+        self.bullet_btn    = self._make_btn("", "bulletBtn",     "Bullet list", "bullet",
                                             hint="Tab to indent")
         # Also icon-only, same reasoning as the bullet button.
-        self.checklist_btn = self._make_btn("", "checklistBtn",  "",                              "Checklist", "checklist",
+        self.checklist_btn = self._make_btn("", "checklistBtn",  "Checklist", "checklist",
                                             hint="click a box to tick it")
 
         layout.addStretch()
@@ -972,7 +1031,7 @@ class FormatBar(QWidget):
                 self.strike_btn, self.bullet_btn, self.checklist_btn)
 
     @staticmethod
-    def _make_btn(label: str, name: str, extra_css: str, tooltip: str = "",
+    def _make_btn(label: str, name: str, tooltip: str = "",
                   shortcut_key: str = "", hint: str = "") -> FloatingButton:
         """`shortcut_key` indexes config.SHORTCUTS rather than being a literal
         key sequence, so the tooltip can only ever show a binding that the app
@@ -981,7 +1040,6 @@ class FormatBar(QWidget):
             label,
             tone=FloatingButton.Tone.TOOLBAR,
             checkable=True,
-            extra_css=extra_css,
             tooltip=tooltip,
             shortcut=config.SHORTCUTS.get(shortcut_key, ""),
             hint=hint,
@@ -989,9 +1047,13 @@ class FormatBar(QWidget):
         btn.setObjectName(name)
         return btn
 
+    def button_size(self) -> int:
+        return self._btn_size
+
     def apply_size(self, btn_size: int):
         """Resize all toolbar buttons. Called by StickyNote on resize so
-        buttons grow proportionally with the note width."""
+        buttons grow proportionally with the note width; the note then
+        restyles for the new size (font and corner radius scale with it)."""
         btn_size = max(self.BTN_MIN, min(self.BTN_MAX, int(btn_size)))
         if btn_size == self._btn_size:
             return
@@ -1000,36 +1062,53 @@ class FormatBar(QWidget):
         self.setFixedHeight(btn_size + 6)
         for btn in self._buttons():
             btn.setFixedSize(btn_size, btn_size)
-        # Re-apply theme so font sizes and the bullet icon pick up the new size
-        if self._last_colors is not None:
-            self.apply_colors(*self._last_colors)
-
-    def apply_colors(self, bg_color: str, btn_color: str, is_dark_theme: bool):
-        """Restyle the bar surface, all five buttons (via FloatingButton),
-        and the bullet button's painted icon."""
-        self._last_colors = (bg_color, btn_color, is_dark_theme)
-
-        # Font size scales with button size — ~13 at btn 30, ~20 at btn 44
-        font_px = max(11, int(self._btn_size * 0.45))
-        font_css = f"font-size: {font_px}px;"
-
-        r = config.CORNER_RADIUS_PX
-        self.setStyleSheet(f"""
-            QWidget#formatBar {{
-                background-color: {bg_color};
-                border-bottom-left-radius: {r}px;
-                border-bottom-right-radius: {r}px;
-            }}
-        """)
+        self._scale_fonts()
+        # Repaint the list icons at the new size
+        if self._btn_color is not None:
+            self._refresh_icons()
+
+    def _scale_fonts(self):
+        """Palette rendering: size the letters as the sheet's toolbar rule
+        would (with a sheet, it does)."""
+        if not styles.uses_palette():
+            return
+        font_px = styles.size_bucket(self._btn_size)[0]
         for btn in self._buttons():
-            btn.set_font_css(font_css)
-        FloatingButton.apply_theme_to_all(self._buttons(), btn_color, is_dark_theme)
+            font = btn.font()
+            if font.pixelSize() != font_px:
+                font.setPixelSize(font_px)
+                btn.setFont(font)
+
+    def paintEvent(self, event):
+        # Palette rendering: the bar surface the sheet's #formatBar draws.
+        if not styles.uses_palette():
+            return
+        painter = QPainter(self)
+        styles.paint_surface(
+            painter, QRectF(self.rect()),
+            self.palette().color(styles.ROLE_BAR), 0, config.CORNER_RADIUS_PX,
+        )
 
-        # Painted list icons, recolored to match the current btn_color
+    def apply_colors(self, btn_color: str, is_dark_theme: bool):
+        """Recolor the buttons' glass and the list buttons' painted icons;
+        the bar and button surfaces follow the note's sheet."""
+        for btn in self._buttons():
+            btn.apply_theme(is_dark_theme)
+        # Most themes share a color, and a new icon means a relayout.
+        if btn_color != self._btn_color:
+            self._btn_color = btn_color
+            self._refresh_icons()
+
+    def _refresh_icons(self):
+        """Painted list icons, in the current btn_color and size."""
         icon_px = max(14, int(self._btn_size * 0.7))
-        self.bullet_btn.setIcon(utils.create_bullet_list_icon(btn_color, icon_px))
+        self.bullet_btn.setIcon(
+            utils.create_bullet_list_icon(self._btn_color, icon_px)
+        )
         self.bullet_btn.setIconSize(QSize(icon_px, icon_px))
-        self.checklist_btn.setIcon(utils.create_checklist_icon(btn_color, icon_px))
+        self.checklist_btn.setIcon(
+            utils.create_checklist_icon(self._btn_color, icon_px)
+        )
         self.checklist_btn.setIconSize(QSize(icon_px, icon_px))
 
 
@@ -1052,12 +1131,17 @@ class StickyNote(QWidget):
         last_edited=None,
         pinned=False,
         hide_from_dock=False,
+        saver=None,
+        content_loader=None,
         parent=None,
     ):
         super().__init__(parent, Qt.WindowType.FramelessWindowHint | Qt.WindowType.Window)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
-        self.note_id = note_id or str(uuid.uuid4())
+        is_new = note_id is None
+        if is_new:
+            note_id = str(uuid.uuid4())
+        self.note_id = note_id
         # Stable window title. Mutter (and other Wayland compositors) use
         # this together with app_id to track per-window placement memory.
         self.setWindowTitle("Sticky Note")
@@ -1065,11 +1149,21 @@ class StickyNote(QWidget):
         self._theme_name = theme
         self._is_pinned = bool(pinned)
         self._hide_from_dock = bool(hide_from_dock)
-        self._is_collapsed = False
+        # Set up front (the collapsed layout itself is applied after the
+        # first show) so showEvent already knows the body stays hidden.
+        self._is_collapsed = bool(collapsed)
         self._pre_collapse_height = 250
         self._options_panel = None
         self._anim_group = None
 
+        # Fields changed since the last write (see FIELD_* above). Stays empty
+        # through construction; the end of __init__ decides what a freshly
+        # built note owes the settings file. _saved_rect is the geometry last
+        # written, so move/resize events that land where the note already is
+        # (every show() replays its pending ones) don't count as changes.
+        self._dirty = set()
+        self._saved_rect = None
+
         # Title state. A missing `title` (None) marks this note as "still on
         # the smart default" — body edits will keep refreshing the displayed
         # title from the first body line until the user commits a custom one.
@@ -1082,33 +1176,40 @@ class StickyNote(QWidget):
         self._is_resizing = False
         self._resize_start_global = None
         self._resize_start_geo = None
+        # What a new size sets off (format-bar scaling, its icons and
+        # restyle, the geometry save) runs at most once a display frame
+        # while the size is changing — see resizeEvent.
+        self._resize_frame_timer = QTimer(self)
+        self._resize_frame_timer.setSingleShot(True)
+        self._resize_frame_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._resize_frame_timer.timeout.connect(self._apply_resize)
 
         # Drag tracking
         self._is_dragging = False
         self._drag_start_global = None
         self._drag_start_window_pos = None
 
-        # Debounced save — fires SAVE_DEBOUNCE_MS after the last move/resize
-        # so we never lose position even if the user quits abruptly.
-        self._save_debounce = QTimer(self)
-        self._save_debounce.setSingleShot(True)
-        self._save_debounce.setInterval(config.SAVE_DEBOUNCE_MS)
-        self._save_debounce.timeout.connect(self._save)
+        # Saves are scheduled app-wide: TrayManager passes its one
+        # SaveCoordinator to every note so all their writes batch together.
+        # A note built on its own (no manager) joins the same one.
+        self._saver = saver if saver is not None else persistence.app_saver()
 
         self.setMinimumSize(config.MIN_NOTE_WIDTH, config.MIN_NOTE_HEIGHT)
-        self._setup_ui()
-        self._setup_shortcuts()
-        self._setup_autosave()
+        with profiling.phase("note.setup_ui", self.note_id):
+            self._setup_ui()
+            self._setup_shortcuts()
 
         # Enable mouse tracking on self and all children for resize cursor
         self.setMouseTracking(True)
 
-        self._apply_theme(utils.get_theme(theme))
+        with profiling.phase("note.theme", self.note_id):
+            self._apply_theme(utils.get_theme(theme))
 
-        # geometry_data: prefer Qt's QByteArray from saveGeometry — its
-        # internal restoreGeometry path is the one Wayland compositors honor
-        # at window mapping. The (x, y, w, h) tuple branch only exists to
-        # migrate notes saved during the broken intermediate version.
+        # geometry_data: the bytes of a saveGeometry() blob — its internal
+        # restoreGeometry path is the one Wayland compositors honor at window
+        # mapping. Stored notes always carry a blob (migrations.py converts
+        # older layouts once); an (x, y, w, h) tuple only places a brand-new
+        # note, such as the welcome note.
         #
         # Also remember the resolved position so TrayManager can ask us to
         # re-assert it later — Mutter overrides our position request during
@@ -1119,27 +1220,22 @@ class StickyNote(QWidget):
         # in the reapply means collapsed notes don't get re-expanded from
         # a stale saved-while-expanded geometry blob.
         self._initial_position = None
-        if isinstance(geometry_data, tuple) and len(geometry_data) == 4:
-            x, y, w, h = geometry_data
-            self.resize(w, h)
-            self.move(x, y)
-            self._initial_position = (x, y)
-        elif geometry_data:
-            # Some QSettings backends (INI on certain platforms) roundtrip
-            # QByteArray as str/bytes. Coerce so restoreGeometry works.
-            if isinstance(geometry_data, str):
-                geometry_data = QByteArray(geometry_data.encode("latin-1"))
-            elif isinstance(geometry_data, (bytes, bytearray)):
-                geometry_data = QByteArray(bytes(geometry_data))
-            self.restoreGeometry(geometry_data)
-            self._initial_position = (self.x(), self.y())
-        else:
-            # Default size scales with the user's screen so notes don't look
-            # tiny on 1440p/4K or oversized on small laptops.
-            screen = QApplication.primaryScreen().availableGeometry()
-            default_w = max(280, min(480, screen.width() // 8))
-            default_h = max(280, min(480, screen.height() // 6))
-            self.resize(default_w, default_h)
+        with profiling.phase("note.geometry", self.note_id):
+            if isinstance(geometry_data, tuple) and len(geometry_data) == 4:
+                x, y, w, h = geometry_data
+                self.resize(w, h)
+                self.move(x, y)
+                self._initial_position = (x, y)
+            elif geometry_data:
+                self.restoreGeometry(QByteArray(geometry_data))
+                self._initial_position = (self.x(), self.y())
+            else:
+                # Default size scales with the user's screen so notes don't
+                # look tiny on 1440p/4K or oversized on small laptops.
+                screen = QApplication.primaryScreen().availableGeometry()
+                default_w = max(280, min(480, screen.width() // 8))
+                default_h = max(280, min(480, screen.height() // 6))
+                self.resize(default_w, default_h)
 
         # Tag the window's WM_NORMAL_HINTS with USPosition so Mutter (and any
         # other X11 WM) honors our requested position on the *initial* window
@@ -1151,35 +1247,40 @@ class StickyNote(QWidget):
         # site is AFTER geometry is applied so winId() exists with the
         # correct geometry, and BEFORE the widget is show()'n so the hint
         # is set when the WM first maps the window.
-        if geometry_data is not None:
-            xwm.mark_position_user_requested(self)
-
-        # Assert WM states BEFORE the window is first mapped. Mutter honours
-        # whatever _NET_WM_STATE is present at map time, so doing it here means
-        # a pinned note is never briefly un-pinned and a dock-hidden note never
-        # flashes into the dock before disappearing. showEvent re-asserts these
-        # afterwards, because Mutter clears the property again on every unmap.
-        xwm.set_initial_wm_states(
-            self, above=self._is_pinned, skip_taskbar=self._hide_from_dock
-        )
+        with profiling.phase("note.xwm_hints", self.note_id):
+            if geometry_data is not None:
+                xwm.mark_position_user_requested(self)
+
+            # Assert WM states BEFORE the window is first mapped. Mutter
+            # honours whatever _NET_WM_STATE is present at map time, so doing
+            # it here means a pinned note is never briefly un-pinned and a
+            # dock-hidden note never flashes into the dock before
+            # disappearing. showEvent re-asserts these afterwards, because
+            # Mutter clears the property again on every unmap.
+            xwm.set_initial_wm_states(
+                self, above=self._is_pinned, skip_taskbar=self._hide_from_dock
+            )
 
         # Install event filter on children after UI is built
         for child in self.findChildren(QWidget):
             child.setMouseTracking(True)
             child.installEventFilter(self)
 
-        # Load content (detect HTML vs plain text)
+        # Load content (compact format, or legacy HTML / plain text). With a
+        # content_loader the body is instead fetched and parsed the first time
+        # it's needed — see _ensure_hydrated — so a note that starts collapsed
+        # costs no document until it's expanded.
+        self._content_loader = content_loader
         if content:
-            if content.strip().startswith("<"):
-                self.text_edit.setHtml(content)
-            else:
-                self.text_edit.setPlainText(content)
+            with profiling.phase("note.content", self.note_id):
+                noteformat.load(self.text_edit.document(), content)
 
         # Seed the title from body if still on the smart default — covers
         # both brand-new notes (empty body → DEFAULT_NOTE_TITLE) and legacy
         # notes loaded without a stored title (derive from existing body so
         # the user sees the same identity they had before the upgrade).
         if self._title_is_default:
+            self._ensure_hydrated()
             self._title = derive_title_from_text(self.text_edit.toPlainText())
         self._refresh_title_display()
 
@@ -1193,6 +1294,15 @@ class StickyNote(QWidget):
         if self._is_pinned:
             self.title_bar.set_pinned(True)
 
+        # A note that has never been written (brand new, or recovered from a
+        # journal whose first entry for it was torn) owes a full write;
+        # everything else starts clean and stays clean until the user
+        # actually changes something.
+        self._saved_rect = QRect(self.geometry())
+        if is_new or title is None:
+            self._dirty = set(ALL_FIELDS)
+            self._saver.mark_dirty(self)
+
         if collapsed:
             QTimer.singleShot(0, self._collapse_immediately)
 
@@ -1206,10 +1316,15 @@ class StickyNote(QWidget):
         is idempotent, so "Show All Notes" re-applying it costs nothing.
         """
         super().showEvent(event)
-        if self._is_pinned:
-            QTimer.singleShot(0, lambda: xwm.set_always_on_top(self, True))
-        if self._hide_from_dock:
-            QTimer.singleShot(0, lambda: xwm.set_skip_taskbar(self, True))
+        if not self._is_collapsed:
+            self._ensure_hydrated()
+        # Deferred as one batch with every other note shown this turn, so a
+        # restore of many pinned notes syncs with the X server once.
+        with xwm.deferred():
+            if self._is_pinned:
+                xwm.set_always_on_top(self, True)
+            if self._hide_from_dock:
+                xwm.set_skip_taskbar(self, True)
 
     def set_hidden_from_dock(self, hidden: bool):
         """Apply the app-global dock preference to this note. Called by
@@ -1224,15 +1339,16 @@ class StickyNote(QWidget):
         the state change applies immediately with no deferral."""
         self._is_pinned = pinned
         xwm.set_always_on_top(self, pinned)
-        self._save()
+        self._mark_dirty(FIELD_PINNED)
 
     def _reapply_initial_position(self):
-        """Re-assert the position captured at init. Called via QTimer on
-        autostart-on-Wayland after Mutter has finished its initial window
-        placement (which silently overrode our requested position). Position-
-        only is intentional: Mutter doesn't fight requested size, and not
-        touching size here means collapsed notes stay collapsed instead of
-        re-expanding. No-op for brand-new notes (no captured position)."""
+        """Re-assert the position captured at init. Called via
+        xwm.when_placed on autostart-on-Wayland once Mutter has finished its
+        initial window placement (which silently overrode our requested
+        position). Position-only is intentional: Mutter doesn't fight
+        requested size, and not touching size here means collapsed notes
+        stay collapsed instead of re-expanding. No-op for brand-new notes
+        (no captured position)."""
         if self._initial_position is None:
             return
         self.move(*self._initial_position)
@@ -1252,6 +1368,8 @@ class StickyNote(QWidget):
 
         self.bg_widget = QWidget(self)
         self.bg_widget.setObjectName("noteBackground")
+        # The chrome's one stylesheet (see _apply_stylesheet)
+        self._stylesheet = None
 
         bg_layout = QVBoxLayout(self.bg_widget)
         bg_layout.setContentsMargins(0, 0, 0, 0)
@@ -1274,6 +1392,15 @@ class StickyNote(QWidget):
         # Tighter list indentation than Qt's 40px default — sticky notes are
         # narrow, and the deep default eats real estate at every sublist level.
         self.text_edit.document().setIndentWidth(config.LIST_INDENT_PX)
+        # Set once: themes only change colors, and a font change relays
+        # out the whole document.
+        font = QFont()
+        font.setFamilies(["Segoe UI", "Ubuntu", "Sans Serif"])
+        font.setPointSize(config.FONT_SIZE)
+        self.text_edit.setFont(font)
+        if styles.uses_palette():
+            # The sheet's `padding: 8px`
+            self.text_edit.setViewportMargins(8, 8, 8, 8)
         bg_layout.addWidget(self.text_edit)
 
         self.format_bar = FormatBar(self.bg_widget)
@@ -1296,13 +1423,12 @@ class StickyNote(QWidget):
 
         outer.addWidget(self.bg_widget)
 
-        # Body drop shadow. Kept as an instance attribute so collapse/expand
-        # can swap to a tighter, denser shadow profile when the note shrinks
-        # to just the title bar (where the bigger expanded shadow gets clipped
-        # by the window edge and the bar reads as having a harsh bottom).
-        self._bg_shadow = QGraphicsDropShadowEffect(self)
-        self.bg_widget.setGraphicsEffect(self._bg_shadow)
-        self._apply_expanded_shadow()
+        # Body drop shadow, painted under bg_widget by paintEvent. Kept as
+        # an instance attribute so collapse/expand can swap to a tighter,
+        # denser shadow profile when the note shrinks to just the title bar
+        # (where the bigger expanded shadow gets clipped by the window edge
+        # and the bar reads as having a harsh bottom).
+        self._shadow_profile = config.SHADOW_BODY_EXPANDED
 
     def _setup_shortcuts(self):
         # QTextEdit doesn't bind Ctrl+B/I/U on its own — wire them explicitly.
@@ -1337,47 +1463,32 @@ class StickyNote(QWidget):
             lambda: self.newNoteRequested.emit(self._theme_name)
         )
 
-    def _setup_autosave(self):
-        self._autosave_timer = QTimer(self)
-        self._autosave_timer.setInterval(config.AUTOSAVE_INTERVAL_MS)
-        self._autosave_timer.timeout.connect(self._save)
-        self._autosave_timer.start()
-
     # ------------------------------------------------------------------
     # Theme
     # ------------------------------------------------------------------
 
     def _apply_theme(self, theme: dict):
-        bg = theme["bg"]
-        title_bg = theme["title"]
-        text_color = theme["text"]
-
-        # Dark themes (charcoal) use light text — title-bar buttons need a
-        # light tint and a light hover overlay to be visible.
-        is_dark = text_color == "#f0f0f0"
-        btn_color = "#cccccc" if is_dark else "#555555"
-        hover_overlay = "rgba(255, 255, 255, 0.18)" if is_dark else "rgba(0, 0, 0, 0.12)"
-
-        self.bg_widget.setStyleSheet(f"""
-            QWidget#noteBackground {{
-                background-color: {bg};
-                border-radius: {config.CORNER_RADIUS_PX}px;
-            }}
-        """)
-        self.title_bar.apply_colors(title_bg, btn_color, hover_overlay, is_dark)
-        self.format_bar.apply_colors(title_bg, btn_color, is_dark)
-        self.text_edit.setStyleSheet(f"""
-            NoteTextEdit {{
-                background-color: transparent;
-                color: {text_color};
-                border: none;
-                padding: 8px;
-            }}
-        """)
-        font = QFont()
-        font.setFamilies(["Segoe UI", "Ubuntu", "Sans Serif"])
-        font.setPointSize(config.FONT_SIZE)
-        self.text_edit.setFont(font)
+        self._theme_colors = colors = styles.theme_colors(theme)
+        if styles.uses_palette():
+            # Inherited by all the chrome; nothing re-polishes or relays out
+            self.bg_widget.setPalette(styles.palette(colors))
+        else:
+            self._apply_stylesheet()
+        self.title_bar.apply_colors(colors.button, colors.is_dark)
+        self.format_bar.apply_colors(colors.button, colors.is_dark)
+
+    def _apply_stylesheet(self):
+        """(Re)style the whole note chrome for the current theme and
+        format-bar size — a no-op unless that changes the sheet (see
+        styles.py)."""
+        if styles.uses_palette():
+            return
+        sheet = styles.stylesheet(
+            self._theme_colors, self.format_bar.button_size()
+        )
+        if sheet != self._stylesheet:
+            self._stylesheet = sheet
+            self.bg_widget.setStyleSheet(sheet)
 
     # ------------------------------------------------------------------
     # Options panel
@@ -1393,8 +1504,11 @@ class StickyNote(QWidget):
         # falls back to a parentless toplevel (which can't be positioned on
         # Wayland) or lands at the compositor's default spot instead of the
         # "..." button.
-        panel = OptionsPanel(self._theme_name, parent=self)
+        panel = OptionsPanel(
+            self._theme_name, self._saver.history is not None, parent=self
+        )
         panel.themeSelected.connect(self._change_theme)
+        panel.historyRequested.connect(self._show_history_menu)
         panel.deleteRequested.connect(self._handle_delete)
         panel.dismissed.connect(self._on_panel_dismissed)
 
@@ -1426,7 +1540,64 @@ class StickyNote(QWidget):
         self._theme_name = theme_name
         self._apply_theme(utils.get_theme(theme_name))
         self._close_options_panel()
-        self._save()
+        self._mark_dirty(FIELD_THEME)
+
+    # ------------------------------------------------------------------
+    # Version history
+    # ------------------------------------------------------------------
+
+    def _show_history_menu(self):
+        """Pop up this note's saved versions below the "..." button; picking
+        one restores it."""
+        self._close_options_panel()
+        self._ensure_hydrated()
+        # Flush first so the current content is itself a saved version —
+        # restoring an old one can then be undone by restoring this one. The
+        # menu opens once the writer is done, without blocking on its fsync.
+        self._saver.flush(then=self._popup_history_menu)
+
+    def _popup_history_menu(self):
+        if self._is_being_deleted or not self.isVisible():
+            return
+        history = self._saver.history
+        current = content_hash(self._serialized_content())
+
+        menu = QMenu(self)
+        menu.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        scratch = QTextDocument(menu)
+        for version_id, saved_at, digest in history.versions(self.note_id):
+            if digest == current:
+                continue
+            content = history.content(version_id)
+            if content is None:
+                continue
+            noteformat.load(scratch, content)
+            preview = derive_title_from_text(scratch.toPlainText())
+            stamp = datetime.fromtimestamp(saved_at).strftime("%b %d, %H:%M")
+            action = QAction(f"{stamp}  —  {preview}", menu)
+            action.triggered.connect(
+                lambda _checked=False, vid=version_id: self._restore_version(vid)
+            )
+            menu.addAction(action)
+        if menu.isEmpty():
+            empty = QAction("(no earlier versions)", menu)
+            empty.setEnabled(False)
+            menu.addAction(empty)
+
+        btn = self.title_bar.opts_btn
+        menu.popup(btn.mapToGlobal(QPoint(0, btn.height())))
+
+    def _restore_version(self, version_id: int):
+        content = self._saver.history.content(version_id)
+        if content is None:
+            return
+        self._ensure_hydrated()
+        self.text_edit.blockSignals(True)
+        noteformat.load(self.text_edit.document(), content)
+        self.text_edit.blockSignals(False)
+        # One body-changed pass for the whole replacement: bumps last_edited,
+        # re-derives a default title and marks the content dirty.
+        self._on_body_changed()
 
     # ------------------------------------------------------------------
     # Delete
@@ -1448,20 +1619,30 @@ class StickyNote(QWidget):
     def _apply_expanded_shadow(self):
         """Roomy soft shadow for the full note. Profile sourced from
         config.SHADOW_BODY_EXPANDED."""
-        blur, offset_y, alpha = config.SHADOW_BODY_EXPANDED
-        self._bg_shadow.setBlurRadius(blur)
-        self._bg_shadow.setOffset(0, offset_y)
-        self._bg_shadow.setColor(QColor(0, 0, 0, alpha))
+        self._shadow_profile = config.SHADOW_BODY_EXPANDED
+        self.update()
 
     def _apply_collapsed_shadow(self):
         """Tighter, denser shadow used while collapsed. The body's gone so
         the shadow has to sell the 'floating pill' feel on its own — and
         a tighter blur stays within SHADOW_GUTTER instead of being clipped
         at the (now small) window edge."""
-        blur, offset_y, alpha = config.SHADOW_BODY_COLLAPSED
-        self._bg_shadow.setBlurRadius(blur)
-        self._bg_shadow.setOffset(0, offset_y)
-        self._bg_shadow.setColor(QColor(0, 0, 0, alpha))
+        self._shadow_profile = config.SHADOW_BODY_COLLAPSED
+        self.update()
+
+    def _ensure_hydrated(self):
+        """Build the body document from the store on first need: when the
+        body is first shown (showEvent, _expand) or focused. Signals are
+        blocked so loading isn't mistaken for a user edit."""
+        loader, self._content_loader = self._content_loader, None
+        if loader is None:
+            return
+        with profiling.phase("note.hydrate", self.note_id):
+            content = loader()
+            if content:
+                self.text_edit.blockSignals(True)
+                noteformat.load(self.text_edit.document(), content)
+                self.text_edit.blockSignals(False)
 
     def toggle_collapse(self):
         if self._is_collapsed:
@@ -1472,6 +1653,7 @@ class StickyNote(QWidget):
     def _collapse(self):
         self._pre_collapse_height = self.height()
         self._is_collapsed = True
+        self._mark_dirty(FIELD_COLLAPSED)
         # Lock title editing while collapsed — committing first so any
         # in-progress rename isn't silently dropped.
         self.title_bar.set_title_editable(False)
@@ -1507,6 +1689,7 @@ class StickyNote(QWidget):
 
     def _expand(self):
         self._is_collapsed = False
+        self._mark_dirty(FIELD_COLLAPSED)
         target_h = max(self._pre_collapse_height, config.MIN_NOTE_HEIGHT)
         # Re-enable title click-to-rename now that the body is back.
         self.title_bar.set_title_editable(True)
@@ -1515,6 +1698,7 @@ class StickyNote(QWidget):
         self.title_bar.set_collapsed_style(False)
         self._apply_expanded_shadow()
 
+        self._ensure_hydrated()
         self.text_edit.show()
         self.format_bar.show()
 
@@ -1693,9 +1877,9 @@ class StickyNote(QWidget):
                 self._title = new_title
                 self._refresh_title_display()
                 self.titleChanged.emit(self.note_id, self._title)
-        # Debounce save so a typing burst doesn't spam QSettings
-        if hasattr(self, "_save_debounce") and not self._is_being_deleted:
-            self._save_debounce.start()
+                self._dirty.add(FIELD_TITLE)
+        # The coordinator batches, so a typing burst is one journal append
+        self._mark_dirty(FIELD_CONTENT)
 
     def _on_title_committed(self, raw_text: str):
         """Slot for the title bar's QLineEdit commit. Trims, caps length,
@@ -1714,8 +1898,7 @@ class StickyNote(QWidget):
         self._last_edited = _now_iso()
         self._refresh_title_display()
         self.titleChanged.emit(self.note_id, self._title)
-        if hasattr(self, "_save_debounce") and not self._is_being_deleted:
-            self._save_debounce.start()
+        self._mark_dirty(FIELD_TITLE)
 
     def _remove_list(self, cursor: QTextCursor):
         start = cursor.selectionStart()
@@ -1813,6 +1996,9 @@ class StickyNote(QWidget):
             self._is_resizing = False
             self._resize_zone = _NONE
             self.unsetCursor()
+            # Resize over: settle on the final size now, not a frame later
+            if self._resize_frame_timer.isActive():
+                self._apply_resize()
             return True
         if self._is_dragging:
             self._is_dragging = False
@@ -1821,7 +2007,9 @@ class StickyNote(QWidget):
 
     def eventFilter(self, obj, event):
         t = event.type()
-        if t == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+        if t == QEvent.Type.FocusIn and obj is self.text_edit:
+            self._ensure_hydrated()
+        elif t == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
             gpos = event.globalPosition().toPoint()
             if self._try_start_resize(gpos):
                 return True
@@ -1835,6 +2023,28 @@ class StickyNote(QWidget):
                 return True
         return super().eventFilter(obj, event)
 
+    # ---- Painting: the body's drop shadow, in the gutter around bg_widget.
+
+    def paintEvent(self, event):
+        r = config.CORNER_RADIUS_PX
+        body = QRectF(self.bg_widget.geometry())
+        # A repaint that stays inside the opaque body — typing, a button
+        # hover — has no shadow showing through it.
+        shadowed = not body.adjusted(r, r, -r, -r).contains(QRectF(event.rect()))
+        # Under palette rendering bg_widget has no stylesheet background,
+        # so the body itself is painted here too, over its shadow.
+        painted = styles.uses_palette()
+        if not (shadowed or painted):
+            return
+        painter = QPainter(self)
+        if shadowed:
+            shadows.paint(painter, body, self._shadow_profile, r)
+        if painted:
+            styles.paint_surface(
+                painter, body, self.bg_widget.palette().color(styles.ROLE_BODY),
+                r, r,
+            )
+
     # ---- Mouse events on StickyNote itself (the shadow gutter region).
     # Children get events through the eventFilter above; the gutter is
     # not covered by any child, so events land here directly.
@@ -1862,21 +2072,36 @@ class StickyNote(QWidget):
 
     def moveEvent(self, event):
         super().moveEvent(event)
-        # Save position shortly after the user finishes moving the window.
-        # Debouncing avoids hammering QSettings during a drag.
-        if hasattr(self, "_save_debounce") and not self._is_being_deleted:
-            self._save_debounce.start()
+        # Save position shortly after the user moves the window. The
+        # coordinator batches, so a drag doesn't write on every move event.
+        self._mark_geometry_dirty()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        if not self.isVisible():
+            # Construction or restore: size the bar before the first paint
+            self._apply_resize()
+        elif not self._resize_frame_timer.isActive():
+            # A live resize sends an event per pointer move, several a
+            # frame. The first starts the clock; by the time it runs out
+            # the rest have landed, and one pass catches up with the last.
+            self._resize_frame_timer.start(self._frame_interval_ms())
+
+    def _frame_interval_ms(self) -> int:
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, round(1000 / rate)) if rate > 0 else 16
+
+    def _apply_resize(self):
+        self._resize_frame_timer.stop()
         # Scale format-bar buttons proportionally to note width
         if hasattr(self, "format_bar"):
             # 30px buttons at ~280px window; clamped by FormatBar to [24, 44]
             btn = int(self.width() / 9.5)
             self.format_bar.apply_size(btn)
+            self._apply_stylesheet()
         # Save size after the user finishes resizing
-        if hasattr(self, "_save_debounce") and not self._is_being_deleted:
-            self._save_debounce.start()
+        self._mark_geometry_dirty()
 
     def _do_resize(self, gpos: QPoint):
         dx = gpos.x() - self._resize_start_global.x()
@@ -1909,334 +2134,66 @@ class StickyNote(QWidget):
     def last_edited(self) -> str:
         return self._last_edited
 
-    def _save(self):
+    def _mark_dirty(self, *fields):
+        """Flag `fields` and queue this note with the SaveCoordinator, which
+        batches it with every other note that changed in the same window."""
         if self._is_being_deleted:
             return
-        settings = QSettings(config.ORG_NAME, config.APP_NAME)
-        settings.beginGroup("notes")
-        settings.setValue(f"{self.note_id}/content",     self.text_edit.toHtml())
-        # Use Qt's encoded geometry — this is the path Wayland compositors
-        # honor at window mapping. Manual x/y/w/h via move() doesn't work
-        # because Wayland forbids apps from positioning themselves.
-        settings.setValue(f"{self.note_id}/geometry",    self.saveGeometry())
-        settings.setValue(f"{self.note_id}/theme",       self._theme_name)
-        settings.setValue(f"{self.note_id}/collapsed",   self._is_collapsed)
-        settings.setValue(f"{self.note_id}/title",       self._title)
-        settings.setValue(f"{self.note_id}/last_edited", self._last_edited)
-        settings.setValue(f"{self.note_id}/pinned",      self._is_pinned)
-        settings.endGroup()
-
-    def closeEvent(self, event):
-        if not self._is_being_deleted:
-            self._save()
-        super().closeEvent(event)
-
-
-# ---------------------------------------------------------------------------
-# AboutDialog — app metadata + useful links (opened from the tray menu).
-#
-# Deliberately brief. Version is pulled from stickynotes.__version__ so it
-# never drifts from the actual package. Links open in the user's default
-# browser / mail client via QDesktopServices.
-# ---------------------------------------------------------------------------
-class AboutDialog(QDialog):
-    _SOURCE_URL = "https://github.com/dstushar7/sticky-notes"
-    _ISSUES_URL = "https://github.com/dstushar7/sticky-notes/issues"
-    _DONATE_URL = "https://www.patreon.com/dstushar7/posts/sticky-note-164511062"
-    _CONTACT_EMAIL = "contact@dabobrotosarkar.com"
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("About Sticky Notes")
-        self.setModal(False)
-        self.setFixedWidth(440)
+        self._dirty.update(fields)
+        self._saver.mark_dirty(self)
 
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(24, 22, 24, 18)
-        layout.setSpacing(10)
-
-        # Header: icon + name + version side by side
-        header = QHBoxLayout()
-        header.setSpacing(14)
-
-        icon_label = QLabel()
-        icon_label.setPixmap(utils.create_tray_icon().pixmap(QSize(48, 48)))
-        header.addWidget(icon_label, alignment=Qt.AlignmentFlag.AlignTop)
-
-        name_block = QVBoxLayout()
-        name_block.setSpacing(2)
-        name = QLabel("Sticky Notes")
-        name.setStyleSheet("font-size: 16pt; font-weight: 600;")
-        version = QLabel(f"Version {__version__}")
-        version.setStyleSheet("color: #888; font-size: 10pt;")
-        name_block.addWidget(name)
-        name_block.addWidget(version)
-        name_block.addStretch()
-        header.addLayout(name_block)
-        header.addStretch()
-        layout.addLayout(header)
-
-        # Tagline — pulled from the Snap Store summary
-        tagline = QLabel(
-            "The lightest, prettiest sticky notes app on Linux."
-        )
-        tagline.setWordWrap(True)
-        tagline.setStyleSheet("font-size: 10pt;")
-        layout.addWidget(tagline)
-
-        # Author + license one-liner
-        meta = QLabel("© 2026 Dabobroto Sarkar  ·  MIT licensed")
-        meta.setStyleSheet("color: #888; font-size: 9pt;")
-        layout.addWidget(meta)
-
-        layout.addSpacing(4)
-
-        # Link buttons — each opens the URL in the user's default browser.
-        # PointingHandCursor signals they're clickable like normal hyperlinks.
-        # Donate sits last and carries the only bit of colour in the row, so
-        # it reads as the one call to action among otherwise neutral links.
-        link_row = QHBoxLayout()
-        link_row.setSpacing(8)
-        for label, url, accent in (
-            ("Source", self._SOURCE_URL, False),
-            ("Report a bug", self._ISSUES_URL, False),
-            ("Donate", self._DONATE_URL, True),
-        ):
-            btn = QPushButton(label)
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            if accent:
-                btn.setStyleSheet("color: #d1495b; font-weight: 600;")
-                btn.setToolTip("Support development on Patreon")
-            btn.clicked.connect(
-                lambda _checked=False, u=url: QDesktopServices.openUrl(QUrl(u))
-            )
-            link_row.addWidget(btn)
-        link_row.addStretch()
-        layout.addLayout(link_row)
-
-        layout.addSpacing(4)
-
-        # Footer: tech credit + clickable mailto. Rich-text QLabel handles
-        # the mailto: link via setOpenExternalLinks.
-        footer = QLabel(
-            "Built with Python and PyQt6  ·  "
-            f'<a href="mailto:{self._CONTACT_EMAIL}" '
-            f'style="color:#888;">{self._CONTACT_EMAIL}</a>'
-        )
-        footer.setTextFormat(Qt.TextFormat.RichText)
-        footer.setOpenExternalLinks(True)
-        footer.setStyleSheet("color: #888; font-size: 9pt;")
-        layout.addWidget(footer)
-
-        # Close button — bottom-right, conventional dialog placement
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        close_btn = QPushButton("Close")
-        close_btn.setDefault(True)
-        close_btn.clicked.connect(self.accept)
-        btn_row.addWidget(close_btn)
-        layout.addLayout(btn_row)
-
-
-# ---------------------------------------------------------------------------
-# ShortcutsDialog — the app's only permanent record of how to drive it.
-#
-# Exists because nothing else in the running app documents this. The welcome
-# note covers some of it but only appears on first launch and invites its own
-# deletion, so every existing install has no reference at all. Pull-based on
-# purpose: opened from the tray, never shown unprompted.
-#
-# Content comes from config.SHORTCUT_REFERENCE so the bound keys listed here are
-# literally the same strings passed to QShortcut.
-# ---------------------------------------------------------------------------
-class ShortcutsDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Keyboard Shortcuts")
-        self.setModal(False)
-        self.setFixedWidth(430)
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(24, 20, 24, 18)
-        layout.setSpacing(4)
-
-        # Dialogs follow the system palette, not a note theme, so the keycap
-        # chips have to be chosen against whatever the desktop is running.
-        window_bg = self.palette().color(QPalette.ColorRole.Window)
-        keycap = (
-            config.KEYCAP_DARK if window_bg.lightness() < 128
-            else config.KEYCAP_LIGHT
-        )
-        keycap_css = f"""
-            font-family: monospace;
-            font-size: 9pt;
-            background-color: {keycap['bg']};
-            color: {keycap['text']};
-            border: 1px solid {keycap['border']};
-            border-radius: 4px;
-            padding: 2px 6px;
-        """
-
-        for index, (section, rows) in enumerate(config.SHORTCUT_REFERENCE):
-            if index:
-                layout.addSpacing(14)
-            heading = QLabel(section)
-            heading.setStyleSheet(
-                "font-size: 11pt; font-weight: 600; color: #888;"
-            )
-            layout.addWidget(heading)
-            layout.addSpacing(2)
-
-            # One grid per section keeps each section's key column sized to its
-            # own content — a single shared grid would stretch every key cell to
-            # fit "Drag any edge or corner".
-            grid = QGridLayout()
-            grid.setHorizontalSpacing(14)
-            grid.setVerticalSpacing(6)
-            grid.setColumnStretch(1, 1)
-            for row, (keys, what) in enumerate(rows):
-                key_label = QLabel(keys)
-                key_label.setStyleSheet(keycap_css)
-                # Keep the keycap tight to its text instead of filling the cell.
-                key_label.setSizePolicy(
-                    QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed
-                )
-                desc = QLabel(what)
-                desc.setWordWrap(True)
-                desc.setStyleSheet("font-size: 10pt;")
-                grid.addWidget(key_label, row, 0, Qt.AlignmentFlag.AlignLeft)
-                grid.addWidget(desc, row, 1)
-            layout.addLayout(grid)
-
-            if section == "Lists":
-                note = QLabel(config.SHORTCUT_REFERENCE_FOOTNOTE)
-                note.setWordWrap(True)
-                note.setStyleSheet("color: #888; font-size: 9pt;")
-                layout.addSpacing(6)
-                layout.addWidget(note)
-
-        layout.addSpacing(16)
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        close_btn = QPushButton("Close")
-        close_btn.setDefault(True)
-        close_btn.clicked.connect(self.accept)
-        btn_row.addWidget(close_btn)
-        layout.addLayout(btn_row)
-
-
-# ---------------------------------------------------------------------------
-# SettingsDialog — global app preferences (opened from the tray menu)
-# ---------------------------------------------------------------------------
-class SettingsDialog(QDialog):
-    # Emitted when the dock preference changes. TrayManager listens and pushes
-    # the new value to every open note; the dialog itself owns no notes.
-    hideFromDockChanged = pyqtSignal(bool)
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        # Plain "Settings" — desktop shells prepend the app name themselves,
-        # so a longer title gets duplicated and truncated by the WM.
-        self.setWindowTitle("Settings")
-        self.setModal(False)
-        # Width fixed, height derived from content (see adjustSize at the end of
-        # __init__). The old hard-coded 380x180 predates the second setting and
-        # clipped its wrapped explanation text.
-        self.setMinimumWidth(400)
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(20, 18, 20, 18)
-        layout.setSpacing(10)
-
-        title = QLabel("Settings")
-        title.setStyleSheet("font-size: 14pt; font-weight: 600;")
-        layout.addWidget(title)
-
-        self.autostart_cb = QCheckBox("Launch on system startup")
-        self.autostart_cb.setChecked(autostart.is_enabled())
-        self.autostart_cb.toggled.connect(self._on_autostart_toggled)
-        layout.addWidget(self.autostart_cb)
-
-        self.hide_dock_cb = QCheckBox("Hide notes from the dock and taskbar")
-        settings = QSettings(config.ORG_NAME, config.APP_NAME)
-        self.hide_dock_cb.setChecked(
-            settings.value(config.SETTING_HIDE_FROM_DOCK, False, type=bool)
-        )
-        self.hide_dock_cb.toggled.connect(self._on_hide_dock_toggled)
-        layout.addWidget(self.hide_dock_cb)
+    def _mark_geometry_dirty(self):
+        # _saved_rect is None until __init__ has applied the stored geometry;
+        # events before that are construction noise, not user moves.
+        if self._saved_rect is None or self.geometry() == self._saved_rect:
+            return
+        self._mark_dirty(FIELD_GEOMETRY)
 
-        self.hide_dock_note = QLabel(
-            "Notes stay open and reachable from the tray. This also removes "
-            "them from Alt-Tab."
+    def _save(self):
+        """Flush now instead of waiting for the coordinator's timers, and wait
+        for the background write to finish. Flushes every pending note, not
+        just this one — they share one write anyway."""
+        self._saver.flush(wait=True)
+
+    def _serialized_content(self) -> str:
+        """The body as stored: the compact format, or toHtml() for
+        formatting it can't express."""
+        return (
+            noteformat.serialize(self.text_edit.document(), self.text_edit.font())
+            or self.text_edit.toHtml()
         )
-        self.hide_dock_note.setWordWrap(True)
-        self.hide_dock_note.setStyleSheet("color: #888; font-size: 9pt;")
-        layout.addWidget(self.hide_dock_note)
-
-        # Two hard requirements, each a way to strand the user with no route
-        # back to their notes:
-        #   * no system tray -> hiding from the dock removes the LAST way to
-        #     reach the app, including this dialog, which is opened from the
-        #     tray. Unrecoverable without hand-editing the config file.
-        #   * not on xcb -> always-on-top and skip-taskbar are EWMH states;
-        #     native Wayland has no protocol for either, so the toggle would
-        #     silently do nothing.
-        if not QSystemTrayIcon.isSystemTrayAvailable():
-            self._disable_hide_dock(
-                "Unavailable: no system tray on this desktop, so hiding the "
-                "dock icon would leave no way to reach your notes."
-            )
-        elif QApplication.platformName() != "xcb":
-            self._disable_hide_dock(
-                "Unavailable: hiding from the dock needs X11 or XWayland."
-            )
 
-        self.status = QLabel("")
-        self.status.setStyleSheet("color: #cc0000; font-size: 9pt;")
-        self.status.setWordWrap(True)
-        layout.addWidget(self.status)
-
-        layout.addStretch()
+    def take_dirty(self) -> dict:
+        """Snapshot the flagged fields as {field: value} for the store and
+        clear the flags. Empty when the note is clean or being deleted."""
+        if self._is_being_deleted or not self._dirty:
+            return {}
+        dirty, self._dirty = self._dirty, set()
+        fields = {}
+        # An unhydrated body can't have changed; what's stored is current.
+        if FIELD_CONTENT in dirty and self._content_loader is None:
+            fields[FIELD_CONTENT] = self._serialized_content()
+        if FIELD_GEOMETRY in dirty:
+            # Use Qt's encoded geometry — this is the path Wayland compositors
+            # honor at window mapping. Manual x/y/w/h via move() doesn't work
+            # because Wayland forbids apps from positioning themselves.
+            fields[FIELD_GEOMETRY] = bytes(self.saveGeometry().data())
+            self._saved_rect = QRect(self.geometry())
+        if FIELD_THEME in dirty:
+            fields[FIELD_THEME] = self._theme_name
+        if FIELD_COLLAPSED in dirty:
+            fields[FIELD_COLLAPSED] = self._is_collapsed
+        if FIELD_TITLE in dirty:
+            fields[FIELD_TITLE] = self._title
+        if FIELD_PINNED in dirty:
+            fields[FIELD_PINNED] = self._is_pinned
+        if dirty & {FIELD_CONTENT, FIELD_TITLE}:
+            fields["last_edited"] = self._last_edited
+        return fields
 
-        btn_row = QHBoxLayout()
-        btn_row.addStretch()
-        close_btn = QPushButton("Close")
-        close_btn.setDefault(True)
-        close_btn.clicked.connect(self.accept)
-        btn_row.addWidget(close_btn)
-        layout.addLayout(btn_row)
-
-        # Size to whichever explanation text is actually showing — the guarded
-        # messages are longer than the normal one and wrap to more lines.
-        self.adjustSize()
-
-    def _disable_hide_dock(self, reason: str):
-        # Show it unchecked, because it genuinely isn't in effect — but block
-        # signals while doing so. Without this, setChecked(False) fires
-        # _on_hide_dock_toggled and ERASES the user's stored preference just
-        # for opening Settings on a machine with no tray. The value has to
-        # survive so it takes effect again once a tray is back.
-        self.hide_dock_cb.blockSignals(True)
-        self.hide_dock_cb.setChecked(False)
-        self.hide_dock_cb.blockSignals(False)
-        self.hide_dock_cb.setEnabled(False)
-        self.hide_dock_cb.setToolTip(reason)
-        self.hide_dock_note.setText(reason)
-        self.adjustSize()
-
-    def _on_hide_dock_toggled(self, checked: bool):
-        settings = QSettings(config.ORG_NAME, config.APP_NAME)
-        settings.setValue(config.SETTING_HIDE_FROM_DOCK, checked)
-        settings.sync()
-        self.hideFromDockChanged.emit(checked)
-
-    def _on_autostart_toggled(self, checked: bool):
-        try:
-            autostart.set_enabled(checked)
-            self.status.clear()
-        except OSError as e:
-            # Revert the checkbox so the UI matches reality, then explain.
-            self.autostart_cb.blockSignals(True)
-            self.autostart_cb.setChecked(autostart.is_enabled())
-            self.autostart_cb.blockSignals(False)
-            self.status.setText(f"Could not update autostart: {e}")
+    def closeEvent(self, event):
+        if not self._is_being_deleted:
+            if self._resize_frame_timer.isActive():
+                self._apply_resize()   # the last frame's size, unsaved yet
+            self._save()
+        super().closeEvent(event)
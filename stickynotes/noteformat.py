@@ -0,0 +1,296 @@
+# stickynotes/noteformat.py
+#
+# Compact on-disk format for note bodies.
+#
+# QTextEdit.toHtml() wraps every note in a DOCTYPE/head/style preamble and
+# repeats long inline style= attributes on every span and list item, so a
+# one-line note costs ~600 bytes and every load pays for setHtml's full HTML
+# parser. The editor only ever produces a handful of formats — bold, italic,
+# underline, strikethrough, nested bullet lists and checklist markers — so
+# this module stores exactly those, one line per block:
+#
+#   SN1                                   magic + version, first line
+#   <header>\t<runs>                      one line per QTextBlock
+#
+# header — space-separated tokens, empty for a plain paragraph:
+#   l<id>:<style>:<indent>   list item; blocks sharing <id> share a QTextList
+#   x / o                    checklist marker, checked / unchecked
+#   t<px> / b<px>            top / bottom block margin (legacy HTML <p>/<ul>)
+#
+# runs — the block's text, split by ESC (\x1b) wherever the character format
+# changes. Each ESC is followed by one flag character, chr(0x40 | bits) with
+# bits bold=1, italic=2, underline=4, strike=8; text before the first ESC is
+# unformatted. An empty block whose trailing ESC+flags has no text carries
+# the block's char format, i.e. what the user types next.
+#
+# Text escapes: \\ \n \r \t and \e (ESC), so a line is always one block.
+#
+# serialize() returns None for a document holding anything outside this set
+# (rich text pasted from a browser, say). Callers then store toHtml() as
+# before, and load() keeps setHtml for anything without the magic line —
+# legacy notes and those fallbacks — so nothing is ever silently dropped.
+
+from PyQt6.QtGui import (
+    QFont, QTextBlockFormat, QTextCharFormat, QTextCursor, QTextFormat,
+    QTextListFormat,
+)
+
+
+MAGIC = "SN1"
+
+_ESC = "\x1b"
+_FLAG_BASE = 0x40
+_BOLD, _ITALIC, _UNDERLINE, _STRIKE = 1, 2, 4, 8
+
+_P = QTextFormat.Property
+_MARKER = QTextBlockFormat.MarkerType
+
+# Properties the format represents. Anything else on a block, char or list
+# format must hold its default value or serialize() gives up (see below).
+_CHAR_PROPS = {
+    _P.FontWeight.value, _P.FontItalic.value, _P.FontUnderline.value,
+    _P.TextUnderlineStyle.value, _P.FontStrikeOut.value,
+}
+_BLOCK_PROPS = {
+    _P.ObjectIndex.value, _P.BlockMarker.value,
+    _P.BlockTopMargin.value, _P.BlockBottomMargin.value,
+}
+_LIST_PROPS = {_P.ListStyle.value, _P.ListIndent.value}
+# Unrepresented properties whose default isn't zero.
+_DEFAULTS = {_P.ListStart.value: 1}
+
+# Font props that setHtml() stamps onto every fragment from the <body>
+# style toHtml() wrote — i.e. the editor's own font. Dropping them changes
+# nothing on screen, since the widget font supplies the same values.
+_FONT_FAMILIES = _P.FontFamilies.value
+_FONT_POINT_SIZE = _P.FontPointSize.value
+
+_SINGLE_UNDERLINE = QTextCharFormat.UnderlineStyle.SingleUnderline.value
+
+_ESCAPES = {"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t", _ESC: "\\e"}
+_UNESCAPES = {"\\": "\\", "n": "\n", "r": "\r", "t": "\t", "e": _ESC}
+
+
+class _Unsupported(Exception):
+    """Raised mid-serialize when the document needs the HTML fallback."""
+
+
+def _plain(value):
+    """Property values come back as Python scalars or Qt enums; compare
+    both by their underlying value."""
+    return getattr(value, "value", value)
+
+
+def _escape(text: str) -> str:
+    if "\\" in text or "\n" in text or "\r" in text or "\t" in text or _ESC in text:
+        return "".join(_ESCAPES.get(c, c) for c in text)
+    return text
+
+
+def _unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    out, i, n = [], 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == "\\" and i + 1 < n:
+            out.append(_UNESCAPES.get(text[i + 1], text[i + 1]))
+            i += 2
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def _check_props(fmt, supported, font=None):
+    for prop, value in fmt.properties().items():
+        if prop in supported:
+            continue
+        if font is not None and (
+            (prop == _FONT_FAMILIES and list(value) == font.families())
+            or (prop == _FONT_POINT_SIZE and value == font.pointSizeF())
+        ):
+            continue
+        value = _plain(value)
+        if value != _DEFAULTS.get(prop, 0) and value not in (0, 0.0, False, None, ""):
+            raise _Unsupported(prop)
+
+
+def _char_flags(fmt: QTextCharFormat, font: QFont) -> int:
+    _check_props(fmt, _CHAR_PROPS, font)
+    flags = 0
+    if fmt.hasProperty(_P.FontWeight.value):
+        weight = fmt.fontWeight()
+        if weight == QFont.Weight.Bold.value:
+            flags |= _BOLD
+        elif weight != QFont.Weight.Normal.value:
+            raise _Unsupported("font weight")
+    if fmt.fontItalic():
+        flags |= _ITALIC
+    if fmt.hasProperty(_P.TextUnderlineStyle.value):
+        style = _plain(fmt.underlineStyle())
+        if style == _SINGLE_UNDERLINE:
+            flags |= _UNDERLINE
+        elif style != 0:
+            raise _Unsupported("underline style")
+    elif fmt.fontUnderline():
+        flags |= _UNDERLINE
+    if fmt.fontStrikeOut():
+        flags |= _STRIKE
+    return flags
+
+
+def _char_format(flags: int) -> QTextCharFormat:
+    fmt = QTextCharFormat()
+    if flags & _BOLD:
+        fmt.setFontWeight(QFont.Weight.Bold)
+    if flags & _ITALIC:
+        fmt.setFontItalic(True)
+    if flags & _UNDERLINE:
+        fmt.setFontUnderline(True)
+    if flags & _STRIKE:
+        fmt.setFontStrikeOut(True)
+    return fmt
+
+
+def _margin(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+def serialize(document, font: QFont):
+    """The document in the compact format, or None if it holds formatting
+    the format can't represent. `font` is the editor's font (see
+    _FONT_FAMILIES)."""
+    if document.rootFrame().childFrames():
+        return None   # tables
+    try:
+        return _serialize(document, font)
+    except _Unsupported:
+        return None
+
+
+def _serialize(document, font: QFont) -> str:
+    lines = [MAGIC]
+    list_ids = {}   # QTextList objectIndex -> ordinal, in document order
+    block = document.begin()
+    while block.isValid():
+        header = []
+        bf = block.blockFormat()
+        _check_props(bf, _BLOCK_PROPS)
+        text_list = block.textList()
+        if text_list is not None:
+            lf = text_list.format()
+            _check_props(lf, _LIST_PROPS)
+            list_id = list_ids.setdefault(text_list.objectIndex(), len(list_ids) + 1)
+            header.append(f"l{list_id}:{_plain(lf.style())}:{lf.indent()}")
+            marker = bf.marker()
+            if marker == _MARKER.Checked:
+                header.append("x")
+            elif marker == _MARKER.Unchecked:
+                header.append("o")
+        if bf.topMargin():
+            header.append("t" + _margin(bf.topMargin()))
+        if bf.bottomMargin():
+            header.append("b" + _margin(bf.bottomMargin()))
+
+        runs = []
+        flags = 0
+        it = block.begin()
+        while not it.atEnd():
+            fragment = it.fragment()
+            fmt = fragment.charFormat()
+            if fmt.isImageFormat() or fmt.isAnchor():
+                raise _Unsupported("object")
+            frag_flags = _char_flags(fmt, font)
+            if frag_flags != flags:
+                runs.append(_ESC + chr(_FLAG_BASE | frag_flags))
+                flags = frag_flags
+            runs.append(_escape(fragment.text()))
+            it += 1
+        if block.length() == 1:
+            empty_flags = _char_flags(block.charFormat(), font)
+            if empty_flags:
+                runs.append(_ESC + chr(_FLAG_BASE | empty_flags))
+
+        lines.append(" ".join(header) + "\t" + "".join(runs))
+        block = block.next()
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+def is_compact(content: str) -> bool:
+    return content.startswith(MAGIC + "\n")
+
+
+def load(document, content: str):
+    """Replace `document`'s contents with `content`: the compact format when
+    it carries the magic line, otherwise legacy HTML or plain text. The undo
+    stack is reset, as setHtml() would."""
+    if not is_compact(content):
+        if content.strip().startswith("<"):
+            document.setHtml(content)
+        else:
+            document.setPlainText(content)
+        return
+
+    document.setUndoRedoEnabled(False)
+    document.clear()
+    cursor = QTextCursor(document)
+    lists = {}
+    first = True
+    for line in content.split("\n")[1:]:
+        header, _, body = line.partition("\t")
+        bf = QTextBlockFormat()
+        list_ref = None
+        for token in header.split():
+            kind, value = token[0], token[1:]
+            if kind == "l":
+                list_ref = value.split(":")
+            elif kind == "x":
+                bf.setMarker(_MARKER.Checked)
+            elif kind == "o":
+                bf.setMarker(_MARKER.Unchecked)
+            elif kind == "t":
+                bf.setTopMargin(float(value))
+            elif kind == "b":
+                bf.setBottomMargin(float(value))
+
+        runs = body.split(_ESC)
+        # Trailing flags with no text: the block's own char format.
+        block_cf = QTextCharFormat()
+        if len(runs) > 1 and len(runs[-1]) == 1:
+            block_cf = _char_format(ord(runs[-1]) & ~_FLAG_BASE)
+
+        if first:
+            cursor.setBlockFormat(bf)
+            cursor.setBlockCharFormat(block_cf)
+            first = False
+        else:
+            cursor.insertBlock(bf, block_cf)
+
+        if list_ref is not None:
+            list_id, style, indent = list_ref
+            text_list = lists.get(list_id)
+            if text_list is None:
+                lf = QTextListFormat()
+                lf.setStyle(QTextListFormat.Style(int(style)))
+                lf.setIndent(int(indent))
+                lists[list_id] = cursor.createList(lf)
+            else:
+                text_list.add(cursor.block())
+
+        if runs[0]:
+            cursor.insertText(_unescape(runs[0]), QTextCharFormat())
+        for run in runs[1:]:
+            if len(run) > 1:
+                cursor.insertText(
+                    _unescape(run[1:]), _char_format(ord(run[0]) & ~_FLAG_BASE)
+                )
+    document.setUndoRedoEnabled(True)
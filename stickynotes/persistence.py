@@ -0,0 +1,358 @@
+# stickynotes/persistence.py
+#
+# App-wide save scheduling. Notes don't write to storage themselves; they
+# flag what changed (see note_window's FIELD_* dirty tracking) and hand
+# themselves to the process's one SaveCoordinator. The coordinator
+# coalesces every note that goes dirty inside a short window into a single
+# batch, so dragging notes around or re-theming several of them costs one
+# write rather than one per note — and one timer for the whole app rather
+# than two per note.
+#
+# Durability and snapshotting are split (journal.py): changes are appended
+# to the journal on a short tick, and the store — the snapshot — is only
+# rewritten every SNAPSHOT_INTERVAL_MS, when the journal grows past
+# JOURNAL_MAX_BYTES, or on flush().
+#
+# None of that I/O happens on the GUI thread. The coordinator only takes
+# the snapshot of what changed (note.take_dirty(), which must read widgets
+# and so has to run there) and hands it to a StoreWriter, whose thread does
+# the journal appends, fdatasyncs and store writes. A slow home directory
+# then delays the write, not the next keystroke.
+#
+# app_saver() opens the whole pipeline — store, migrations, journal,
+# history — once per process, for the TrayManager and for any note built
+# without one, and closes it again on aboutToQuit.
+
+import functools
+import os
+import sys
+import threading
+import traceback
+
+from PyQt6.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+
+from . import config
+from . import history
+from . import profiling
+from . import storage
+from .journal import Journal
+
+
+class StoreWriter:
+    """Background thread that owns every journal and store write.
+
+    Submissions are coalesced rather than queued: changes submitted while
+    the thread is busy are merged per note, field by field, so a note
+    snapshotted five times during one slow write costs one more write with
+    its latest values, not five. Deletes drop whatever is pending for the
+    note. Only this thread touches the journal after startup.
+    """
+
+    def __init__(self, store, journal, history=None):
+        self.store = store
+        self.journal = journal
+        self.history = history
+        self._cond = threading.Condition()
+        # Guarded by _cond: note_id -> {field: value} not yet picked up,
+        # note ids to delete, whether a snapshot was asked for, and the
+        # callbacks to run once all of that is written.
+        self._changes = {}
+        self._deleted = []
+        self._snapshot = False
+        self._done = []
+        self._busy = False
+        self._closed = False
+        # Writer-thread only: journaled changes the store doesn't hold yet,
+        # merged per note so a snapshot writes each field once.
+        self._unsaved = {}
+        self._thread = threading.Thread(
+            target=self._run, name="stickynotes-writer", daemon=True
+        )
+        self._thread.start()
+
+    # ---- GUI thread -------------------------------------------------------
+
+    def submit(self, changes: dict, snapshot: bool = False, done=None):
+        """Queue {note_id: {field: value}} to be journaled, and also written
+        to the store when `snapshot` is set (or the journal has grown too
+        big). `done()` is called on the writer thread once it's written."""
+        with self._cond:
+            for note_id, fields in changes.items():
+                self._changes.setdefault(note_id, {}).update(fields)
+            self._snapshot = self._snapshot or snapshot
+            if done is not None:
+                self._done.append(done)
+            self._cond.notify()
+
+    def delete(self, note_id: str):
+        with self._cond:
+            self._changes.pop(note_id, None)
+            self._deleted.append(note_id)
+            self._cond.notify()
+
+    def drain(self):
+        """Block until everything submitted so far is written."""
+        with self._cond:
+            while self._has_work() or self._busy:
+                self._cond.wait()
+
+    def close(self):
+        """Drain, then stop the thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    # ---- Writer thread ------------------------------------------------------
+
+    def _has_work(self) -> bool:
+        return bool(self._changes or self._deleted or self._snapshot)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._has_work() and not self._closed:
+                    self._cond.wait()
+                if not self._has_work():
+                    return
+                changes, self._changes = self._changes, {}
+                deleted, self._deleted = self._deleted, []
+                snapshot, self._snapshot = self._snapshot, False
+                done, self._done = self._done, []
+                self._busy = True
+            try:
+                self._write(changes, deleted, snapshot)
+            except Exception:
+                # Nothing on this thread can reach the user; report and keep
+                # going. The batch stays in _unsaved, so the next snapshot
+                # retries the store write.
+                print("Sticky Notes: saving notes failed", file=sys.stderr)
+                traceback.print_exc()
+            for callback in done:
+                callback()
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, changes: dict, deleted: list, snapshot: bool):
+        for note_id in deleted:
+            # Immediate rather than batched into the next snapshot: a delete
+            # that only lands later could be undone by a crash in between,
+            # resurrecting the note. Journaled too, so replay can't resurrect
+            # it from entries older than the delete.
+            self._unsaved.pop(note_id, None)
+            self.journal.append_delete(note_id)
+            self.store.delete(note_id)
+            if self.history is not None:
+                self.history.delete_note(note_id)
+
+        # Everything reaching the store goes through the journal first, so
+        # the journal's delta bases always match the snapshot's contents.
+        if changes:
+            self.journal.append(changes)
+            for note_id, fields in changes.items():
+                self._unsaved.setdefault(note_id, {}).update(fields)
+        if not self._unsaved:
+            return
+        if snapshot or self.journal.size() >= config.JOURNAL_MAX_BYTES:
+            sealed = self.journal.seal()
+            self._write_store(self._unsaved)
+            self._unsaved = {}
+            self.journal.discard(sealed)
+
+    def _write_store(self, changes: dict):
+        self.store.write(changes)
+        # Version history rides on store writes rather than journal ticks:
+        # one version per snapshot, not one per burst of keystrokes.
+        if self.history is not None:
+            self.history.capture(changes)
+
+
+class SaveCoordinator(QObject):
+    """Batches dirty notes into one journal append and, later, one store
+    write.
+
+    mark_dirty arms a JOURNAL_FLUSH_MS tick, started by the first mark_dirty
+    of a batch and never restarted — so continuous typing can't starve it —
+    that appends the batch to the journal. The store is written on the much
+    longer snapshot timer, or by flush().
+
+    The writes themselves happen on the StoreWriter's thread.
+    """
+
+    # Emitted on the writer thread with a flush(then=...) callback; delivered
+    # queued, so the callback runs back on the GUI thread.
+    _written = pyqtSignal(object)
+
+    def __init__(self, store, journal, history=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.journal = journal
+        self.history = history
+        self.writer = StoreWriter(store, journal, history)
+        # note_id -> note. A dict rather than a set so a note marked dirty
+        # repeatedly is written once, in the order notes first went dirty.
+        self._pending = {}
+
+        self._journal_tick = self._timer(config.JOURNAL_FLUSH_MS, self._append_journal)
+        self._snapshot = self._timer(config.SNAPSHOT_INTERVAL_MS, self.flush)
+        self._closed = False
+        self._written.connect(lambda callback: callback())
+
+    def _timer(self, interval: int, slot) -> QTimer:
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(interval)
+        timer.timeout.connect(slot)
+        return timer
+
+    def mark_dirty(self, note):
+        """Queue `note` for the next write. Cheap enough to call on every
+        keystroke or move event — it's a dict insert and a timer restart."""
+        if self._closed:
+            return
+        self._pending[note.note_id] = note
+        if not self._journal_tick.isActive():
+            self._journal_tick.start()
+
+    def discard(self, note_id: str):
+        """Forget a queued note without writing it (used on delete)."""
+        self._pending.pop(note_id, None)
+
+    def remove(self, note_id: str):
+        """Drop a deleted note from the store, ahead of anything pending."""
+        self.discard(note_id)
+        if self._closed:
+            return
+        self.writer.delete(note_id)
+
+    def _collect(self) -> dict:
+        """Snapshot and clear the dirty fields of every pending note."""
+        changes = {}
+        for note in self._pending.values():
+            fields = note.take_dirty()
+            if fields:
+                changes[note.note_id] = fields
+        self._pending.clear()
+        return changes
+
+    def _append_journal(self):
+        changes = self._collect()
+        if not changes:
+            return
+        self.writer.submit(changes)
+        if not self._snapshot.isActive():
+            self._snapshot.start()
+
+    def flush(self, wait: bool = False, then=None):
+        """Hand everything pending to the writer as one batch, and snapshot
+        it into the store. Safe to call at any time
+        (quit, window close, explicit actions). `wait` blocks until the
+        writer has finished — what quit and window close need, since the
+        process may be gone the moment they return. `then()`, if given, is
+        called on the GUI thread once the writer has finished instead, for
+        callers that need the write done but mustn't block on it."""
+        if self._closed:
+            return
+        for timer in (self._journal_tick, self._snapshot):
+            timer.stop()
+        done = None
+        if then is not None:
+            done = functools.partial(self._written.emit, then)
+        self.writer.submit(self._collect(), snapshot=True, done=done)
+        if wait:
+            self.writer.drain()
+
+    def close(self):
+        """Write everything pending, then shut the pipeline down in reverse
+        order of opening: the writer thread, then the journal and history,
+        then the store. Connected to aboutToQuit by app_saver(); saves
+        asked for afterwards are ignored."""
+        if self._closed:
+            return
+        self.flush(wait=True)
+        self._closed = True
+        self.writer.close()
+        self.journal.close()
+        if self.history is not None:
+            self.history.close()
+        self.store.close()
+
+    def recover(self, records: list) -> list:
+        """Replay what the journal holds over the snapshot `records` (as
+        returned by store.load_notes) and return the up-to-date records.
+        Records may come without content; a note whose content the journal
+        changed gets it filled in with the replayed body.
+
+        The replayed changes are folded back into the store by the writer,
+        so the compaction doesn't delay the first notes appearing. The
+        sealed segments are only deleted after it commits.
+        """
+        sealed = self.journal.sealed_segments()
+        if not sealed:
+            return records
+        snapshot = {r["note_id"]: r for r in records}
+
+        def _snapshot_content(note_id):
+            record = snapshot.get(note_id)
+            if record is None:
+                return None
+            if "content" not in record:
+                return self.store.load_content(note_id)
+            return record["content"]
+
+        changes, deleted = self.journal.replay(_snapshot_content)
+
+        recovered = []
+        new_notes = dict(changes)
+        for record in records:
+            note_id = record["note_id"]
+            if note_id in deleted:
+                continue
+            recovered.append({**record, **new_notes.pop(note_id, {})})
+        # Whatever is left was created after the snapshot. A new note is
+        # journaled with every field on its first tick, so the defaults below
+        # only matter for a note whose first entry was torn by the crash.
+        for note_id, fields in new_notes.items():
+            recovered.append({
+                "note_id": note_id, "content": "", "geometry": None,
+                "theme": config.DEFAULT_THEME, "collapsed": False,
+                "title": None, "last_edited": None, "pinned": False,
+                **fields,
+            })
+
+        for note_id in deleted:
+            self.writer.delete(note_id)
+        self.writer.submit(changes, snapshot=True)
+        return recovered
+
+
+_app_saver = None
+
+
+def app_saver() -> SaveCoordinator:
+    """The process's one SaveCoordinator, opened on first use: the
+    configured store, migrated to the current schema, with the journal and
+    version history attached. app.quit() doesn't run the notes'
+    closeEvents, so it's closed — and everything pending written — on
+    aboutToQuit."""
+    global _app_saver
+    if _app_saver is None:
+        # Imported here: migrations imports note_window, which imports this
+        # module.
+        from . import migrations
+
+        with profiling.phase("saver.open_store"):
+            store = storage.open_store()
+        with profiling.phase("saver.migrate"):
+            migrations.migrate(store)
+        with profiling.phase("saver.open_journal"):
+            journal = Journal(
+                os.path.join(storage.data_dir(), config.JOURNAL_DIRNAME)
+            )
+        with profiling.phase("saver.open_history"):
+            versions = history.open_history()
+        app = QCoreApplication.instance()
+        _app_saver = SaveCoordinator(store, journal, versions, parent=app)
+        app.aboutToQuit.connect(_app_saver.close)
+    return _app_saver
@@ -0,0 +1,214 @@
+# stickynotes/profiling.py
+#
+# Opt-in startup profiler: `run_stickynotes.py --profile-startup`.
+#
+# Startup code is bracketed with `with profiling.phase(name, note_id):`.
+# While profiling is off, phase() hands back one shared no-op context
+# manager, so the brackets cost a function call and a global read. While
+# it's on, each phase records wall time and the calling thread's CPU time
+# (startup runs on the GUI thread; the save writer's work doesn't count).
+#
+# Startup ends once every stored note has been restored and painted once.
+# Then either a report sorted by time is printed to stderr, or — with
+# --profile-startup=PATH — a JSON trace in Chrome's trace-event format is
+# written to PATH (open it in chrome://tracing or ui.perfetto.dev).
+#
+# Stdlib only, and imported before PyQt6 by run_stickynotes.py, so the
+# PyQt6 import itself can be timed.
+
+import json
+import sys
+import time
+
+FLAG = "--profile-startup"
+
+_T0 = time.perf_counter()
+_enabled = False
+_trace_path = None
+# (name, note_id, start, wall, cpu, depth); start is seconds since _T0.
+# cpu is None for instant marks.
+_events = []
+_depth = 0
+
+
+def enable_from_argv(argv):
+    """Turn profiling on if `argv` carries --profile-startup[=PATH]."""
+    global _enabled, _trace_path
+    for arg in argv:
+        if arg == FLAG or arg.startswith(FLAG + "="):
+            _enabled = True
+            _trace_path = arg.partition("=")[2] or None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("name", "note_id", "start", "cpu")
+
+    def __init__(self, name, note_id):
+        self.name = name
+        self.note_id = note_id
+
+    def __enter__(self):
+        global _depth
+        _depth += 1
+        self.cpu = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _depth
+        wall = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.cpu
+        _depth -= 1
+        _events.append(
+            (self.name, self.note_id, self.start - _T0, wall, cpu, _depth)
+        )
+        return False
+
+
+def phase(name: str, note_id: str = None):
+    """Context manager timing one phase, optionally attributed to a note."""
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase(name, note_id)
+
+
+def mark(name: str, note_id: str = None):
+    """Record an instant (e.g. a note's first paint)."""
+    if _enabled:
+        _events.append(
+            (name, note_id, time.perf_counter() - _T0, 0.0, None, _depth)
+        )
+
+
+# ---------------------------------------------------------------------------
+# End of startup
+# ---------------------------------------------------------------------------
+
+def watch_startup(app, notes, restoring=lambda: False):
+    """Finish once restoring() is false and every note in `notes` (a dict
+    of note_id -> StickyNote that may still be filling up) has painted, or
+    after a safety timeout for sessions where some never do. Call before
+    app.exec()."""
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+
+    class _PaintWatcher(QObject):
+        def __init__(self):
+            super().__init__(app)
+            self.painted = set()
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and obj.isWidgetType():
+                window = obj.window()
+                note_id = getattr(window, "note_id", None)
+                if note_id is not None and note_id not in self.painted:
+                    self.painted.add(note_id)
+                    mark("first paint", note_id)
+                    if not restoring() and self.painted >= set(notes):
+                        QTimer.singleShot(0, self.done)
+            return False
+
+        def done(self):
+            if not _enabled:
+                return
+            app.removeEventFilter(self)
+            finish()
+
+    watcher = _PaintWatcher()
+    app.installEventFilter(watcher)
+    if not notes and not restoring():
+        QTimer.singleShot(0, watcher.done)
+    QTimer.singleShot(30_000, watcher.done)
+
+
+def finish():
+    """Emit the report or trace and stop recording."""
+    global _enabled
+    _enabled = False
+    if _trace_path:
+        with open(_trace_path, "w") as f:
+            json.dump(_trace(), f)
+        print(f"[stickynotes] startup trace written to {_trace_path}",
+              file=sys.stderr, flush=True)
+    else:
+        sys.stderr.write(_report())
+        sys.stderr.flush()
+
+
+def _trace() -> dict:
+    events = []
+    for name, note_id, start, wall, cpu, _depth_ in _events:
+        args = {"note": note_id} if note_id else {}
+        event = {
+            "name": name, "pid": 1, "tid": 1,
+            "ts": round(start * 1e6, 1),
+        }
+        if cpu is None:
+            event.update(ph="i", s="t")
+        else:
+            args["cpu_ms"] = round(cpu * 1000, 3)
+            event.update(ph="X", dur=round(wall * 1e6, 1))
+        event["args"] = args
+        events.append(event)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _report() -> str:
+    # Phases aggregated by name (inclusive of nested phases), then notes
+    # ranked by their outermost phases, so nesting isn't counted twice.
+    by_phase = {}
+    note_spans = {}
+    paints = []
+    for name, note_id, start, wall, cpu, _depth_ in _events:
+        if cpu is None:
+            if name == "first paint":
+                paints.append(start)
+            continue
+        calls, w, c = by_phase.get(name, (0, 0.0, 0.0))
+        by_phase[name] = (calls + 1, w + wall, c + cpu)
+        if note_id is not None:
+            note_spans.setdefault(note_id, []).append((start, wall, cpu))
+    by_note = {}
+    for note_id, spans in note_spans.items():
+        total_w = total_c = 0.0
+        covered_until = -1.0
+        for start, wall, cpu in sorted(spans, key=lambda s: (s[0], -s[1])):
+            if start < covered_until:
+                continue   # nested in a span already counted
+            total_w += wall
+            total_c += cpu
+            covered_until = start + wall
+        by_note[note_id] = (total_w, total_c)
+
+    lines = ["", "Startup profile (wall / CPU ms, inclusive)"]
+    if paints:
+        lines.append(
+            f"  first note painted at {min(paints) * 1000:.1f} ms, "
+            f"last at {max(paints) * 1000:.1f} ms after launch"
+        )
+    lines.append(f"  {'phase':<28}{'calls':>7}{'wall':>11}{'cpu':>11}")
+    for name, (calls, w, c) in sorted(
+        by_phase.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        lines.append(f"  {name:<28}{calls:>7}{w * 1000:>11.1f}{c * 1000:>11.1f}")
+    if by_note:
+        lines.append("")
+        lines.append(f"  {'slowest notes':<28}{'':>7}{'wall':>11}{'cpu':>11}")
+        ranked = sorted(by_note.items(), key=lambda item: item[1][0], reverse=True)
+        for note_id, (w, c) in ranked[:10]:
+            lines.append(f"  {note_id[:28]:<28}{'':>7}{w * 1000:>11.1f}{c * 1000:>11.1f}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,126 @@
+# stickynotes/shadows.py
+#
+# Drop shadows painted from a cache instead of QGraphicsDropShadowEffect.
+#
+# A graphics effect renders the widget it's on — and everything inside it —
+# into an offscreen pixmap and blurs that on every repaint. On a note's
+# body that meant every keystroke in the text edit paid for a blur of the
+# whole note. But a shadow's shape never changes, only its size: a blurred
+# rounded rect stretches like any nine-slice image, with the corners drawn
+# as-is and the edges and middle stretched between them.
+#
+# So each shadow is blurred once per (profile, corner radius, device pixel
+# ratio) into a small image and kept for the session, and paint() draws it
+# behind a rect in nine pieces. The owner calls it from its paintEvent,
+# before (underneath) whatever casts the shadow.
+#
+# Profiles are config.SHADOW_* tuples — (blur radius, vertical offset,
+# alpha) — the same values the graphics effects were given — and each is
+# rendered by a QGraphicsDropShadowEffect, once, so they look as they did.
+
+import math
+
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPainterPath, QPen, QPixmap
+
+
+class _NineSlice:
+    __slots__ = ("pixmap", "margin", "corner")
+
+    def __init__(self, pixmap: QPixmap, margin: float, corner: float):
+        self.pixmap = pixmap
+        self.margin = margin   # logical px the shadow reaches past the rect
+        self.corner = corner   # logical px of each corner tile
+
+
+_cache = {}   # (blur, alpha, radius, dpr) -> _NineSlice
+
+
+def _render(blur: int, alpha: int, radius: float, dpr: float) -> _NineSlice:
+    """Blur a rounded rect just big enough that every corner tile holds the
+    whole corner falloff, leaving a one-pixel uniform strip between them."""
+    from PyQt6.QtWidgets import (
+        QGraphicsDropShadowEffect, QGraphicsPathItem, QGraphicsScene,
+    )
+
+    # All in device pixels: blur and rasterise at the screen's resolution.
+    margin = math.ceil(blur * dpr)
+    corner = math.ceil(margin + (radius + blur) * dpr)
+    size = 2 * corner + 1
+    shape = QRectF(margin, margin, size - 2 * margin, size - 2 * margin)
+
+    # The very effect the widgets used to carry, with its shadow thrown
+    # one tile to the right of the shape, clear of it: the right half of
+    # the render is the shadow alone, including the part a widget would
+    # cover (which shows through translucent chips).
+    path = QPainterPath()
+    path.addRoundedRect(shape, radius * dpr, radius * dpr)
+    item = QGraphicsPathItem(path)
+    item.setPen(QPen(Qt.PenStyle.NoPen))
+    item.setBrush(QColor(0, 0, 0))
+    effect = QGraphicsDropShadowEffect()
+    effect.setBlurRadius(blur * dpr)
+    effect.setOffset(size, 0)
+    effect.setColor(QColor(0, 0, 0, alpha))
+    item.setGraphicsEffect(effect)
+    scene = QGraphicsScene(0, 0, 2 * size, size)
+    scene.addItem(item)
+
+    # Rendered whole: the effect only sees the part of its source that
+    # lands on the device.
+    image = QImage(2 * size, size, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    scene.render(painter)
+    painter.end()
+
+    pixmap = QPixmap.fromImage(image.copy(size, 0, size, size))
+    pixmap.setDevicePixelRatio(dpr)
+    return _NineSlice(pixmap, margin / dpr, corner / dpr)
+
+
+def _nine_slice(profile, radius: float, dpr: float) -> _NineSlice:
+    blur, _offset_y, alpha = profile
+    key = (blur, alpha, radius, dpr)
+    tiles = _cache.get(key)
+    if tiles is None:
+        tiles = _cache[key] = _render(blur, alpha, radius, dpr)
+    return tiles
+
+
+def paint(painter: QPainter, rect: QRectF, profile, radius: float):
+    """Paint the shadow `rect` (a rounded rect of corner `radius`) would
+    cast under `profile`, one of the config.SHADOW_* tuples. Call before
+    painting whatever sits on top of it."""
+    dpr = painter.device().devicePixelRatioF()
+    tiles = _nine_slice(profile, radius, dpr)
+    offset_y = profile[1]
+    m = tiles.margin
+    target = rect.translated(0, offset_y).adjusted(-m, -m, m, m)
+
+    # Corner tiles at their natural size, shrunk only if the rect is too
+    # small to fit two of them side by side.
+    source_corner = tiles.corner * dpr
+    cw = min(tiles.corner, target.width() / 2)
+    ch = min(tiles.corner, target.height() / 2)
+    scw = source_corner * cw / tiles.corner
+    sch = source_corner * ch / tiles.corner
+    size = tiles.pixmap.width()   # device pixels, square
+
+    xs = (target.left(), target.left() + cw, target.right() - cw, target.right())
+    ys = (target.top(), target.top() + ch, target.bottom() - ch, target.bottom())
+    sxs = (0, scw, size - scw, size)
+    sys_ = (0, sch, size - sch, size)
+    for row in range(3):
+        for col in range(3):
+            dest = QRectF(
+                xs[col], ys[row], xs[col + 1] - xs[col], ys[row + 1] - ys[row]
+            )
+            if dest.width() <= 0 or dest.height() <= 0:
+                continue
+            source = QRectF(
+                sxs[col], sys_[row],
+                sxs[col + 1] - sxs[col], sys_[row + 1] - sys_[row],
+            )
+            painter.drawPixmap(dest, tiles.pixmap, source)
@@ -0,0 +1,245 @@
+# stickynotes/single_instance.py
+#
+# One running instance per user. A second launch doesn't load the notes
+# again and race the first to the same files — it forwards what it was
+# asked to do to the running instance over a Unix socket and exits.
+#
+#   python run_stickynotes.py                   # already running → show all
+#   python run_stickynotes.py --new-note        # open a new note
+#   python run_stickynotes.py --focus-note ID   # raise one note
+#
+# Deliberately stdlib sockets plus a QSocketNotifier rather than
+# QLocalServer/QLocalSocket: the snap build prunes QtNetwork to keep the
+# package small, and the client side runs in run_stickynotes.py before
+# PyQt6 is even imported, so a forwarding launch costs milliseconds.
+#
+# Protocol: one JSON array per connection, newline-terminated, e.g.
+# ["focus", "<note id>"]; the server answers "ok\n" once it has acted.
+#
+# Who's primary is decided by an flock on a lock file next to the socket,
+# held for the life of the process — so a socket left behind by a crash is
+# recognised as stale, and two launches racing at login can't both win.
+
+import errno
+import fcntl
+import json
+import os
+import socket
+import sys
+import time
+
+_SOCKET_NAME = "stickynotes.sock"
+_CONNECT_TIMEOUT_SEC = 2.0
+# How long a launch that lost the lock waits for the winner to start
+# listening (it may itself be waiting for XWayland at login).
+_STARTUP_WAIT_SEC = 30.0
+
+# Commands. COMMAND_NONE: an autostart launch finding the app already
+# running has nothing to ask for.
+COMMAND_NONE = "none"
+COMMAND_SHOW_ALL = "show-all"
+COMMAND_NEW_NOTE = "new-note"
+COMMAND_FOCUS = "focus"
+
+
+def command_from_argv(argv) -> list:
+    """The intent of this launch as [command, *args]."""
+    if "--focus-note" in argv:
+        i = argv.index("--focus-note")
+        if i + 1 < len(argv):
+            return [COMMAND_FOCUS, argv[i + 1]]
+    if "--new-note" in argv:
+        return [COMMAND_NEW_NOTE]
+    if "--autostart" in argv:
+        return [COMMAND_NONE]
+    return [COMMAND_SHOW_ALL]
+
+
+def _socket_path() -> str:
+    # $XDG_RUNTIME_DIR is per-user, per-boot and private (under snap it's
+    # the snap's own subdirectory of it).
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime and os.path.isdir(runtime):
+        return os.path.join(runtime, _SOCKET_NAME)
+    import tempfile
+    return os.path.join(
+        tempfile.gettempdir(), f"stickynotes-{os.getuid()}.sock"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Client (runs before PyQt6 is imported)
+# ---------------------------------------------------------------------------
+
+def _send(path: str, command: list) -> bool:
+    """Deliver `command` to the instance listening on `path`. False if
+    nothing is listening there."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(_CONNECT_TIMEOUT_SEC)
+    try:
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+        sock.sendall(json.dumps(command).encode("utf-8") + b"\n")
+        sock.recv(16)   # "ok" — or EOF; either way it's been handled
+        return True
+    except OSError:
+        # Connected, but no answer in time: the instance is still starting
+        # up (waiting for XWayland, say). The command sits in the socket
+        # until it gets there; a second copy of the app would be worse.
+        print("[stickynotes] running instance is still starting; command "
+              "queued", file=sys.stderr, flush=True)
+        return True
+    finally:
+        sock.close()
+
+
+class Claim:
+    """Proof that this process is the primary instance: the held lock and
+    the bound, listening socket (not yet watched — see Server)."""
+
+    def __init__(self, lock_fd: int, listener: socket.socket, path: str):
+        self.lock_fd = lock_fd
+        self.listener = listener
+        self.path = path
+
+    def release(self):
+        self.listener.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        os.close(self.lock_fd)
+
+
+def claim_or_forward(argv):
+    """Become the primary instance, returning a Claim — or, when another
+    instance is already running, forward this launch's command to it and
+    exit the process. Returns None if the socket can't be set up at all
+    (the app then runs unguarded rather than not at all)."""
+    path = _socket_path()
+    command = command_from_argv(argv)
+    if _send(path, command):
+        sys.exit(0)
+
+    try:
+        lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return None
+    deadline = time.monotonic() + _STARTUP_WAIT_SEC
+    while True:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                os.close(lock_fd)
+                return None
+        # Another launch holds the lock but isn't listening yet.
+        if _send(path, command):
+            sys.exit(0)
+        if time.monotonic() >= deadline:
+            print("[stickynotes] another instance holds the lock but never "
+                  "started listening; exiting", file=sys.stderr, flush=True)
+            sys.exit(1)
+        time.sleep(0.05)
+
+    # Primary. Whatever socket is left at `path` belongs to a dead instance.
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        os.close(lock_fd)
+        return None
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(path)
+        listener.listen(8)
+    except OSError:
+        listener.close()
+        os.close(lock_fd)
+        return None
+    listener.setblocking(False)
+    return Claim(lock_fd, listener, path)
+
+
+# ---------------------------------------------------------------------------
+# Server (GUI thread, once the app is up)
+# ---------------------------------------------------------------------------
+
+class _Connection:
+    def __init__(self, server, sock):
+        from PyQt6.QtCore import QSocketNotifier
+
+        self._server = server
+        self._sock = sock
+        self._buffer = b""
+        self._notifier = QSocketNotifier(
+            sock.fileno(), QSocketNotifier.Type.Read
+        )
+        self._notifier.activated.connect(self._on_readable)
+
+    def _on_readable(self):
+        try:
+            data = self._sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        self._buffer += data
+        if b"\n" in self._buffer or not data or len(self._buffer) > 65536:
+            self._finish()
+
+    def _finish(self):
+        self._notifier.setEnabled(False)
+        self._server._connections.discard(self)
+        line = self._buffer.partition(b"\n")[0]
+        try:
+            command = json.loads(line.decode("utf-8"))
+        except ValueError:
+            command = None
+        if isinstance(command, list) and command:
+            self._server._dispatch(command)
+        try:
+            self._sock.sendall(b"ok\n")
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class Server:
+    """Accepts forwarded commands on a Claim's socket and hands each to
+    `handler(command, args)`. Keep a reference for the app's lifetime."""
+
+    def __init__(self, claim: Claim, handler):
+        from PyQt6.QtCore import QSocketNotifier
+
+        self._claim = claim
+        self._handler = handler
+        self._connections = set()
+        self._notifier = QSocketNotifier(
+            claim.listener.fileno(), QSocketNotifier.Type.Read
+        )
+        self._notifier.activated.connect(self._on_connection)
+
+    def _on_connection(self):
+        while True:
+            try:
+                sock, _ = self._claim.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                print(f"[stickynotes] instance socket: {e}",
+                      file=sys.stderr, flush=True)
+                return
+            sock.setblocking(False)
+            self._connections.add(_Connection(self, sock))
+
+    def _dispatch(self, command: list):
+        self._handler(str(command[0]), [str(arg) for arg in command[1:]])
+
+    def close(self):
+        self._notifier.setEnabled(False)
+        self._claim.release()
@@ -0,0 +1,394 @@
+# stickynotes/storage.py
+#
+# Where note records live. Everything above this module speaks in plain
+# records — dicts keyed like TrayManager._create_new_note's arguments — and
+# in per-note change sets ({note_id: {field: value}}), so the backend can be
+# swapped without touching the note window or the save coordinator.
+#
+# Two backends:
+#   * SQLiteStore (default) — one row per note in a WAL-mode database.
+#     Saving one note's content updates that row and nothing else.
+#   * QSettingsStore — the original layout: every note under the `notes`
+#     group of the app's INI file. Saving any note rewrites the whole file,
+#     which is why it's now only the fallback for Pythons built without
+#     sqlite3, and the source of the one-time import into SQLite.
+#
+# App-level preferences (hide_from_dock, first_launch_completed) stay in
+# QSettings either way; only notes move.
+
+import os
+import threading
+from abc import ABC, abstractmethod
+
+from PyQt6.QtCore import QByteArray, QSettings, QStandardPaths
+
+from . import config
+
+try:
+    import sqlite3
+except ImportError:   # stripped-down Python builds; fall back to QSettings
+    sqlite3 = None
+
+
+# Stored note fields, in column order. Matches the FIELD_* dirty flags in
+# note_window plus last_edited, which is written alongside content/title.
+NOTE_FIELDS = (
+    "content", "geometry", "theme", "collapsed", "title", "last_edited",
+    "pinned",
+)
+
+
+def _geometry_bytes(value):
+    """Normalise a stored geometry blob to bytes. QSettings hands back
+    QByteArray, or str/bytes on INI backends that don't roundtrip it."""
+    if value is None:
+        return None
+    if isinstance(value, QByteArray):
+        return bytes(value.data())
+    if isinstance(value, str):
+        return value.encode("latin-1")
+    return bytes(value)
+
+
+class NoteStore(ABC):
+    """Backend interface. Implementations must make `write` atomic per call:
+    either every change in the batch lands or none does. Writes arrive on
+    the StoreWriter thread while reads stay on the GUI thread, so both must
+    be safe to run concurrently."""
+
+    @abstractmethod
+    def load_notes(self, with_content: bool = True) -> list:
+        """Every stored note as a record dict: note_id plus NOTE_FIELDS,
+        `geometry` as bytes (or None). Assumes the current schema — run
+        migrations.migrate() on the store first.
+
+        With `with_content=False` the records carry no "content" key — the
+        metadata the app needs to lay out its windows, without reading
+        every note body. Fetch a body later with load_content()."""
+
+    @abstractmethod
+    def load_content(self, note_id: str) -> str:
+        """One note's stored body ("" if the note doesn't exist)."""
+
+    # ---- Migration support (migrations.py) ----------------------------------
+
+    @abstractmethod
+    def schema_version(self) -> int:
+        """Schema version of the stored notes; 0 if never recorded."""
+
+    @abstractmethod
+    def load_legacy_notes(self) -> list:
+        """Like load_notes(), but tolerating every older schema: `geometry`
+        may be an (x, y, w, h) tuple for notes saved by the old
+        raw-coordinates schema, `title` / `last_edited` None for notes that
+        predate them."""
+
+    @abstractmethod
+    def write_migration(self, changes: dict, version: int):
+        """write() `changes` and record `version`, in one batch."""
+
+    @abstractmethod
+    def write(self, changes: dict):
+        """Apply {note_id: {field: value}} in one batch. Fields absent from
+        a note's dict are left as stored."""
+
+    @abstractmethod
+    def delete(self, note_id: str):
+        """Remove one note's record; a missing note is not an error."""
+
+    def close(self):
+        pass
+
+
+class QSettingsStore(NoteStore):
+    """The original INI layout: notes/<id>/<field> keys. A fresh QSettings
+    per call keeps it usable from any thread, and sync() replaces the INI via
+    a temp file and rename (QSettings' atomic sync), so a crash mid-write
+    leaves the previous file intact."""
+
+    def load_notes(self, with_content: bool = True) -> list:
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        settings.beginGroup("notes")
+        records = []
+        for note_id in settings.childGroups():
+            record = {
+                "note_id":     note_id,
+                "geometry":    _geometry_bytes(settings.value(f"{note_id}/geometry")),
+                "theme":       settings.value(f"{note_id}/theme", config.DEFAULT_THEME),
+                "collapsed":   settings.value(f"{note_id}/collapsed", False, type=bool),
+                "title":       settings.value(f"{note_id}/title"),
+                "last_edited": settings.value(f"{note_id}/last_edited"),
+                "pinned":      settings.value(f"{note_id}/pinned", False, type=bool),
+            }
+            if with_content:
+                record["content"] = settings.value(f"{note_id}/content", "")
+            records.append(record)
+        settings.endGroup()
+        return records
+
+    def load_legacy_notes(self) -> list:
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        settings.beginGroup("notes")
+        records = []
+        for note_id in settings.childGroups():
+            # Prefer the QByteArray-encoded geometry (works on Wayland).
+            # Fall back to (x, y, w, h) ints for notes saved during the
+            # broken intermediate version where we wrote raw coords only.
+            geometry = _geometry_bytes(settings.value(f"{note_id}/geometry"))
+            if geometry is None:
+                x = settings.value(f"{note_id}/x")
+                y = settings.value(f"{note_id}/y")
+                w = settings.value(f"{note_id}/w")
+                h = settings.value(f"{note_id}/h")
+                if None not in (x, y, w, h):
+                    geometry = (int(x), int(y), int(w), int(h))
+            records.append({
+                "note_id":     note_id,
+                "content":     settings.value(f"{note_id}/content", ""),
+                "geometry":    geometry,
+                "theme":       settings.value(f"{note_id}/theme", config.DEFAULT_THEME),
+                "collapsed":   settings.value(f"{note_id}/collapsed", False, type=bool),
+                # Fields added after the first schema; None when missing.
+                "title":       settings.value(f"{note_id}/title", None),
+                "last_edited": settings.value(f"{note_id}/last_edited", None),
+                "pinned":      settings.value(f"{note_id}/pinned", False, type=bool),
+            })
+        settings.endGroup()
+        return records
+
+    def load_content(self, note_id: str) -> str:
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        return settings.value(f"notes/{note_id}/content", "")
+
+    def write(self, changes: dict):
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        self._set_values(settings, changes)
+        settings.sync()
+
+    @staticmethod
+    def _set_values(settings, changes):
+        settings.beginGroup("notes")
+        for note_id, fields in changes.items():
+            for field, value in fields.items():
+                if field == "geometry" and value is not None:
+                    value = QByteArray(value)
+                settings.setValue(f"{note_id}/{field}", value)
+        settings.endGroup()
+
+    def schema_version(self) -> int:
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        return settings.value(config.SETTING_NOTES_SCHEMA_VERSION, 0, type=int)
+
+    def write_migration(self, changes: dict, version: int):
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        self._set_values(settings, changes)
+        settings.setValue(config.SETTING_NOTES_SCHEMA_VERSION, version)
+        settings.sync()
+
+    def delete(self, note_id: str):
+        settings = QSettings(config.ORG_NAME, config.APP_NAME)
+        settings.beginGroup("notes")
+        settings.remove(note_id)
+        settings.endGroup()
+        settings.sync()
+
+
+class SQLiteStore(NoteStore):
+    """One row per note. WAL mode so a save appends a few pages to the log
+    instead of rewriting the database, and synchronous=NORMAL because WAL
+    keeps the database consistent across power loss at that level — at
+    worst the last commit is lost, never the file."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS notes (
+            id          TEXT PRIMARY KEY,
+            content     TEXT NOT NULL DEFAULT '',
+            geometry    BLOB,
+            theme       TEXT NOT NULL DEFAULT '{theme}',
+            collapsed   INTEGER NOT NULL DEFAULT 0,
+            title       TEXT,
+            last_edited TEXT,
+            pinned      INTEGER NOT NULL DEFAULT 0,
+            -- Raw coordinates, only ever set by the QSettings import for
+            -- notes saved before geometry blobs; NULL for everything else.
+            x INTEGER, y INTEGER, w INTEGER, h INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """.format(theme=config.DEFAULT_THEME)
+
+    def __init__(self, path: str):
+        self.path = path
+        # One connection per thread: the GUI thread reads (startup, lazily
+        # hydrated bodies) while the writer thread writes, and in WAL mode
+        # separate connections let a read proceed during a write instead of
+        # queueing behind it.
+        self._local = threading.local()
+        self._connections = []
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+
+    @property
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread off only so close() can close every
+            # connection; each is still used by the one thread that made it.
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._connections.append(conn)
+        return conn
+
+    def load_notes(self, with_content: bool = True) -> list:
+        # Without content, no note body is decoded into a Python string —
+        # the bulk of every row for anything but the shortest notes.
+        rows = self._conn.execute(
+            "SELECT id, geometry, theme, collapsed, title, last_edited, pinned"
+            + (", content" if with_content else "")
+            + " FROM notes ORDER BY rowid"
+        )
+        keys = ("note_id", "geometry", "theme", "collapsed", "title",
+                "last_edited", "pinned", "content")
+        records = [dict(zip(keys, row)) for row in rows]
+        for record in records:
+            record["collapsed"] = bool(record["collapsed"])
+            record["pinned"] = bool(record["pinned"])
+        return records
+
+    def load_legacy_notes(self) -> list:
+        records = self.load_notes()
+        legacy = {
+            row[0]: row[1:] for row in self._conn.execute(
+                "SELECT id, x, y, w, h FROM notes WHERE geometry IS NULL "
+                "AND x IS NOT NULL AND y IS NOT NULL "
+                "AND w IS NOT NULL AND h IS NOT NULL"
+            )
+        }
+        for record in records:
+            if record["note_id"] in legacy:
+                record["geometry"] = legacy[record["note_id"]]
+        return records
+
+    def load_content(self, note_id: str) -> str:
+        row = self._conn.execute(
+            "SELECT content FROM notes WHERE id = ?", (note_id,)
+        ).fetchone()
+        return row[0] if row is not None else ""
+
+    def write(self, changes: dict):
+        # One transaction for the whole batch.
+        with self._conn:
+            self._upsert(changes)
+
+    def _upsert(self, changes: dict):
+        # Each note is an upsert of only the columns that changed, so an
+        # untouched note's row — and an unchanged column of a touched one —
+        # is never rewritten.
+        for note_id, fields in changes.items():
+            if not fields:
+                continue
+            cols = [f for f in NOTE_FIELDS if f in fields]
+            values = [self._column_value(f, fields[f]) for f in cols]
+            if "geometry" in fields:
+                # A real blob supersedes any imported raw coordinates.
+                cols += ["x", "y", "w", "h"]
+                values += [None] * 4
+            self._conn.execute(
+                f"INSERT INTO notes (id, {', '.join(cols)}) "
+                f"VALUES (?{', ?' * len(cols)}) "
+                f"ON CONFLICT(id) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in cols),
+                [note_id, *values],
+            )
+
+    @staticmethod
+    def _column_value(field, value):
+        if field == "geometry":
+            return _geometry_bytes(value)
+        if field in ("collapsed", "pinned"):
+            return int(bool(value))
+        return value
+
+    def delete(self, note_id: str):
+        with self._conn:
+            self._conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+
+    def schema_version(self) -> int:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'schema_version'"
+        ).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def write_migration(self, changes: dict, version: int):
+        with self._conn:
+            self._upsert(changes)
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('schema_version', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (str(version),),
+            )
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+        self._local = threading.local()
+
+    # ---- One-time QSettings import ---------------------------------------
+
+    def import_from_qsettings(self):
+        """Copy notes from the QSettings layout, once per database.
+
+        Legacy rows keep their legacy shape — raw x/y/w/h and missing
+        title/last_edited arrive as-is, for migrations.migrate() to upgrade
+        along with everything else. The INI's notes group is left in place:
+        a downgrade to a pre-SQLite build still finds its notes.
+        """
+        done = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'qsettings_imported'"
+        ).fetchone()
+        if done is not None:
+            return
+        records = QSettingsStore().load_legacy_notes()
+        with self._conn:
+            for record in records:
+                geometry = record["geometry"]
+                rect = (None,) * 4
+                if isinstance(geometry, tuple):
+                    geometry, rect = None, geometry
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO notes (id, content, geometry, theme, "
+                    "collapsed, title, last_edited, pinned, x, y, w, h) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        record["note_id"], record["content"] or "",
+                        _geometry_bytes(geometry), record["theme"],
+                        int(record["collapsed"]), record["title"],
+                        record["last_edited"], int(record["pinned"]), *rect,
+                    ),
+                )
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('qsettings_imported', '1')"
+            )
+
+
+def data_dir() -> str:
+    """Per-user data directory (created on demand). Under snap this resolves
+    inside $SNAP_USER_DATA, same as the config file."""
+    path = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.AppDataLocation
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def open_store() -> NoteStore:
+    """The configured backend, migrated and ready to load from."""
+    if config.STORAGE_BACKEND == "sqlite" and sqlite3 is not None:
+        store = SQLiteStore(os.path.join(data_dir(), config.NOTES_DB_FILENAME))
+        store.import_from_qsettings()
+        return store
+    return QSettingsStore()
@@ -0,0 +1,281 @@
+# stickynotes/styles.py
+#
+# The note chrome's stylesheet, compiled once per look and applied in one
+# place.
+#
+# Every setStyleSheet makes Qt parse the sheet and re-polish the widget and
+# everything under it. Styled widget by widget — the body, the title bar,
+# its drag strip and title pill, the format bar, the text edit and each of
+# the nine chip buttons — a theme switch cost a dozen-odd of those per
+# note, and startup paid them for every note restored.
+#
+# So a note carries a single sheet, set on its background widget (the
+# common ancestor of all its chrome), whose rules pick their targets out
+# by object name, class and dynamic property. Two things vary it: the
+# theme's colors, and the format-bar buttons' size bucket — the font size
+# and corner radius a button size works out to, so sizes that would style
+# the same share a sheet. Each variant is compiled once and kept.
+#
+# Per-widget state the old sheets were rebuilt for (a collapsed title bar's
+# rounded bottom, the title pill's hover/edit/locked look) is a dynamic
+# property instead; set_state flips it and re-polishes that one widget.
+#
+# config.THEME_RENDERING = "palette" swaps the sheet for a QPalette per
+# theme (see the bottom of this file).
+
+from collections import namedtuple
+
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPalette
+
+from . import config
+
+# Title-bar chips are square, and smaller than the bar so their drop
+# shadows have vertical room to render before the bar clips them.
+CHIP_SIZE = 28
+
+# Translucent-white "glass" tokens for the chip buttons. The same alpha
+# values are reused for every light theme; charcoal flips to a low-alpha
+# white-on-dark recipe.
+GLASS_LIGHT = {
+    "idle":    "rgba(255, 255, 255, 0.55)",
+    "hover":   "rgba(255, 255, 255, 0.75)",
+    "pressed": "rgba(255, 255, 255, 0.40)",
+    "checked": "rgba(255, 255, 255, 0.85)",
+    "border":  "rgba(0, 0, 0, 0.08)",
+}
+GLASS_DARK = {
+    "idle":    "rgba(255, 255, 255, 0.10)",
+    "hover":   "rgba(255, 255, 255, 0.22)",
+    "pressed": "rgba(255, 255, 255, 0.06)",
+    "checked": "rgba(255, 255, 255, 0.28)",
+    "border":  "rgba(255, 255, 255, 0.15)",
+}
+
+# A config.THEMES entry worked out into everything the chrome is drawn in.
+ThemeColors = namedtuple(
+    "ThemeColors", "bg title text is_dark button hover_overlay"
+)
+
+
+def theme_colors(theme: dict) -> ThemeColors:
+    # Dark themes (charcoal) use light text — title-bar buttons need a
+    # light tint and a light hover overlay to be visible.
+    is_dark = theme["text"] == "#f0f0f0"
+    return ThemeColors(
+        bg=theme["bg"],
+        title=theme["title"],
+        text=theme["text"],
+        is_dark=is_dark,
+        button="#cccccc" if is_dark else "#555555",
+        hover_overlay=(
+            "rgba(255, 255, 255, 0.18)" if is_dark else "rgba(0, 0, 0, 0.12)"
+        ),
+    )
+
+
+def glass(is_dark_theme: bool) -> dict:
+    return GLASS_DARK if is_dark_theme else GLASS_LIGHT
+
+
+def button_radius(size: int) -> int:
+    # Scales with size — clamped so toolbar buttons stay readable both
+    # at 24px (narrow note) and 44px (wide note).
+    return max(6, min(12, int(size * 0.27)))
+
+
+def size_bucket(button_size: int) -> tuple:
+    """What a format-bar button size changes in the sheet: (font px,
+    corner radius). Font size scales with the button — ~13 at 30, ~19 at
+    44."""
+    return max(11, int(button_size * 0.45)), button_radius(button_size)
+
+
+_sheets = {}   # (ThemeColors, size bucket) -> stylesheet
+
+
+def stylesheet(colors: ThemeColors, button_size: int) -> str:
+    """The note chrome's stylesheet for `colors` with format-bar buttons
+    `button_size` px square. Set it on the note's background widget."""
+    key = (colors, size_bucket(button_size))
+    sheet = _sheets.get(key)
+    if sheet is None:
+        sheet = _sheets[key] = _compile(colors, *key[1])
+    return sheet
+
+
+def _compile(c: ThemeColors, font_px: int, toolbar_radius: int) -> str:
+    r = config.CORNER_RADIUS_PX
+    g = glass(c.is_dark)
+    title_text = f"color: {c.button}; background-color: transparent;"
+    return f"""
+        QWidget#noteBackground {{
+            background-color: {c.bg};
+            border-radius: {r}px;
+        }}
+
+        QWidget#titleBar {{
+            background-color: {c.title};
+            border-top-left-radius: {r}px;
+            border-top-right-radius: {r}px;
+            border-bottom-left-radius: 0px;
+            border-bottom-right-radius: 0px;
+        }}
+        QWidget#titleBar[collapsed="true"] {{
+            border-bottom-left-radius: {r}px;
+            border-bottom-right-radius: {r}px;
+        }}
+        QWidget#dragHandle, QWidget#dragArea {{
+            background-color: {c.title};
+        }}
+
+        QWidget#titlePill {{
+            background-color: transparent;
+            border-radius: 10px;
+        }}
+        QWidget#titlePill[pill="idle"]:hover,
+        QWidget#titlePill[pill="editing"] {{
+            background-color: {c.hover_overlay};
+        }}
+        QWidget#titlePill QLabel {{ {title_text} }}
+        QWidget#titlePill QLineEdit {{
+            {title_text}
+            border: none;
+            padding: 0px;
+            selection-background-color: {c.button};
+            selection-color: white;
+        }}
+
+        QWidget#formatBar {{
+            background-color: {c.title};
+            border-bottom-left-radius: {r}px;
+            border-bottom-right-radius: {r}px;
+        }}
+
+        NoteTextEdit {{
+            background-color: transparent;
+            color: {c.text};
+            border: none;
+            padding: 8px;
+        }}
+
+        FloatingButton {{
+            background-color: {g['idle']};
+            border: 1px solid {g['border']};
+            color: {c.button};
+        }}
+        FloatingButton:hover {{
+            background-color: {g['hover']};
+        }}
+        FloatingButton:pressed {{
+            background-color: {g['pressed']};
+        }}
+        FloatingButton:checked {{
+            background-color: {g['checked']};
+        }}
+        FloatingButton[tone="title_bar"] {{
+            border-radius: {button_radius(CHIP_SIZE)}px;
+        }}
+        FloatingButton[tone="toolbar"] {{
+            border-radius: {toolbar_radius}px;
+            font-size: {font_px}px;
+        }}
+    """
+
+
+def set_state(widget, name: str, value) -> None:
+    """Set the dynamic property `name` that the sheet's selectors match on,
+    re-polishing `widget` (only) when it actually changed."""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+
+
+# ---------------------------------------------------------------------------
+# Palette rendering (config.THEME_RENDERING = "palette")
+#
+# The same looks with no stylesheet at all. Each theme is turned into a
+# QPalette once; the note sets it on its background widget, every piece of
+# chrome inherits it, and the surfaces, chips and title pill paint
+# themselves from its roles in their own paintEvents, while Qt's widgets
+# (the text edit, the title's label and line edit) read it natively. A
+# theme switch is then one setPalette and a repaint: nothing is re-polished
+# and nothing relays out.
+# ---------------------------------------------------------------------------
+
+ROLE_BODY = QPalette.ColorRole.Window        # note body
+ROLE_BAR = QPalette.ColorRole.Button         # title bar and format bar
+ROLE_OVERLAY = QPalette.ColorRole.Midlight   # title pill on hover / editing
+# Chip labels and icons are ButtonText, the title is WindowText and the
+# note's own text is Text.
+
+
+def uses_palette() -> bool:
+    return config.THEME_RENDERING == "palette"
+
+
+def qcolor(css: str) -> QColor:
+    """A QColor for one of the sheet's color values: "#rrggbb" or
+    "rgba(r, g, b, alpha 0–1)"."""
+    if css.startswith("rgba("):
+        r, g, b, a = css[5:-1].split(",")
+        return QColor(int(r), int(g), int(b), round(float(a) * 255))
+    return QColor(css)
+
+
+_palettes = {}        # ThemeColors -> QPalette
+_glass_colors = {}    # is_dark -> {state: QColor}
+
+
+def palette(colors: ThemeColors) -> QPalette:
+    pal = _palettes.get(colors)
+    if pal is None:
+        pal = QPalette()
+        chrome = QColor(colors.button)
+        for role, color in (
+            (ROLE_BODY, QColor(colors.bg)),
+            (ROLE_BAR, QColor(colors.title)),
+            (ROLE_OVERLAY, qcolor(colors.hover_overlay)),
+            (QPalette.ColorRole.ButtonText, chrome),
+            (QPalette.ColorRole.WindowText, chrome),
+            (QPalette.ColorRole.Text, QColor(colors.text)),
+            # The text edit and the title's line edit sit on the surfaces
+            (QPalette.ColorRole.Base, QColor(Qt.GlobalColor.transparent)),
+        ):
+            pal.setColor(role, color)
+        _palettes[colors] = pal
+    return pal
+
+
+def glass_colors(is_dark_theme: bool) -> dict:
+    colors = _glass_colors.get(is_dark_theme)
+    if colors is None:
+        colors = _glass_colors[is_dark_theme] = {
+            state: qcolor(css) for state, css in glass(is_dark_theme).items()
+        }
+    return colors
+
+
+def paint_surface(painter: QPainter, rect: QRectF, color: QColor,
+                  top_radius: float, bottom_radius: float):
+    """Fill `rect` the way a sheet's background-color with those corner
+    radii would."""
+    t, b = top_radius, bottom_radius
+    path = QPainterPath()
+    path.moveTo(rect.left(), rect.top() + t)
+    path.arcTo(QRectF(rect.left(), rect.top(), 2 * t, 2 * t), 180, -90)
+    path.lineTo(rect.right() - t, rect.top())
+    path.arcTo(QRectF(rect.right() - 2 * t, rect.top(), 2 * t, 2 * t), 90, -90)
+    path.lineTo(rect.right(), rect.bottom() - b)
+    path.arcTo(
+        QRectF(rect.right() - 2 * b, rect.bottom() - 2 * b, 2 * b, 2 * b), 0, -90
+    )
+    path.lineTo(rect.left() + b, rect.bottom())
+    path.arcTo(QRectF(rect.left(), rect.bottom() - 2 * b, 2 * b, 2 * b), 270, -90)
+    path.closeSubpath()
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.fillPath(path, color)
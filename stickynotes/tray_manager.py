@@ -1,14 +1,22 @@
 # stickynotes/tray_manager.py
 
+import collections
+import functools
 import os
+import struct
 import sys
+import time
 
 from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
-from PyQt6.QtGui import QAction, QGuiApplication
-from PyQt6.QtCore import QSettings, QTimer
-from .note_window import StickyNote, SettingsDialog, AboutDialog, ShortcutsDialog
-from . import autostart
+from PyQt6.QtGui import QAction, QCursor, QGuiApplication, QTextDocument
+from PyQt6.QtCore import QPoint, QRect, QSettings, QTimer
+from .note_window import StickyNote, derive_title_from_text
+from . import noteformat
+from . import persistence
+from . import profiling
+from . import single_instance
 from . import utils
+from . import xwm
 from . import config
 
 
@@ -21,6 +29,24 @@ _AUTOSTART_ON_WAYLAND = (
     and os.environ.get("XDG_SESSION_TYPE") == "wayland"
 )
 
+# Head of a QWidget.saveGeometry() blob: magic, major and minor version, then
+# the frame rect as (left, top, right, bottom). Big-endian, as QDataStream.
+_GEOMETRY_HEADER = struct.Struct(">IHH4i")
+_GEOMETRY_MAGIC = 0x1D9D0CB
+
+
+def _saved_frame(geometry):
+    """The window frame recorded in a saveGeometry() blob, or None when
+    there's no (recognisable) blob."""
+    if not geometry or len(geometry) < _GEOMETRY_HEADER.size:
+        return None
+    magic, _major, _minor, left, top, right, bottom = (
+        _GEOMETRY_HEADER.unpack_from(geometry)
+    )
+    if magic != _GEOMETRY_MAGIC:
+        return None
+    return QRect(QPoint(left, top), QPoint(right, bottom))
+
 
 class TrayManager:
     """Manages the system tray icon and application life cycle."""
@@ -31,14 +57,29 @@ class TrayManager:
         self._settings_dialog = None
         self._about_dialog = None
         self._shortcuts_dialog = None
+        # Stored notes still to be built (see _load_notes), best first, and
+        # the notes built but not shown yet (see _create_new_note): note_id
+        # -> whether to focus it once shown.
+        self._restore_queue = collections.deque()
+        self._awaiting_show = {}
+        self._restore_timer = QTimer(self.app)
+        self._restore_timer.setInterval(0)
+        self._restore_timer.timeout.connect(self._restore_batch)
+        # One save scheduler for every note: dirty notes queue here, are
+        # journaled within JOURNAL_FLUSH_MS, and reach the store together in
+        # one batched snapshot. It writes everything pending and closes on
+        # aboutToQuit.
+        self.saver = persistence.app_saver()
+        self.store = self.saver.store
 
         self.app.setQuitOnLastWindowClosed(False)
-        # app.quit() does not call closeEvent on individual windows, so any
-        # unsaved position/size would be lost. Flush every note before exit.
-        self.app.aboutToQuit.connect(self._save_all_notes)
+        # The X connection xwm shares across every note, opened on first use.
+        self.app.aboutToQuit.connect(xwm.close)
 
-        self._setup_tray_icon()
-        self._load_notes()
+        with profiling.phase("tray.setup_icon"):
+            self._setup_tray_icon()
+        with profiling.phase("tray.load_notes"):
+            self._load_notes()
 
         # Decide whether to show a starter note when no notes were restored.
         # Three states map to three behaviors:
@@ -49,7 +90,7 @@ class TrayManager:
         # The autostart case is the important one: without this gate, every
         # login on an empty state would flash up an unwanted blank note —
         # the exact "gets in your way" behavior the app is positioned against.
-        if not self.open_notes:
+        if not self.open_notes and not self._restore_queue:
             settings = QSettings(config.ORG_NAME, config.APP_NAME)
             is_first_ever = not settings.value(
                 "first_launch_completed", False, type=bool
@@ -64,6 +105,7 @@ class TrayManager:
                 # Settings if not wanted. Existing users (flag already
                 # set) keep whatever preference they previously had —
                 # this branch never runs for them.
+                from . import autostart
                 try:
                     autostart.set_enabled(True)
                 except OSError:
@@ -80,6 +122,12 @@ class TrayManager:
         # never rewritten by the snap upgrade. Rewriting it here with the
         # current code's format migrates it forward so the next login uses
         # the up-to-date desktop entry. No-op when autostart is disabled.
+        # Runs once the event loop is up: it's housekeeping, not something
+        # the first note should wait to paint for.
+        QTimer.singleShot(0, self._refresh_autostart_entry)
+
+    def _refresh_autostart_entry(self):
+        from . import autostart
         if autostart.is_enabled():
             try:
                 autostart.set_enabled(True)
@@ -110,9 +158,11 @@ class TrayManager:
     def _apply_hide_from_dock(self, hidden: bool):
         """Push the preference to every open note. The dock lists an app as
         running if ANY of its windows is listed, so this only takes effect when
-        all notes agree — which is why the setting is app-global."""
-        for note in self.open_notes.values():
-            note.set_hidden_from_dock(hidden)
+        all notes agree — which is why the setting is app-global. One X round
+        trip for all of them, however many there are."""
+        with xwm.batch():
+            for note in self.open_notes.values():
+                note.set_hidden_from_dock(hidden)
 
     def _create_welcome_note(self):
         """First-launch onboarding note. Pre-filled with a short tour so a
@@ -151,10 +201,6 @@ class TrayManager:
             geometry_data=(x, y, w, h),
         )
 
-    def _save_all_notes(self):
-        for note in self.open_notes.values():
-            note._save()
-
     def _setup_tray_icon(self):
         self.tray_icon = QSystemTrayIcon(utils.create_tray_icon(), parent=self.app)
         self.tray_icon.setToolTip("Sticky Notes")
@@ -186,6 +232,10 @@ class TrayManager:
         show_note_menu = self.menu.addMenu("Show Note")
         self._populate_show_note_submenu(show_note_menu)
 
+        if self.saver.history is not None:
+            deleted_menu = self.menu.addMenu("Recently Deleted")
+            self._populate_deleted_submenu(deleted_menu)
+
         self.menu.addSeparator()
         settings_action = QAction("Settings", parent=self.menu)
         settings_action.triggered.connect(self._show_settings)
@@ -240,6 +290,40 @@ class TrayManager:
             more.setEnabled(False)
             submenu.addAction(more)
 
+    def _populate_deleted_submenu(self, submenu):
+        """Fill the 'Recently Deleted' submenu with the deleted notes whose
+        history is still kept (config.HISTORY_DELETED_GRACE_S), most recently
+        deleted first; picking one brings it back with its latest saved
+        content and its version history."""
+        deleted = [
+            entry for entry in self.saver.history.deleted_notes()
+            if entry[0] not in self.open_notes   # restored, not saved yet
+        ]
+        if not deleted:
+            empty = QAction("(no deleted notes)", parent=submenu)
+            empty.setEnabled(False)
+            submenu.addAction(empty)
+            return
+
+        cap = max(0, int(config.TRAY_MENU_NOTE_LIMIT))
+        scratch = QTextDocument(submenu)
+        for note_id, _deleted_at, content in deleted[:cap] if cap else deleted:
+            noteformat.load(scratch, content)
+            title = derive_title_from_text(scratch.toPlainText())
+            action = QAction(title, parent=submenu)
+            action.triggered.connect(
+                lambda _checked=False, nid=note_id, body=content:
+                self._restore_deleted_note(nid, body)
+            )
+            submenu.addAction(action)
+
+    def _restore_deleted_note(self, note_id: str, content: str):
+        # Same id, so the note gets its version history back. Built without
+        # a title it derives one and owes a full write, and that write is
+        # what takes it off the deleted list (HistoryStore.capture).
+        if note_id not in self.open_notes:
+            self._create_new_note(note_id=note_id, content=content)
+
     def _focus_note(self, note_id: str):
         note = self.open_notes.get(note_id)
         if note is None:
@@ -258,25 +342,53 @@ class TrayManager:
         title=None,
         last_edited=None,
         pinned=False,
+        content_loader=None,
     ):
         theme = theme or config.DEFAULT_THEME
-        note = StickyNote(
-            note_id, content, geometry_data, theme, collapsed, title, last_edited,
-            pinned, self._hide_from_dock_enabled(),
-        )
+        hide_from_dock = self._hide_from_dock_enabled()
+        with xwm.batch() as hints_sent:
+            with profiling.phase("tray.create_note", note_id):
+                note = StickyNote(
+                    note_id, content, geometry_data, theme, collapsed, title,
+                    last_edited, pinned, hide_from_dock,
+                    self.saver, content_loader=content_loader,
+                )
         note.noteDeleted.connect(self._handle_note_deletion)
         note.newNoteRequested.connect(self._new_note_from_signal)
-        note.show()
         self.open_notes[note.note_id] = note
 
+        # The note's pre-map window hints (USPosition, initial _NET_WM_STATE)
+        # are sent off the GUI thread; show it once they've reached the X
+        # server, so they're in place when the window manager maps it. A
+        # note with none to send — typically a fresh one from the tray or
+        # Ctrl+N — is shown right away, not after a worker round trip.
+        placed = geometry_data is not None
+        self._awaiting_show[note.note_id] = False
+        if placed or pinned or hide_from_dock:
+            xwm.when_done(
+                hints_sent, lambda _ok: self._show_new_note(note, placed)
+            )
+        else:
+            self._show_new_note(note, placed)
+        return note
+
+    def _show_new_note(self, note, placed: bool):
+        focus = self._awaiting_show.pop(note.note_id, False)
+
         # Mutter ignores client-requested window positions during its
         # initial placement phase on Wayland autostart launches — xcb
         # loads cleanly via XWayland yet our move()/restoreGeometry calls
-        # in __init__ get overridden. Re-asserting position after the
-        # compositor has settled is what makes positions actually stick.
-        # Scoped tight to the failing case; other launch paths skip.
-        if _AUTOSTART_ON_WAYLAND and geometry_data is not None:
-            QTimer.singleShot(2000, note._reapply_initial_position)
+        # in __init__ get overridden. Re-asserting position the moment
+        # the compositor has placed the window is what makes positions
+        # actually stick. Scoped tight to the failing case; other launch
+        # paths skip. Registered before show() so the map isn't missed.
+        if _AUTOSTART_ON_WAYLAND and placed:
+            xwm.when_placed(note, note._reapply_initial_position)
+
+        with profiling.phase("tray.show_note", note.note_id):
+            note.show()
+        if focus:
+            self._focus_note(note.note_id)
 
     def _new_note_from_signal(self, theme_name: str):
         """Slot for StickyNote.newNoteRequested — creates note in same theme."""
@@ -289,6 +401,7 @@ class TrayManager:
             self._settings_dialog.raise_()
             self._settings_dialog.activateWindow()
             return
+        from .dialogs import SettingsDialog
         dlg = SettingsDialog()
         dlg.hideFromDockChanged.connect(self._apply_hide_from_dock)
         dlg.finished.connect(lambda _r: setattr(self, "_settings_dialog", None))
@@ -301,6 +414,7 @@ class TrayManager:
             self._about_dialog.raise_()
             self._about_dialog.activateWindow()
             return
+        from .dialogs import AboutDialog
         dlg = AboutDialog()
         dlg.finished.connect(lambda _r: setattr(self, "_about_dialog", None))
         self._about_dialog = dlg
@@ -312,13 +426,14 @@ class TrayManager:
             self._shortcuts_dialog.raise_()
             self._shortcuts_dialog.activateWindow()
             return
+        from .dialogs import ShortcutsDialog
         dlg = ShortcutsDialog()
         dlg.finished.connect(lambda _r: setattr(self, "_shortcuts_dialog", None))
         self._shortcuts_dialog = dlg
         dlg.show()
 
     def _show_all_notes(self):
-        if not self.open_notes:
+        if not self.open_notes and not self._restore_queue:
             self._create_new_note()
             return
         for note in self.open_notes.values():
@@ -326,47 +441,120 @@ class TrayManager:
             note.raise_()
             note.activateWindow()
 
+    def handle_command(self, command: str, args: list):
+        """Act on a command forwarded by a second launch (see
+        single_instance.py)."""
+        if command == single_instance.COMMAND_SHOW_ALL:
+            self._show_all_notes()
+        elif command == single_instance.COMMAND_NEW_NOTE:
+            self._create_new_note()
+        elif command == single_instance.COMMAND_FOCUS and args:
+            note_id = args[0]
+            self._restore_now(note_id)
+            if note_id in self._awaiting_show:
+                # Built, but waiting on its pre-map hints: focused by
+                # _show_new_note once they've landed and it's shown.
+                self._awaiting_show[note_id] = True
+            else:
+                self._focus_note(note_id)
+        elif command != single_instance.COMMAND_NONE:
+            print(f"[stickynotes] ignoring unknown command {command!r}",
+                  file=sys.stderr, flush=True)
+
     def _handle_note_deletion(self, note_id: str):
-        settings = QSettings(config.ORG_NAME, config.APP_NAME)
-        settings.beginGroup("notes")
-        settings.remove(note_id)
-        settings.endGroup()
+        self.saver.remove(note_id)
 
         self.open_notes.pop(note_id, None)
         print(f"✓ Note {note_id} deleted")
 
+    @property
+    def restoring(self) -> bool:
+        """True until every stored note has been built and shown."""
+        return bool(self._restore_queue or self._awaiting_show)
+
     def _load_notes(self):
-        settings = QSettings(config.ORG_NAME, config.APP_NAME)
-        settings.beginGroup("notes")
-        for note_id in settings.childGroups():
-            content   = settings.value(f"{note_id}/content", "")
-            theme     = settings.value(f"{note_id}/theme", config.DEFAULT_THEME)
-            collapsed = settings.value(f"{note_id}/collapsed", False, type=bool)
-            # New in this schema. Defaults False, so every existing note loads
-            # exactly as before — nothing becomes pinned on upgrade.
-            pinned    = settings.value(f"{note_id}/pinned", False, type=bool)
-
-            # New fields in this schema. Both default to None so legacy notes
-            # get the "smart default" behavior in StickyNote.__init__ —
-            # title is auto-derived from existing body content, and
-            # last_edited will be filled in at first save.
-            title       = settings.value(f"{note_id}/title", None)
-            last_edited = settings.value(f"{note_id}/last_edited", None)
-
-            # Prefer the QByteArray-encoded geometry (works on Wayland).
-            # Fall back to (x, y, w, h) ints for notes saved during the
-            # broken intermediate version where we wrote raw coords only.
-            geometry = settings.value(f"{note_id}/geometry")
-            if geometry is None:
-                x = settings.value(f"{note_id}/x")
-                y = settings.value(f"{note_id}/y")
-                w = settings.value(f"{note_id}/w")
-                h = settings.value(f"{note_id}/h")
-                if None not in (x, y, w, h):
-                    geometry = (int(x), int(y), int(w), int(h))
-
-            self._create_new_note(
-                note_id, content, geometry, theme, collapsed, title, last_edited,
-                pinned,
+        # Snapshot first, then whatever the journal holds on top of it — the
+        # edits made after the last snapshot, e.g. before a crash. Only
+        # metadata is read here: each note pulls its body from the store when
+        # the body is first shown, so notes restored collapsed cost a title
+        # pill, not a parsed document.
+        with profiling.phase("tray.read_store"):
+            records = self.store.load_notes(with_content=False)
+        with profiling.phase("tray.replay_journal"):
+            records = self.saver.recover(records)
+        # Build the notes the user is most likely looking at first, one batch
+        # now and the rest a batch per event-loop turn, so the first notes
+        # paint and the tray responds while the others stream in.
+        self._restore_queue.extend(self._restore_order(records))
+        self._restore_batch()
+        if self._restore_queue:
+            self._restore_timer.start()
+
+    def _restore_order(self, records: list) -> list:
+        """Records sorted for restoring: expanded notes on the screen under
+        the pointer, then pinned notes, then other expanded notes, then
+        collapsed and off-screen ones — each group newest edit first."""
+        current = (
+            QGuiApplication.screenAt(QCursor.pos())
+            or QGuiApplication.primaryScreen()
+        )
+        current_rect = current.geometry() if current else QRect()
+        screen_rects = [s.geometry() for s in QGuiApplication.screens()]
+
+        def tier(record):
+            frame = _saved_frame(record["geometry"])
+            # No blob: the note is placed on the primary screen by default.
+            on_current = frame is None or frame.intersects(current_rect)
+            on_screen = on_current or any(
+                frame.intersects(rect) for rect in screen_rects
             )
-        settings.endGroup()
+            if record["collapsed"] or not on_screen:
+                return 3
+            if on_current:
+                return 0
+            if record["pinned"]:
+                return 1
+            return 2
+
+        # ISO-8601 timestamps sort chronologically as strings; the second,
+        # stable sort keeps that order within each tier.
+        ordered = sorted(
+            records, key=lambda r: r["last_edited"] or "", reverse=True
+        )
+        ordered.sort(key=tier)
+        return ordered
+
+    def _restore_batch(self):
+        """Build queued notes until this turn's RESTORE_BATCH_MS is spent —
+        always at least one, so restoring can't stall."""
+        deadline = time.perf_counter() + config.RESTORE_BATCH_MS / 1000
+        with profiling.phase("tray.restore_batch"):
+            # Every note's pre-map window hints go to the X server together,
+            # in one round trip; the notes are shown when it completes.
+            with xwm.batch():
+                while self._restore_queue:
+                    self._restore_record(self._restore_queue.popleft())
+                    if time.perf_counter() >= deadline:
+                        break
+        if not self._restore_queue:
+            self._restore_timer.stop()
+
+    def _restore_now(self, note_id: str) -> bool:
+        """Build a still-queued note immediately, e.g. to focus it. True if
+        it was queued."""
+        for r in self._restore_queue:
+            if r["note_id"] == note_id:
+                self._restore_queue.remove(r)
+                self._restore_record(r)
+                return True
+        return False
+
+    def _restore_record(self, r: dict):
+        loader = None
+        if "content" not in r:
+            loader = functools.partial(self.store.load_content, r["note_id"])
+        return self._create_new_note(
+            r["note_id"], r.get("content", ""), r["geometry"], r["theme"],
+            r["collapsed"], r["title"], r["last_edited"], r["pinned"],
+            content_loader=loader,
+        )
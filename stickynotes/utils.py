@@ -1,28 +1,100 @@
 # stickynotes/utils.py
 
-from PyQt6.QtGui import QPainter, QColor, QPixmap, QIcon, QPen, QPolygonF
+from collections import OrderedDict, namedtuple
+
+from PyQt6.QtGui import QPainter, QColor, QPixmap, QIcon, QPen, QPolygonF, QGuiApplication
 from PyQt6.QtCore import Qt, QPointF, QRectF
 from . import config
 
 
+# ---------------------------------------------------------------------------
+# Icon cache
+#
+# Every create_*_icon helper goes through _cached_icon, keyed by (kind,
+# color, size, filled, device pixel ratio). Dozens of notes share seven
+# themes, so the format bar's size steps, theme switches and pin toggles
+# keep asking for the same few pixmaps; each is painted once and reused
+# until it falls out of the least-recently-used end of the cache.
+# ---------------------------------------------------------------------------
+
+IconCacheInfo = namedtuple("IconCacheInfo", "hits misses maxsize currsize")
+
+_icon_cache = OrderedDict()
+_icon_hits = 0
+_icon_misses = 0
+
+
+def icon_cache_info() -> IconCacheInfo:
+    """Hit/miss counters and occupancy of the icon cache, in the shape of
+    functools' cache_info()."""
+    return IconCacheInfo(
+        _icon_hits, _icon_misses, config.ICON_CACHE_SIZE, len(_icon_cache)
+    )
+
+
+def icon_cache_clear():
+    """Drop every cached icon and reset the counters."""
+    global _icon_hits, _icon_misses
+    _icon_cache.clear()
+    _icon_hits = _icon_misses = 0
+
+
+def _device_pixel_ratio() -> float:
+    # The highest ratio of any screen: an icon painted for it is crisp
+    # everywhere, and notes move between screens.
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+
+def _cached_icon(kind: str, color: str, size: int, filled: bool, paint) -> QIcon:
+    """The icon paint(painter, qcolor, size, filled) draws on a transparent
+    size×size canvas (logical pixels), from the cache when it's there."""
+    global _icon_hits, _icon_misses
+    dpr = _device_pixel_ratio()
+    key = (kind, color.lower(), size, filled, dpr)
+    icon = _icon_cache.get(key)
+    if icon is not None:
+        _icon_hits += 1
+        _icon_cache.move_to_end(key)
+        return icon
+    _icon_misses += 1
+
+    pm = QPixmap(round(size * dpr), round(size * dpr))
+    pm.setDevicePixelRatio(dpr)
+    pm.fill(Qt.GlobalColor.transparent)
+    p = QPainter(pm)
+    p.setRenderHint(QPainter.RenderHint.Antialiasing)
+    paint(p, QColor(color), size, filled)
+    p.end()
+    icon = _icon_cache[key] = QIcon(pm)
+    if len(_icon_cache) > config.ICON_CACHE_SIZE:
+        _icon_cache.popitem(last=False)
+    return icon
+
+
+# ---------------------------------------------------------------------------
+# Icons
+# ---------------------------------------------------------------------------
+
 def create_tray_icon() -> QIcon:
     """Generates a simple icon for the system tray using the default theme color."""
-    pixmap = QPixmap(32, 32)
-    pixmap.fill(Qt.GlobalColor.transparent)
-    painter = QPainter(pixmap)
-    painter.setBrush(QColor(config.THEMES[config.DEFAULT_THEME]["bg"]))
-    painter.drawRect(4, 4, 24, 24)
-    painter.end()
-    return QIcon(pixmap)
+    return _cached_icon(
+        "tray", config.THEMES[config.DEFAULT_THEME]["bg"], 32, False, _paint_tray
+    )
+
+
+def _paint_tray(p, qcolor, size, filled):
+    p.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+    p.setBrush(qcolor)
+    p.drawRect(4, 4, 24, 24)
 
 
 def create_bullet_list_icon(color: str, size: int = 24) -> QIcon:
     """A 'bulleted list' icon: three small dots, each followed by a short bar."""
-    pm = QPixmap(size, size)
-    pm.fill(Qt.GlobalColor.transparent)
-    p = QPainter(pm)
-    p.setRenderHint(QPainter.RenderHint.Antialiasing)
-    qcolor = QColor(color)
+    return _cached_icon("bullet_list", color, size, False, _paint_bullet_list)
+
+
+def _paint_bullet_list(p, qcolor, size, filled):
     p.setPen(Qt.PenStyle.NoPen)
     p.setBrush(qcolor)
 
@@ -44,21 +116,16 @@ def create_bullet_list_icon(color: str, size: int = 24) -> QIcon:
         bar_rect = QRectF(bar_x, cy - bar_h / 2, bar_w, bar_h)
         p.drawRoundedRect(bar_rect, bar_h / 2, bar_h / 2)
 
-    p.end()
-    return QIcon(pm)
-
 
 def create_checklist_icon(color: str, size: int = 24) -> QIcon:
     """A 'checklist' icon: three rows of a small square box plus a short bar,
     with a tick in the first box. Deliberately mirrors the geometry of
     create_bullet_list_icon so the two toolbar buttons read as siblings —
     same three rows, same bar lengths, box instead of bullet."""
-    pm = QPixmap(size, size)
-    pm.fill(Qt.GlobalColor.transparent)
-    p = QPainter(pm)
-    p.setRenderHint(QPainter.RenderHint.Antialiasing)
-    qcolor = QColor(color)
+    return _cached_icon("checklist", color, size, False, _paint_checklist)
 
+
+def _paint_checklist(p, qcolor, size, filled):
     rows = 3
     margin_x = size * 0.15
     box = size * 0.17                     # box side length
@@ -100,9 +167,6 @@ def create_checklist_icon(color: str, size: int = 24) -> QIcon:
         bar_rect = QRectF(bar_x, cy - bar_h / 2, bar_w, bar_h)
         p.drawRoundedRect(bar_rect, bar_h / 2, bar_h / 2)
 
-    p.end()
-    return QIcon(pm)
-
 
 def create_pin_icon(color: str, size: int = 24, filled: bool = True) -> QIcon:
     """A thumbtack: round head, flange, and a stubby needle.
@@ -117,12 +181,10 @@ def create_pin_icon(color: str, size: int = 24, filled: bool = True) -> QIcon:
     (idle glass is 0.55 alpha vs 0.85 checked), so the icon itself changes:
     solid when pinned, outline when not. Same convention as a bookmark toggle.
     """
-    pm = QPixmap(size, size)
-    pm.fill(Qt.GlobalColor.transparent)
-    p = QPainter(pm)
-    p.setRenderHint(QPainter.RenderHint.Antialiasing)
-    qcolor = QColor(color)
+    return _cached_icon("pin", color, size, filled, _paint_pin)
 
+
+def _paint_pin(p, qcolor, size, filled):
     if filled:
         p.setPen(Qt.PenStyle.NoPen)
         p.setBrush(qcolor)
@@ -154,9 +216,6 @@ def create_pin_icon(color: str, size: int = 24, filled: bool = True) -> QIcon:
         QPointF(cx - needle_half, flange_y + size * 0.10),
     ]))
 
-    p.end()
-    return QIcon(pm)
-
 
 def tooltip_stylesheet() -> str:
     """App-wide QToolTip styling, built from the config tokens.
@@ -8,27 +8,34 @@ and an optional drop shadow for the standalone title-bar buttons.
 """
 
 from enum import Enum
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
-from PyQt6.QtWidgets import QPushButton, QGraphicsDropShadowEffect
+from PyQt6.QtCore import Qt, QRect, QRectF
+from PyQt6.QtGui import QIcon, QPainter, QPalette, QPen
+from PyQt6.QtWidgets import QPushButton
 
 from . import config
+from . import shadows
+from . import styles
 
 
 class FloatingButton(QPushButton):
     """A QPushButton that paints as a translucent rounded pill.
 
     Two tones:
-      * TITLE_BAR — fixed 32×32, carries a soft drop shadow so the button
-        reads as a tactile floating chip on top of the title bar.
+      * TITLE_BAR — fixed 32×32, casts a soft drop shadow so the button
+        reads as a tactile floating chip on top of the title bar. A widget
+        can't paint outside itself, so the parent draws it: call
+        paint_shadow from the parent's paintEvent.
       * TOOLBAR — variable size (the format bar resizes its buttons with
         the note width), no shadow because adjacent buttons would otherwise
         pile shadows visually.
 
-    Theming flows through `apply_theme(text_color, is_dark_theme)`. Call it
-    after construction and again on every theme switch. `extra_css` is the
-    per-button "personality" stylesheet (e.g. `font-weight: bold`) that
-    survives every re-skin.
+    The button has no stylesheet of its own: it's styled by the note's
+    shared sheet (see styles.py), which matches on its `tone` property and
+    object name — give a button with a "personality" (e.g. bold) an object
+    name the sheet has a rule for. `apply_theme(is_dark_theme)` only tells
+    the button which glass it's made of, for its shadow; call it on every
+    theme switch. Under palette rendering (config.THEME_RENDERING) the
+    button paints that glass itself, in the palette's ButtonText.
 
     `tooltip` names the button. Every button on a note is icon-only or a single
     letter, so it's the only thing that identifies it for a sighted user — and
@@ -52,27 +59,8 @@ class FloatingButton(QPushButton):
         TITLE_BAR = "title_bar"
         TOOLBAR = "toolbar"
 
-    # Square chip dimension for title-bar tone buttons. Smaller than the bar
-    # height so the drop shadow has vertical room to render before being
-    # clipped by the title-bar bounds.
-    TITLE_BAR_SIZE = 28
-
-    # Translucent-white "glass" tokens. The same alpha values are reused for
-    # every light theme; charcoal flips to a low-alpha white-on-dark recipe.
-    _GLASS_LIGHT = {
-        "idle":    "rgba(255, 255, 255, 0.55)",
-        "hover":   "rgba(255, 255, 255, 0.75)",
-        "pressed": "rgba(255, 255, 255, 0.40)",
-        "checked": "rgba(255, 255, 255, 0.85)",
-        "border":  "rgba(0, 0, 0, 0.08)",
-    }
-    _GLASS_DARK = {
-        "idle":    "rgba(255, 255, 255, 0.10)",
-        "hover":   "rgba(255, 255, 255, 0.22)",
-        "pressed": "rgba(255, 255, 255, 0.06)",
-        "checked": "rgba(255, 255, 255, 0.28)",
-        "border":  "rgba(255, 255, 255, 0.15)",
-    }
+    # Square chip dimension for title-bar tone buttons.
+    TITLE_BAR_SIZE = styles.CHIP_SIZE
 
     def __init__(
         self,
@@ -80,8 +68,6 @@ class FloatingButton(QPushButton):
         *,
         tone: "FloatingButton.Tone" = Tone.TITLE_BAR,
         checkable: bool = False,
-        extra_css: str = "",
-        font_css: str = "",
         tooltip: str = "",
         shortcut: str = "",
         hint: str = "",
@@ -89,8 +75,13 @@ class FloatingButton(QPushButton):
     ):
         super().__init__(label, parent)
         self._tone = tone
-        self._extra_css = extra_css
-        self._font_css = font_css
+        self._glass = styles.GLASS_LIGHT
+        self._dark = False
+        self.setProperty("tone", tone.value)
+        if styles.uses_palette():
+            # Repaint on enter/leave for the hover glass (a sheet with a
+            # :hover rule turns this on by itself).
+            self.setAttribute(Qt.WidgetAttribute.WA_Hover, True)
         # Don't steal keyboard focus from the QTextEdit — otherwise Ctrl+B/I/U
         # shortcuts stop working once you click a toolbar button.
         self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
@@ -105,59 +96,64 @@ class FloatingButton(QPushButton):
             self.setToolTip(visible)
         if tone == FloatingButton.Tone.TITLE_BAR:
             self.setFixedSize(self.TITLE_BAR_SIZE, self.TITLE_BAR_SIZE)
-            self._install_shadow()
 
-    def _install_shadow(self):
-        """Soft drop shadow for the floating-chip look. Profile is sourced
-        from config.SHADOW_BUTTON_CHIP so design tweaks live in one place."""
-        eff = QGraphicsDropShadowEffect(self)
+    def corner_radius(self) -> int:
+        return styles.button_radius(self.height())
+
+    def paint_shadow(self, painter):
+        """Soft drop shadow for the floating-chip look, painted by the
+        parent (`painter` is on it) underneath this button. Title-bar tone
+        only; profile sourced from config.SHADOW_BUTTON_CHIP so design
+        tweaks live in one place."""
+        if self._tone != FloatingButton.Tone.TITLE_BAR or not self.isVisible():
+            return
+        # A shadow is cast by what's opaque, and the chip is glass: scale
+        # the profile by the resting fill's opacity — as a graphics effect
+        # on the button used to, by blurring the button's own alpha.
+        fill = self._glass["checked" if self.isChecked() else "idle"]
+        opacity = float(fill.rsplit(",", 1)[1].rstrip(") "))
         blur, offset_y, alpha = config.SHADOW_BUTTON_CHIP
-        eff.setBlurRadius(blur)
-        eff.setOffset(0, offset_y)
-        eff.setColor(QColor(0, 0, 0, alpha))
-        self.setGraphicsEffect(eff)
-
-    def set_extra_css(self, extra_css: str):
-        """Replace the per-button personality CSS (e.g. font-weight: bold).
-        Caller should invoke apply_theme afterwards to repaint."""
-        self._extra_css = extra_css
-
-    def set_font_css(self, font_css: str):
-        """Set the font-size declaration for the button (e.g. 'font-size:
-        14px;'). Used by FormatBar when scaling toolbar buttons. Caller
-        should invoke apply_theme afterwards to repaint."""
-        self._font_css = font_css
-
-    def apply_theme(self, text_color: str, is_dark_theme: bool):
-        """Rebuild the stylesheet using the current size, theme palette, and
-        any per-button extra CSS. Safe to call repeatedly — used on theme
-        change AND whenever the button is resized (so border-radius scales)."""
-        glass = self._GLASS_DARK if is_dark_theme else self._GLASS_LIGHT
-        # Border-radius scales with size — clamped so toolbar buttons stay
-        # readable both at 24px (narrow note) and 44px (wide note).
-        radius = max(6, min(12, int(self.height() * 0.27)))
-        self.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {glass['idle']};
-                border: 1px solid {glass['border']};
-                border-radius: {radius}px;
-                color: {text_color};
-                {self._font_css}
-                {self._extra_css}
-            }}
-            QPushButton:hover {{
-                background-color: {glass['hover']};
-            }}
-            QPushButton:pressed {{
-                background-color: {glass['pressed']};
-            }}
-            QPushButton:checked {{
-                background-color: {glass['checked']};
-            }}
-        """)
-
-    @classmethod
-    def apply_theme_to_all(cls, buttons, text_color: str, is_dark_theme: bool):
-        """Bulk re-skin helper for a group of buttons sharing one palette."""
-        for btn in buttons:
-            btn.apply_theme(text_color, is_dark_theme)
+        shadows.paint(
+            painter, QRectF(self.geometry()),
+            (blur, offset_y, round(alpha * opacity)), self.corner_radius(),
+        )
+
+    def apply_theme(self, is_dark_theme: bool):
+        """Record which glass the chip is on this theme, for paint_shadow.
+        The look itself follows the note's shared sheet."""
+        self._glass = styles.glass(is_dark_theme)
+        self._dark = is_dark_theme
+
+    def paintEvent(self, event):
+        if not styles.uses_palette():
+            super().paintEvent(event)
+            return
+        # What the sheet's FloatingButton rules draw; :checked wins over
+        # :pressed wins over :hover there, by order.
+        if self.isChecked():
+            state = "checked"
+        elif self.isDown():
+            state = "pressed"
+        elif self.underMouse():
+            state = "hover"
+        else:
+            state = "idle"
+        glass = styles.glass_colors(self._dark)
+        radius = self.corner_radius() - 0.5
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(glass["border"], 1))
+        painter.setBrush(glass[state])
+        painter.drawRoundedRect(
+            QRectF(self.rect()).adjusted(0.5, 0.5, -0.5, -0.5), radius, radius
+        )
+        if not self.icon().isNull():
+            target = QRect(self.rect().topLeft(), self.iconSize())
+            target.moveCenter(self.rect().center())
+            self.icon().paint(
+                painter, target, Qt.AlignmentFlag.AlignCenter,
+                QIcon.Mode.Normal if self.isEnabled() else QIcon.Mode.Disabled,
+            )
+        if self.text():
+            painter.setPen(self.palette().color(QPalette.ColorRole.ButtonText))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text())
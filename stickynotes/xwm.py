@@ -15,9 +15,54 @@
 #
 # Best-effort: silently no-op outside X11/XWayland or if python-xlib
 # isn't importable. Never crashes the app over a positioning hint.
+#
+# The X connection is a python-xlib connection of our own, opened on
+# first use and kept for the session, with interned atoms cached alongside
+# it — restoring 100 notes is one handshake, not hundreds. Each job ends
+# in a sync() so it's known to have landed before the window maps. A
+# connection that dies under us is dropped and reopened for the next job.
+#
+# All X traffic happens on one worker thread ("stickynotes-xwm", stopped
+# on aboutToQuit via close()). The GUI thread only queues work, so a slow
+# X server or XWayland — the autostart-on-Wayland case this module exists
+# for — never stalls the event loop.
+#
+# Every call returns a Future that resolves to whether the request
+# reached the server. Fire-and-forget callers ignore it; callers that need
+# ordering — pre-map hints must land before show() maps the window — pass
+# it to when_done(), which runs a callback back on the GUI thread.
+#
+# For bulk work, batch() and deferred() gather the calls made inside them
+# into one job, sent with a single sync:
+#
+#   with xwm.batch() as sent:           # submitted when the block exits
+#       for note in notes:
+#           xwm.set_skip_taskbar(note, True)
+#   xwm.when_done(sent, lambda ok: ...)
+#
+#   with xwm.deferred():                # submitted on the next event-loop
+#       xwm.set_always_on_top(w, True)  # turn, with every other deferred
+#                                       # call made before then
+#
+# when_placed() is the receiving end: one native event filter, shared by
+# every window waiting on it, reports when the WM has finished a window's
+# initial placement (MapNotify, then _NET_FRAME_EXTENTS or the WM's own
+# ConfigureNotify), with a timeout only as the fallback.
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import queue
+import struct
+import threading
+import time
+
+from PyQt6.QtCore import (
+    QAbstractNativeEventFilter, QCoreApplication, QObject, QTimer, pyqtSignal,
+)
+from PyQt6 import sip
+
 
 # EWMH _NET_WM_STATE atoms we manage. Both are per-window states the window
 # manager owns; we ask it to change them rather than setting them ourselves.
@@ -26,7 +71,320 @@ _STATE_SKIP_TASKBAR = "_NET_WM_STATE_SKIP_TASKBAR"
 _STATE_SKIP_PAGER = "_NET_WM_STATE_SKIP_PAGER"
 
 
-def _send_wm_state(widget, atom_names, enabled: bool) -> bool:
+class Future:
+    """The outcome of a queued job: resolved once, by the worker. The few
+    methods xwm needs of concurrent.futures.Future, which isn't used because
+    importing it pulls in logging — ~20 ms on the startup path."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._result = None
+        self._done = False
+        self._callbacks = []
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self):
+        return self._result
+
+    def set_result(self, result):
+        with self._lock:
+            self._result, self._done = result, True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        """callback(future) once resolved — right away, on this thread, if
+        it already is; otherwise on the resolving thread."""
+        with self._lock:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+# Predefined atoms (X11 protocol, fixed ids) and the WM_SIZE_HINTS flags.
+_XA_ATOM = 4
+_XA_WM_NORMAL_HINTS = 40
+_XA_WM_SIZE_HINTS = 41
+_US_POSITION = 1 << 0
+_US_SIZE = 1 << 1
+# SubstructureNotify | SubstructureRedirect: where EWMH requests go.
+_ROOT_EVENT_MASK = (1 << 19) | (1 << 20)
+
+
+class _Unavailable(Exception):
+    """No X server to talk to, for the rest of the session."""
+
+
+class _XlibConnection:
+    """A python-xlib client connection of our own. Ends every job with
+    sync(), since Qt's map request travels on a different connection."""
+
+    def __init__(self):
+        try:
+            from Xlib import display, error
+        except ImportError:
+            raise _Unavailable from None
+        try:
+            self._d = display.Display()
+        except error.DisplayError:
+            # No X display to talk to (native Wayland, headless): that
+            # won't change during this session.
+            raise _Unavailable from None
+        self.closed_errors = (error.ConnectionClosedError, OSError)
+        self._atoms = {}   # atom name -> id, valid for the life of _d
+
+    def atom(self, name: str) -> int:
+        atom = self._atoms.get(name)
+        if atom is None:
+            atom = self._atoms[name] = self._d.intern_atom(name)
+        return atom
+
+    def _window(self, win_id: int):
+        return self._d.create_resource_object("window", win_id)
+
+    def send_to_root(self, win_id: int, message_type: str, data):
+        from Xlib.protocol import event
+
+        msg = event.ClientMessage(
+            window=self._window(win_id),
+            client_type=self.atom(message_type),
+            data=(32, list(data)),
+        )
+        self._d.screen().root.send_event(msg, event_mask=_ROOT_EVENT_MASK)
+
+    def get_property(self, win_id: int, prop: int, prop_type: int):
+        reply = self._window(win_id).get_full_property(prop, prop_type)
+        if reply is None or reply.format != 32:
+            return None
+        return list(reply.value)
+
+    def set_property(self, win_id: int, prop: int, prop_type: int, values):
+        self._window(win_id).change_property(prop, prop_type, 32, values)
+
+    def flush(self):
+        self._d.sync()
+
+    def close(self):
+        self._d.close()
+
+
+# ---------------------------------------------------------------------------
+# Worker thread
+# ---------------------------------------------------------------------------
+
+# Worker thread only: the connection, opened on first use.
+_conn = None
+# True once connecting has failed for good (no python-xlib, no X display):
+# later calls then resolve at once instead of queueing doomed jobs. Set by
+# the worker, read by the GUI thread.
+_unavailable = False
+
+
+def _connection():
+    """The worker's connection, opened on first use."""
+    global _conn
+    if _conn is None:
+        _conn = _XlibConnection()
+    return _conn
+
+
+def _drop_connection():
+    global _conn
+    conn, _conn = _conn, None
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _execute(operations) -> bool:
+    """Run a job — operations sent back to back, then one sync — and return
+    the result of a lone operation, or True for a batch. One window's
+    failure (say, destroyed since it was queued) doesn't stop the rest. A
+    connection found closed (X server gone, socket error) is reopened and
+    the whole job retried once. False whenever it can't be done."""
+    global _unavailable
+    for attempt in (1, 2):
+        try:
+            conn = _connection()
+        except _Unavailable:
+            _unavailable = True
+            return False
+        except Exception:
+            return False
+        try:
+            result = True
+            for operation in operations:
+                try:
+                    result = operation(conn)
+                except conn.closed_errors:
+                    raise
+                except Exception:
+                    result = False
+            conn.flush()
+            return result if len(operations) == 1 else True
+        except conn.closed_errors:
+            _drop_connection()
+            if attempt == 2:
+                return False
+        except Exception:
+            return False
+    return False
+
+
+class _Worker(threading.Thread):
+    def __init__(self):
+        super().__init__(name="stickynotes-xwm", daemon=True)
+        self.jobs = queue.SimpleQueue()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            operations, future = job
+            future.set_result(_execute(operations))
+        _drop_connection()
+
+
+_worker = None
+
+
+def _submit(operations, future=None) -> Future:
+    global _worker
+    future = future if future is not None else Future()
+    if _unavailable or not operations:
+        future.set_result(not _unavailable)
+        return future
+    if _worker is None:
+        _worker = _Worker()
+        _worker.start()
+    _worker.jobs.put((operations, future))
+    return future
+
+
+def _resolved(result: bool) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def close():
+    """Stop the worker and close its connection, after any jobs already
+    queued. Connected to QApplication.aboutToQuit."""
+    global _worker
+    worker, _worker = _worker, None
+    if worker is not None:
+        worker.jobs.put(None)
+        worker.join(timeout=1.0)
+
+
+# ---------------------------------------------------------------------------
+# Queueing (GUI thread)
+# ---------------------------------------------------------------------------
+
+# The job an open batch() / deferred() block is gathering, else None, and
+# the future it will resolve.
+_queued = None
+_queued_future = None
+# Jobs from closed deferred() blocks, waiting for the next turn.
+_deferred = []
+_deferred_future = None
+
+
+def _run(operation) -> Future:
+    """Queue operation(display) for the worker (or the open batch)."""
+    if _unavailable:
+        return _resolved(False)
+    if _queued is not None:
+        _queued.append(operation)
+        return _queued_future
+    return _submit([operation])
+
+
+@contextlib.contextmanager
+def batch():
+    """Gather the xwm calls made inside the block into one job, submitted
+    when it exits. Yields the job's Future. Nested blocks join the
+    outermost one."""
+    global _queued, _queued_future
+    if _queued is not None:
+        yield _queued_future
+        return
+    _queued, _queued_future = [], Future()
+    try:
+        yield _queued_future
+    finally:
+        operations, future = _queued, _queued_future
+        _queued = _queued_future = None
+        _submit(operations, future)
+
+
+@contextlib.contextmanager
+def deferred():
+    """Hold the xwm calls made inside the block until the next event-loop
+    turn, where every deferred call goes out as one job. For work that must
+    wait until a window is mapped (see StickyNote.showEvent). Yields that
+    job's Future."""
+    global _queued, _queued_future, _deferred_future
+    if _deferred_future is None:
+        _deferred_future = Future()
+        QTimer.singleShot(0, _flush_deferred)
+    outer = _queued, _queued_future
+    _queued, _queued_future = [], _deferred_future
+    try:
+        yield _deferred_future
+    finally:
+        _deferred.extend(_queued)
+        _queued, _queued_future = outer
+
+
+def _flush_deferred():
+    global _deferred_future
+    operations, future = _deferred[:], _deferred_future
+    _deferred.clear()
+    _deferred_future = None
+    _submit(operations, future)
+
+
+class _MainThreadCalls(QObject):
+    """Carries callbacks from the worker to the GUI thread: the signal is
+    emitted on the worker and delivered, queued, where this object lives."""
+    call = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.call.connect(lambda fn: fn())
+
+
+_main_thread_calls = None
+
+
+def when_done(future: Future, callback):
+    """Call callback(result) on the GUI thread once `future` resolves —
+    immediately if it already has. Call from the GUI thread."""
+    global _main_thread_calls
+    if future.done():
+        callback(future.result())
+        return
+    if _main_thread_calls is None:
+        _main_thread_calls = _MainThreadCalls()
+    calls = _main_thread_calls
+    future.add_done_callback(
+        lambda f: calls.call.emit(functools.partial(callback, f.result()))
+    )
+
+
+def _send_wm_state(widget, atom_names, enabled: bool) -> Future:
     """Ask the WM to add or remove up to two _NET_WM_STATE atoms on `widget`.
 
     Deliberately NOT Qt's window flags. Changing flags on an already-visible
@@ -42,50 +400,33 @@ def _send_wm_state(widget, atom_names, enabled: bool) -> bool:
     fact clears _NET_WM_STATE entirely on unmap. See set_initial_wm_states for
     the before-first-map path, and StickyNote.showEvent for re-assertion.
     """
-    try:
-        from Xlib import X, display
-        from Xlib.protocol import event
-    except ImportError:
-        return False
+    win_id = int(widget.winId())
+    if win_id == 0:
+        return _resolved(False)  # native Wayland, or creation failed
 
-    try:
-        win_id = int(widget.winId())
-        if win_id == 0:
-            return False  # native Wayland, or creation failed
+    def send(conn):
+        atoms = [conn.atom(n) for n in atom_names[:2]]
+        while len(atoms) < 2:
+            atoms.append(0)
 
-        d = display.Display()
-        try:
-            xwin = d.create_resource_object("window", win_id)
-            atoms = [d.intern_atom(n) for n in atom_names[:2]]
-            while len(atoms) < 2:
-                atoms.append(0)
-
-            # EWMH _NET_WM_STATE message data:
-            #   [0] action — 1 = _NET_WM_STATE_ADD, 0 = _NET_WM_STATE_REMOVE
-            #   [1] first property to change
-            #   [2] second property (0 = none)
-            #   [3] source indication — 1 = normal application
-            #   [4] unused
-            msg = event.ClientMessage(
-                window=xwin,
-                client_type=d.intern_atom("_NET_WM_STATE"),
-                data=(32, [1 if enabled else 0, atoms[0], atoms[1], 1, 0]),
-            )
-            d.screen().root.send_event(
-                msg,
-                event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask,
-            )
-            d.sync()
-            return True
-        finally:
-            d.close()
-    except Exception:
-        # Same contract as mark_position_user_requested: a failed window hint
-        # must never take the app down. The window just keeps its old state.
-        return False
-
-
-def set_always_on_top(widget, enabled: bool) -> bool:
+        # EWMH _NET_WM_STATE message data:
+        #   [0] action — 1 = _NET_WM_STATE_ADD, 0 = _NET_WM_STATE_REMOVE
+        #   [1] first property to change
+        #   [2] second property (0 = none)
+        #   [3] source indication — 1 = normal application
+        #   [4] unused
+        conn.send_to_root(
+            win_id, "_NET_WM_STATE",
+            (1 if enabled else 0, atoms[0], atoms[1], 1, 0),
+        )
+        return True
+
+    # Same contract as mark_position_user_requested: a failed window hint
+    # must never take the app down. The window just keeps its old state.
+    return _run(send)
+
+
+def set_always_on_top(widget, enabled: bool) -> Future:
     """Keep the window above others (_NET_WM_STATE_ABOVE).
 
     Persistent WM state, not a one-shot hint: it survives workspace switches,
@@ -94,7 +435,7 @@ def set_always_on_top(widget, enabled: bool) -> bool:
     return _send_wm_state(widget, [_STATE_ABOVE], enabled)
 
 
-def set_skip_taskbar(widget, enabled: bool) -> bool:
+def set_skip_taskbar(widget, enabled: bool) -> Future:
     """Hide the window from the dock/taskbar and pager.
 
     SKIP_PAGER rides along with SKIP_TASKBAR because a window absent from the
@@ -109,7 +450,7 @@ def set_skip_taskbar(widget, enabled: bool) -> bool:
 
 
 def set_initial_wm_states(widget, above: bool = False,
-                          skip_taskbar: bool = False) -> bool:
+                          skip_taskbar: bool = False) -> Future:
     """Write _NET_WM_STATE directly, for a window that has NOT been shown yet.
 
     EWMH requires the WM to honour whatever _NET_WM_STATE is present on the
@@ -119,91 +460,188 @@ def set_initial_wm_states(widget, above: bool = False,
     vanishing. Setting the property pre-map avoids both.
 
     Replaces the whole property, so every desired state must be passed at once
-    — hence the flags rather than one call per state.
+    — hence the flags rather than one call per state. Like
+    mark_position_user_requested, show the window once the future resolves.
     """
-    try:
-        from Xlib import Xatom, display
-    except ImportError:
-        return False
-
     names = []
     if above:
         names.append(_STATE_ABOVE)
     if skip_taskbar:
         names.extend((_STATE_SKIP_TASKBAR, _STATE_SKIP_PAGER))
     if not names:
-        return True  # nothing to assert; leaving the property unset is correct
+        return _resolved(True)  # nothing to assert; leaving it unset is correct
 
-    try:
-        win_id = int(widget.winId())
-        if win_id == 0:
-            return False
+    win_id = int(widget.winId())
+    if win_id == 0:
+        return _resolved(False)
 
-        d = display.Display()
-        try:
-            xwin = d.create_resource_object("window", win_id)
-            xwin.change_property(
-                d.intern_atom("_NET_WM_STATE"), Xatom.ATOM, 32,
-                [d.intern_atom(n) for n in names],
-            )
-            d.sync()
-            return True
-        finally:
-            d.close()
-    except Exception:
-        return False
-
-
-def mark_position_user_requested(widget) -> bool:
+    def write(conn):
+        conn.set_property(
+            win_id, conn.atom("_NET_WM_STATE"), _XA_ATOM,
+            [conn.atom(n) for n in names],
+        )
+        return True
+
+    return _run(write)
+
+
+def mark_position_user_requested(widget) -> Future:
     """Set the USPosition (and USSize) flag on the widget's X11
     WM_NORMAL_HINTS property. Call this AFTER move()/setGeometry but
-    BEFORE show() so the hint is in place when the WM first maps the
-    window. Returns True if the hint was applied, False if we silently
-    skipped (no X11 connection available, no python-xlib, etc.).
+    BEFORE show() — and show only once the returned future resolves (see
+    when_done) — so the hint is in place when the WM first maps the window.
+    The future resolves to True if the hint was applied, False if we
+    silently skipped (no X11 connection available, no python-xlib, etc.).
 
     NOTE: this is belt-and-braces, not the mechanism positioning relies on.
     Qt's xcb backend already sets USPosition|USSize itself on any window it
     positions explicitly — verified for both the move() and restoreGeometry()
     paths — and this function is only called when geometry_data is not None,
     i.e. exactly those cases. It re-asserts flags Qt has already set."""
-    try:
-        from Xlib import Xutil, display
-    except ImportError:
-        return False
+    # winId() triggers native window creation if it hasn't happened
+    # yet — we need a real X11 window id to attach properties to.
+    win_id = int(widget.winId())
+    if win_id == 0:
+        return _resolved(False)  # Not on X11 (native Wayland), or no window.
 
-    try:
-        # winId() triggers native window creation if it hasn't happened
-        # yet — we need a real X11 window id to attach properties to.
-        win_id = int(widget.winId())
-        if win_id == 0:
-            return False  # Not on X11 (native Wayland), or creation failed.
+    def mark(conn):
+        hints = conn.get_property(
+            win_id, _XA_WM_NORMAL_HINTS, _XA_WM_SIZE_HINTS
+        )
+        if not hints:
+            # Qt almost always sets WM_NORMAL_HINTS before we get here
+            # (with PPosition/PSize). If it didn't, there's nothing to
+            # OR our flag into — bail rather than synthesize a hints
+            # struct from scratch with garbage size fields.
+            return False
+        # USPosition (bit 0) + USSize (bit 1) of the flags word — both
+        # together mean "user explicitly asked for this geometry, honor
+        # it."
+        hints[0] |= _US_POSITION | _US_SIZE
+        conn.set_property(
+            win_id, _XA_WM_NORMAL_HINTS, _XA_WM_SIZE_HINTS, hints
+        )
+        return True
 
-        d = display.Display()
-        try:
-            xwin = d.create_resource_object("window", win_id)
-            hints = xwin.get_wm_normal_hints()
-            if hints is None:
-                # Qt almost always sets WM_NORMAL_HINTS before we get here
-                # (with PPosition/PSize). If it didn't, there's nothing to
-                # OR our flag into — bail rather than synthesize a hints
-                # struct from scratch with garbage size fields.
-                return False
-            # USPosition (bit 0) + USSize (bit 1) — both flags together
-            # mean "user explicitly asked for this geometry, honor it."
-            #
-            # These live in Xlib.Xutil, NOT Xlib.X. Reading them off X raises
-            # AttributeError, which the `except Exception` below silently
-            # swallowed — so this function returned False and set nothing at all
-            # until this was corrected.
-            hints.flags |= Xutil.USPosition | Xutil.USSize
-            xwin.set_wm_normal_hints(hints)
-            d.sync()
-            return True
-        finally:
-            d.close()
-    except Exception:
-        # Best-effort: any failure (X11 unavailable, Qt-Xlib mismatch,
-        # weird WM state) just means the hint didn't land. The app keeps
-        # working — positions just won't survive Mutter's override on
-        # autostart, same as before this helper existed.
-        return False
+    # Best-effort: any failure (X11 unavailable, a window gone already,
+    # weird WM state) just means the hint didn't land. The app keeps
+    # working — positions just won't survive Mutter's override on
+    # autostart, same as before this helper existed.
+    return _run(mark)
+
+
+# ---------------------------------------------------------------------------
+# Initial placement (GUI thread)
+# ---------------------------------------------------------------------------
+
+# How long to wait for the window manager's placement before giving up on
+# hearing about it and calling back anyway.
+_PLACEMENT_TIMEOUT_MS = 2000
+
+# xcb event codes (response_type, minus the "sent by SendEvent" bit).
+_MAP_NOTIFY = 19
+_CONFIGURE_NOTIFY = 22
+_PROPERTY_NOTIFY = 28
+
+
+class _PlacementWatcher(QAbstractNativeEventFilter):
+    """One native event filter for every window awaiting its initial
+    placement — installed while there are any, removed after. Qt sees
+    each X event after the filter, so callbacks go out on the next
+    event-loop turn, once Qt's own geometry has caught up."""
+
+    def __init__(self):
+        super().__init__()
+        # X window id -> [widget, callback, deadline, mapped, framed]
+        self._windows = {}
+        self._frame_extents = None   # atom id, once the worker has it
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._expire)
+        when_done(
+            _submit([lambda conn: conn.atom("_NET_FRAME_EXTENTS")]),
+            self._set_frame_extents,
+        )
+
+    def watch(self, widget, win_id: int, callback, timeout_ms: int):
+        if not self._windows:
+            QCoreApplication.instance().installNativeEventFilter(self)
+        deadline = time.monotonic() + timeout_ms / 1000
+        self._windows[win_id] = [widget, callback, deadline, False, False]
+        self._schedule_expiry()
+
+    def forget(self, win_id: int):
+        self._windows.pop(win_id, None)
+        if not self._windows:
+            QCoreApplication.instance().removeNativeEventFilter(self)
+            self._timer.stop()
+
+    def _set_frame_extents(self, atom):
+        if atom is not False:
+            self._frame_extents = atom
+
+    def nativeEventFilter(self, event_type, message):
+        if bytes(event_type) != b"xcb_generic_event_t":
+            return False, None
+        # Every xcb event is 32 bytes; the fields read here are all in
+        # the first 12: the code, then two 32-bit words —
+        #   MapNotify, ConfigureNotify   event window, window
+        #   PropertyNotify               window, atom
+        code, word1, word2 = struct.unpack_from("=B3xII", message.asstring(12))
+        code &= 0x7F
+        if code == _PROPERTY_NOTIFY:
+            state = self._windows.get(word1)
+            if state is not None and word2 == self._frame_extents:
+                state[4] = True
+                if state[3]:
+                    self._placed(word1)
+        elif code == _MAP_NOTIFY:
+            state = self._windows.get(word2)
+            if state is not None:
+                state[3] = True
+                if state[4]:
+                    self._placed(word2)
+        elif code == _CONFIGURE_NOTIFY:
+            state = self._windows.get(word2)
+            if state is not None and state[3]:
+                # Moved by the WM after mapping: that's its placement.
+                self._placed(word2)
+        return False, None
+
+    def _placed(self, win_id: int):
+        widget, callback = self._windows[win_id][:2]
+        self.forget(win_id)
+        QTimer.singleShot(0, lambda: sip.isdeleted(widget) or callback())
+
+    def _schedule_expiry(self):
+        if self._windows:
+            first = min(state[2] for state in self._windows.values())
+            delay = max(0, first - time.monotonic())
+            self._timer.start(int(delay * 1000) + 1)
+
+    def _expire(self):
+        now = time.monotonic()
+        for win_id, state in list(self._windows.items()):
+            if state[2] <= now:
+                self._placed(win_id)
+        self._schedule_expiry()
+
+
+_placement_watcher = None
+
+
+def when_placed(widget, callback, timeout_ms: int = _PLACEMENT_TIMEOUT_MS):
+    """Call callback() on the GUI thread once the window manager has done
+    its initial placement of `widget`'s window: it has been mapped, and
+    either announced its frame (_NET_FRAME_EXTENTS) or been moved by the
+    WM since. Register before show(). Falls back to calling back after
+    `timeout_ms` for a WM that does neither (or when Qt isn't on xcb and
+    no X events arrive at all). Skipped if the widget has been destroyed
+    by then."""
+    global _placement_watcher
+    win_id = int(widget.winId())
+    if win_id == 0:
+        return
+    if _placement_watcher is None:
+        _placement_watcher = _PlacementWatcher()
+    _placement_watcher.watch(widget, win_id, callback, timeout_ms)
@@ -0,0 +1,105 @@
+# tests/test_history.py
+
+import time
+
+import pytest
+
+from stickynotes import config
+from stickynotes.history import HistoryStore
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    yield store
+    store.close()
+
+
+def _contents(history, note_id):
+    return [history.content(v) for v, _, _ in history.versions(note_id)]
+
+
+def test_unchanged_content_is_not_captured(history):
+    history.capture({"a": {"content": "one"}}, now=100)
+    history.capture({"a": {"content": "one"}}, now=200)
+    history.capture({"a": {"title": "no content"}}, now=300)
+    assert _contents(history, "a") == ["one"]
+
+
+def test_recurring_content_shares_a_blob(history):
+    for now, content in enumerate(["one", "two", "one"]):
+        history.capture({"a": {"content": content}}, now=now)
+    assert _contents(history, "a") == ["one", "two", "one"]
+    blobs = history._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert blobs == 2
+
+
+def test_dedup_survives_reopen(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = HistoryStore(path)
+    history.capture({"a": {"content": "one"}}, now=100)
+    history.close()
+    history = HistoryStore(path)
+    history.capture({"a": {"content": "one"}}, now=200)
+    assert len(history.versions("a")) == 1
+    history.close()
+
+
+def test_version_cap(history, monkeypatch):
+    monkeypatch.setattr(config, "HISTORY_MAX_VERSIONS", 3)
+    for i in range(5):
+        history.capture({"a": {"content": f"v{i}"}}, now=i)
+    assert _contents(history, "a") == ["v4", "v3", "v2"]
+    # The pruned versions' blobs go with them.
+    blobs = history._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert blobs == 3
+
+
+def test_old_versions_are_thinned(history):
+    hour = 60 * 60
+    history.capture({"a": {"content": "v0"}}, now=0)
+    history.capture({"a": {"content": "v1"}}, now=60)
+    # Both are now over an hour old, so they must sit 10 minutes apart;
+    # v1 is kept as the newer of the two.
+    history.capture({"a": {"content": "v2"}}, now=2 * hour)
+    assert _contents(history, "a") == ["v2", "v1"]
+
+    # Recent versions aren't thinned, however close together.
+    history.capture({"a": {"content": "v3"}}, now=2 * hour + 1)
+    assert _contents(history, "a") == ["v3", "v2", "v1"]
+
+
+def test_deleted_note_kept_for_grace_period(history):
+    now = time.time()
+    history.capture({"a": {"content": "gone"}}, now=now - 10)
+    history.capture({"b": {"content": "also gone"}}, now=now - 10)
+    history.delete_note("a", now=now)
+    assert [(n, c) for n, _, c in history.deleted_notes()] == [("a", "gone")]
+    assert _contents(history, "a") == ["gone"]
+
+    # Any later delete purges the notes whose grace has run out.
+    history.delete_note("b", now=now + config.HISTORY_DELETED_GRACE_S + 1)
+    assert history.versions("a") == []
+    assert "a" not in [n for n, _, _ in history.deleted_notes()]
+    blobs = history._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    assert blobs == 1   # b's
+
+
+def test_saving_a_deleted_note_revives_it(history):
+    now = time.time()
+    history.capture({"a": {"content": "back"}}, now=now - 10)
+    history.delete_note("a", now=now)
+    history.capture({"a": {"content": "back"}}, now=now + 1)
+    assert history.deleted_notes() == []
+    assert _contents(history, "a") == ["back"]
+
+
+def test_expired_deletes_purged_on_open(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = HistoryStore(path)
+    history.capture({"a": {"content": "old"}}, now=0)
+    history.delete_note("a", now=time.time() - config.HISTORY_DELETED_GRACE_S - 1)
+    history.close()
+    history = HistoryStore(path)
+    assert history.versions("a") == []
+    history.close()
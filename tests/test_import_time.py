@@ -0,0 +1,31 @@
+# tests/test_import_time.py
+
+import importlib.util
+import os
+
+from conftest import ROOT
+
+_spec = importlib.util.spec_from_file_location(
+    "check_import_time",
+    os.path.join(ROOT, "benchmarks", "check_import_time.py"),
+)
+check_import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_import_time)
+
+
+def test_startup_imports_within_budget():
+    best = check_import_time.measure()
+    assert check_import_time.TARGET in best
+    assert check_import_time.check(best) == []
+
+
+def test_check_flags_deferred_modules_and_budget():
+    best = {
+        "stickynotes.tray_manager": (90_000, 90_000),
+        "stickynotes.dialogs": (1_000, 1_000),
+        "Xlib.display": (1_000, 1_000),
+    }
+    failures = check_import_time.check(best, budget_ms=80)
+    assert "stickynotes.dialogs is imported at startup" in failures
+    assert "Xlib is imported at startup" in failures
+    assert any("budget 80 ms" in f for f in failures)
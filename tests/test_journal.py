@@ -0,0 +1,125 @@
+# tests/test_journal.py
+
+import pytest
+
+from stickynotes.journal import Journal, content_delta
+
+
+@pytest.mark.parametrize("old, new", [
+    ("", "hello"),
+    ("hello", ""),
+    ("hello world", "hello there world"),
+    ("abcabc", "abc"),
+    ("aaaa", "aaaaa"),
+    ("same", "same"),
+    ("naïve café", "naïve cafés ☕"),
+])
+def test_content_delta_applies(old, new):
+    start, end, text = content_delta(old, new)
+    assert old[:start] + text + old[end:] == new
+
+
+def test_replay_resolves_full_and_delta_entries(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.append({"a": {"content": "hello", "title": "Hi", "pinned": True}})
+    journal.append({"a": {"content": "hello world"}})
+    journal.append({"b": {"geometry": b"\x00\x01geom", "theme": "green"}})
+    journal.seal()
+    journal.close()
+
+    changes, deleted = Journal(str(tmp_path)).replay(lambda note_id: None)
+    assert deleted == set()
+    assert changes == {
+        "a": {"content": "hello world", "title": "Hi", "pinned": True},
+        "b": {"geometry": b"\x00\x01geom", "theme": "green"},
+    }
+
+
+def _journal_with_delta(tmp_path, base, new):
+    """A sealed segment holding only a delta from `base` to `new` — what a
+    crash leaves after the snapshot holding `base` was written."""
+    journal = Journal(str(tmp_path))
+    journal.append({"a": {"content": base}})
+    journal.discard(journal.seal())
+    journal.append({"a": {"content": new}})
+    journal.seal()
+    journal.close()
+    return Journal(str(tmp_path))
+
+
+def test_delta_applies_to_matching_snapshot(tmp_path):
+    journal = _journal_with_delta(tmp_path, "one", "one two")
+    loaded = []
+
+    def load_content(note_id):
+        loaded.append(note_id)
+        return "one"
+
+    changes, _ = journal.replay(load_content)
+    assert changes == {"a": {"content": "one two"}}
+    assert loaded == ["a"]
+
+
+def test_delta_with_wrong_base_is_skipped(tmp_path):
+    journal = _journal_with_delta(tmp_path, "one", "one two")
+    changes, _ = journal.replay(lambda note_id: "something else")
+    assert changes == {}
+
+
+def test_delta_for_note_missing_from_snapshot_is_skipped(tmp_path):
+    journal = _journal_with_delta(tmp_path, "one", "one two")
+    changes, _ = journal.replay(lambda note_id: None)
+    assert changes == {}
+
+
+def test_torn_final_line_keeps_earlier_entries(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.append({"a": {"content": "kept"}})
+    journal.append({"b": {"content": "also kept"}})
+    (sealed,) = journal.seal()
+    journal.close()
+    with open(sealed, "ab") as f:
+        f.write(b'{"i":"c","s":{"content":"to')
+
+    changes, _ = Journal(str(tmp_path)).replay(lambda note_id: None)
+    assert changes == {"a": {"content": "kept"}, "b": {"content": "also kept"}}
+
+
+def test_delete_drops_earlier_changes(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.append({"a": {"content": "gone"}, "b": {"content": "stays"}})
+    journal.append_delete("a")
+    journal.seal()
+    journal.close()
+
+    changes, deleted = Journal(str(tmp_path)).replay(lambda note_id: None)
+    assert changes == {"b": {"content": "stays"}}
+    assert deleted == {"a"}
+
+
+def test_changes_after_delete_bring_note_back(tmp_path):
+    journal = Journal(str(tmp_path))
+    journal.append({"a": {"content": "first"}})
+    journal.append_delete("a")
+    # The delete dropped the delta base, so this is journaled in full.
+    journal.append({"a": {"content": "second"}})
+    journal.seal()
+    journal.close()
+
+    changes, deleted = Journal(str(tmp_path)).replay(lambda note_id: None)
+    assert changes == {"a": {"content": "second"}}
+    assert deleted == set()
+
+
+def test_seal_and_discard(tmp_path):
+    journal = Journal(str(tmp_path))
+    assert journal.sealed_segments() == []
+    journal.append({"a": {"content": "x"}})
+    assert journal.size() > 0
+    sealed = journal.seal()
+    assert len(sealed) == 1
+    assert journal.size() == 0
+    journal.discard(sealed)
+    journal.discard(sealed)   # already gone: not an error
+    assert journal.sealed_segments() == []
+    journal.close()
@@ -0,0 +1,60 @@
+# tests/test_migrations.py
+
+from PyQt6.QtCore import QByteArray, Qt
+from PyQt6.QtWidgets import QWidget
+
+from stickynotes import migrations
+from stickynotes.note_window import derive_title_from_text
+from stickynotes.storage import SQLiteStore
+
+
+def _legacy_store(path):
+    """A schema-0 store: one note with raw x/y/w/h geometry and no title or
+    last_edited, and one that already has everything v1 needs."""
+    store = SQLiteStore(path)
+    with store._conn:
+        store._conn.execute(
+            "INSERT INTO notes (id, content, x, y, w, h) "
+            "VALUES ('old', 'Shopping list for today\nmilk', 40, 60, 300, 250)"
+        )
+        store._conn.execute(
+            "INSERT INTO notes (id, content, geometry, title, last_edited) "
+            "VALUES ('new', 'body', X'0102', 'Kept', '2024-01-01T00:00:00')"
+        )
+    return store
+
+
+def test_v1_migration(qapp, tmp_path):
+    store = _legacy_store(str(tmp_path / "notes.db"))
+    assert store.schema_version() == 0
+    assert store.load_legacy_notes()[0]["geometry"] == (40, 60, 300, 250)
+
+    migrations.migrate(store)
+
+    assert store.schema_version() == migrations.SCHEMA_VERSION
+    notes = {r["note_id"]: r for r in store.load_notes()}
+    old, new = notes["old"], notes["new"]
+
+    assert isinstance(old["geometry"], bytes)
+    window = QWidget(None, Qt.WindowType.FramelessWindowHint | Qt.WindowType.Window)
+    assert window.restoreGeometry(QByteArray(old["geometry"]))
+    assert (window.width(), window.height()) == (300, 250)
+    window.deleteLater()
+    assert old["title"] == derive_title_from_text(old["content"])
+    assert old["last_edited"] is not None
+    # The raw coordinates are gone once a blob supersedes them.
+    assert store.load_legacy_notes()[0]["geometry"] == old["geometry"]
+
+    assert (new["geometry"], new["title"], new["last_edited"]) == (
+        b"\x01\x02", "Kept", "2024-01-01T00:00:00"
+    )
+    store.close()
+
+
+def test_migrate_is_a_no_op_once_current(qapp, tmp_path):
+    store = _legacy_store(str(tmp_path / "notes.db"))
+    migrations.migrate(store)
+    before = store.load_notes()
+    migrations.migrate(store)
+    assert store.load_notes() == before
+    store.close()
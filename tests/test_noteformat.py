@@ -0,0 +1,83 @@
+# tests/test_noteformat.py
+
+import pytest
+from PyQt6.QtGui import QFont, QTextCursor, QTextDocument, QTextListFormat
+
+from stickynotes import noteformat
+
+ESC = "\x1b"
+
+# One of everything the format represents: plain and formatted runs, a
+# bullet list shared by two blocks, a nested list, both checklist markers,
+# block margins, an empty block carrying its char format, and escapes.
+SAMPLE = "\n".join([
+    noteformat.MAGIC,
+    f"\tplain {ESC}Abold{ESC}@ then {ESC}Gbold italic underline{ESC}Hstruck",
+    "l1:-1:1\tfirst bullet",
+    "l1:-1:1\tsecond bullet",
+    "l2:-2:2\tnested",
+    "l3:-1:1 o\tto do",
+    "l3:-1:1 x\tdone",
+    "t12 b6\tspaced out",
+    f"\t{ESC}A",
+    "\tback\\\\slash, tab\\tand \\e escape",
+])
+
+
+@pytest.fixture
+def font(qapp):
+    return QFont()
+
+
+def _round_trip(content, font):
+    doc = QTextDocument()
+    noteformat.load(doc, content)
+    return doc, noteformat.serialize(doc, font)
+
+
+def test_round_trip_is_exact(font):
+    doc, serialized = _round_trip(SAMPLE, font)
+    assert serialized == SAMPLE
+    assert noteformat.is_compact(serialized)
+    assert doc.blockCount() == len(SAMPLE.split("\n")) - 1
+    assert doc.toPlainText().splitlines()[-1] == (
+        "back\\slash, tab\tand \x1b escape"
+    )
+
+
+def test_round_trip_of_edited_document(font):
+    doc = QTextDocument()
+    cursor = QTextCursor(doc)
+    cursor.insertText("Title line")
+    cursor.insertBlock()
+    lf = QTextListFormat()
+    lf.setStyle(QTextListFormat.Style.ListDisc)
+    cursor.createList(lf)
+    cursor.insertText("item")
+    fmt = cursor.charFormat()
+    fmt.setFontWeight(QFont.Weight.Bold)
+    cursor.insertText(" bold", fmt)
+
+    serialized = noteformat.serialize(doc, font)
+    assert serialized is not None
+    copy, again = _round_trip(serialized, font)
+    assert again == serialized
+    assert copy.toPlainText() == doc.toPlainText()
+
+
+def test_unsupported_content_falls_back(font):
+    doc = QTextDocument()
+    QTextCursor(doc).insertTable(2, 2)
+    assert noteformat.serialize(doc, font) is None
+
+    doc = QTextDocument()
+    doc.setHtml('<p><span style="color:#ff0000">red</span></p>')
+    assert noteformat.serialize(doc, font) is None
+
+
+def test_legacy_content_loads(qapp):
+    doc = QTextDocument()
+    noteformat.load(doc, "<p>from <b>HTML</b></p>")
+    assert doc.toPlainText() == "from HTML"
+    noteformat.load(doc, "plain <text>")
+    assert doc.toPlainText() == "plain <text>"
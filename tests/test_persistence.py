@@ -0,0 +1,141 @@
+# tests/test_persistence.py
+
+import threading
+
+import pytest
+
+from conftest import wait_until
+from stickynotes.journal import Journal
+from stickynotes.persistence import SaveCoordinator, StoreWriter
+
+
+class FakeStore:
+    """Records what reaches the store. While `gate` is cleared, write()
+    blocks — holding the writer thread busy so later submissions pile up."""
+
+    def __init__(self):
+        self.writes = []
+        self.deletes = []
+        self.closed = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.writing = threading.Event()
+
+    def write(self, changes):
+        self.writing.set()
+        self.gate.wait()
+        self.writes.append(changes)
+
+    def delete(self, note_id):
+        self.deletes.append(note_id)
+
+    def load_content(self, note_id):
+        return ""
+
+    def close(self):
+        self.closed = True
+
+
+class FakeNote:
+    def __init__(self, note_id, **fields):
+        self.note_id = note_id
+        self.dirty = fields
+
+    def take_dirty(self):
+        fields, self.dirty = self.dirty, {}
+        return fields
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = Journal(str(tmp_path / "journal"))
+    yield journal
+    journal.close()
+
+
+def test_writer_merges_submissions_while_busy(journal):
+    store = FakeStore()
+    writer = StoreWriter(store, journal)
+    store.gate.clear()
+    writer.submit({"a": {"content": "first"}}, snapshot=True)
+    assert store.writing.wait(5)
+
+    # All of this lands while the first write is still in progress.
+    writer.submit({"a": {"content": "second", "title": "T"}})
+    writer.submit({"a": {"content": "third"}, "b": {"theme": "green"}})
+    writer.submit({"c": {"content": "doomed"}})
+    writer.delete("c")
+    writer.submit({"b": {"pinned": True}}, snapshot=True)
+    store.gate.set()
+    writer.close()
+
+    assert store.writes == [
+        {"a": {"content": "first"}},
+        {
+            "a": {"content": "third", "title": "T"},
+            "b": {"theme": "green", "pinned": True},
+        },
+    ]
+    assert store.deletes == ["c"]
+
+
+def test_writer_only_snapshots_when_asked(journal):
+    store = FakeStore()
+    writer = StoreWriter(store, journal)
+    writer.submit({"a": {"content": "one"}})
+    writer.submit({"a": {"title": "T"}})
+    writer.drain()
+    assert store.writes == []
+    assert journal.size() > 0
+
+    # The snapshot holds every field journaled since the last one, once.
+    writer.submit({}, snapshot=True)
+    writer.close()
+    assert store.writes == [{"a": {"content": "one", "title": "T"}}]
+    assert journal.size() == 0
+    assert journal.sealed_segments() == []
+
+
+def test_delete_drops_unsaved_changes(journal):
+    store = FakeStore()
+    writer = StoreWriter(store, journal)
+    writer.submit({"a": {"content": "one"}, "b": {"content": "two"}})
+    writer.drain()
+    writer.delete("a")
+    writer.submit({}, snapshot=True)
+    writer.close()
+    assert store.writes == [{"b": {"content": "two"}}]
+    assert store.deletes == ["a"]
+
+
+def test_coordinator_flush_then_runs_on_gui_thread(qapp, journal):
+    store = FakeStore()
+    saver = SaveCoordinator(store, journal)
+    saver.mark_dirty(FakeNote("a", content="hello"))
+    saver.mark_dirty(FakeNote("b", theme="blue"))
+
+    called = []
+    saver.flush(then=lambda: called.append(threading.current_thread()))
+    assert wait_until(qapp, lambda: called)
+    assert called == [threading.main_thread()]
+    assert store.writes == [{"a": {"content": "hello"}, "b": {"theme": "blue"}}]
+    saver.close()
+
+
+def test_coordinator_close(qapp, journal):
+    store = FakeStore()
+    saver = SaveCoordinator(store, journal)
+    saver.mark_dirty(FakeNote("a", content="last words"))
+    saver.close()
+
+    assert store.writes == [{"a": {"content": "last words"}}]
+    assert store.closed
+    assert not saver.writer._thread.is_alive()
+
+    # Saves after close are dropped rather than raising.
+    saver.mark_dirty(FakeNote("a", content="too late"))
+    saver.remove("a")
+    saver.flush(wait=True)
+    saver.close()
+    assert store.writes == [{"a": {"content": "last words"}}]
+    assert store.deletes == []